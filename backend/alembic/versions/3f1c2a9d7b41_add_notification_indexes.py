@@ -0,0 +1,40 @@
+"""Add notification indexes for listing, keyset pagination and retention
+
+Revision ID: 3f1c2a9d7b41
+Revises: f3b9d0a6c715
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b41'
+down_revision = 'f3b9d0a6c715'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_notification_user_id_created_at_id", "(user_id, created_at, id)", None),
+    ("ix_notification_user_id_unread", "(user_id, created_at, id)", "read IS false"),
+    ("ix_notification_read_created_at", "(created_at)", "read IS true"),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently so writes to the (large) notification table aren't
+    # blocked; CONCURRENTLY can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            predicate = f" WHERE {where}" if where else ""
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON notification {columns}{predicate}"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
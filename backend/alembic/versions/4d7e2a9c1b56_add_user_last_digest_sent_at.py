@@ -0,0 +1,25 @@
+"""Add the last digest time to users
+
+Revision ID: 4d7e2a9c1b56
+Revises: 3f1c2a9d7b41
+Create Date: 2026-10-19 10:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d7e2a9c1b56'
+down_revision = '3f1c2a9d7b41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NULL means no digest yet; digests then start from the user's created_at
+    op.add_column('user', sa.Column('last_digest_sent_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'last_digest_sent_at')
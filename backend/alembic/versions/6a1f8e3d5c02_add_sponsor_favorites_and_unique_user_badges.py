@@ -0,0 +1,46 @@
+"""Add sponsor favorites to submissions and make user badges unique
+
+Revision ID: 6a1f8e3d5c02
+Revises: 4d7e2a9c1b56
+Create Date: 2026-10-19 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a1f8e3d5c02'
+down_revision = '4d7e2a9c1b56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'submission',
+        sa.Column('is_sponsor_favorite', sa.Boolean(), server_default='false', nullable=False)
+    )
+    
+    # Badge awards use ON CONFLICT (user_id, badge_id), which needs this
+    # constraint; keep the earliest award of any badge a user holds twice
+    op.execute(
+        """
+        DELETE FROM userbadge
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY user_id, badge_id ORDER BY awarded_at, id
+                ) AS position
+                FROM userbadge
+            ) ranked
+            WHERE ranked.position > 1
+        )
+        """
+    )
+    op.create_unique_constraint('uq_userbadge_user_id_badge_id', 'userbadge', ['user_id', 'badge_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_userbadge_user_id_badge_id', 'userbadge', type_='unique')
+    op.drop_column('submission', 'is_sponsor_favorite')
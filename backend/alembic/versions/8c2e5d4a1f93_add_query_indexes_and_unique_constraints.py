@@ -0,0 +1,95 @@
+"""Add indexes for hot filters and foreign keys, and unique constraints
+
+Revision ID: 8c2e5d4a1f93
+Revises: 6a1f8e3d5c02
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2e5d4a1f93'
+down_revision = '6a1f8e3d5c02'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, predicate), matching the models' __table_args__
+INDEXES = [
+    ("ix_submission_challenge_id_final_score", "submission", "(challenge_id, final_score)", None),
+    ("ix_submission_status", "submission", "(status)", None),
+    ("ix_leaderboardentry_challenge_id_rank", "leaderboardentry", "(challenge_id, rank)", None),
+    ("ix_leaderboardentry_season_id_rank", "leaderboardentry", "(season_id, rank)", None),
+    ("ix_leaderboardentry_submission_id", "leaderboardentry", "(submission_id)", None),
+    ("ix_userbadge_badge_id", "userbadge", "(badge_id)", None),
+    ("ix_userbadge_submission_id", "userbadge", "(submission_id)", None),
+    ("ix_challenge_active_submission_deadline", "challenge", "(submission_deadline)", "is_active IS true"),
+    ("ix_challenge_season_id_submission_deadline", "challenge", "(season_id, submission_deadline)", None),
+    ("ix_challenge_sponsor_id_submission_deadline", "challenge", "(sponsor_id, submission_deadline)", None),
+]
+
+
+# (name, table, columns); uq_userbadge_user_id_badge_id is added with sponsor favorites
+UNIQUE_CONSTRAINTS = [
+    ("uq_submission_user_id_challenge_id", "submission", "user_id, challenge_id"),
+    ("uq_leaderboardentry_challenge_id_user_id", "leaderboardentry", "challenge_id, user_id"),
+]
+
+
+def _drop_invalid_index(name: str) -> None:
+    # A failed CONCURRENTLY build leaves an invalid index behind, which
+    # IF NOT EXISTS would otherwise keep forever
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name}
+    ).first()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def _constraint_exists(name: str) -> bool:
+    return op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_constraint WHERE conname = :name"),
+        {"name": name}
+    ).first() is not None
+
+
+def upgrade() -> None:
+    # Built concurrently so writes aren't blocked; CONCURRENTLY can't run
+    # inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            _drop_invalid_index(name)
+            predicate = f" WHERE {where}" if where else ""
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {columns}{predicate}")
+        
+        for name, table, columns in UNIQUE_CONSTRAINTS:
+            if _constraint_exists(name):
+                continue
+            
+            duplicates = op.get_bind().execute(
+                sa.text(f"SELECT count(*) FROM (SELECT 1 FROM {table} GROUP BY {columns} HAVING count(*) > 1) d")
+            ).scalar()
+            if duplicates:
+                raise RuntimeError(
+                    f"{table} has {duplicates} duplicated ({columns}) groups; "
+                    f"remove the duplicates before adding {name}"
+                )
+            
+            # Build the unique index without blocking writes, then promote it
+            _drop_invalid_index(name)
+            op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in UNIQUE_CONSTRAINTS:
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        for name, _, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
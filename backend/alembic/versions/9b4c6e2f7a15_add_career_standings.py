@@ -0,0 +1,77 @@
+"""Add precomputed career standings
+
+Revision ID: 9b4c6e2f7a15
+Revises: 8c2e5d4a1f93
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '9b4c6e2f7a15'
+down_revision = '8c2e5d4a1f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'careerstanding',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('total_score', sa.Numeric(12, 2), nullable=False),
+        sa.Column('challenge_count', sa.Integer(), nullable=False),
+        sa.Column('average_score', sa.Numeric(5, 2), nullable=False),
+        sa.Column('best_rank', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.UniqueConstraint('user_id', name='uq_careerstanding_user_id'),
+    )
+    op.create_index('ix_careerstanding_rank', 'careerstanding', ['rank'])
+    
+    # Fill the standings now rather than serving an empty career leaderboard
+    # until the first refresh; same query as app.services.career_standings
+    op.execute(
+        """
+        INSERT INTO careerstanding (
+            id, user_id, total_score, challenge_count, average_score, best_rank, rank
+        )
+        WITH user_stats AS (
+            SELECT
+                s.user_id,
+                COUNT(DISTINCT s.challenge_id) as challenge_count,
+                SUM(s.final_score) as total_score,
+                AVG(s.final_score) as average_score,
+                MIN(le.rank) as best_rank
+            FROM submission s
+            LEFT JOIN leaderboardentry le ON s.id = le.submission_id
+            WHERE s.final_score IS NOT NULL
+            GROUP BY s.user_id
+        )
+        SELECT
+            gen_random_uuid(),
+            u.id,
+            COALESCE(us.total_score, 0),
+            COALESCE(us.challenge_count, 0),
+            COALESCE(us.average_score, 0),
+            COALESCE(us.best_rank, 0),
+            ROW_NUMBER() OVER (
+                ORDER BY
+                    COALESCE(us.total_score, 0) DESC,
+                    COALESCE(us.challenge_count, 0) DESC,
+                    COALESCE(us.average_score, 0) DESC,
+                    u.id
+            )
+        FROM "user" u
+        LEFT JOIN user_stats us ON u.id = us.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_careerstanding_rank', table_name='careerstanding')
+    op.drop_table('careerstanding')
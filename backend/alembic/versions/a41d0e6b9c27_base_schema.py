@@ -0,0 +1,172 @@
+"""Base schema: users, challenges, submissions, badges, sponsors, seasons,
+notifications and leaderboard entries
+
+Databases created before migrations were tracked already have these tables;
+mark them with `alembic stamp a41d0e6b9c27` before running `alembic upgrade head`.
+
+Revision ID: a41d0e6b9c27
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41d0e6b9c27'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _base_columns() -> list:
+    # Columns every model inherits from app.db.base_class.Base
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user',
+        *_base_columns(),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('password_hash', sa.String(), nullable=False),
+        sa.Column('bio', sa.Text(), nullable=True),
+        sa.Column('github_url', sa.String(), nullable=True),
+        sa.Column('portfolio_url', sa.String(), nullable=True),
+        sa.Column('resume_url', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_admin', sa.Boolean(), nullable=True),
+    )
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+    
+    op.create_table(
+        'sponsor',
+        *_base_columns(),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('logo_url', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('website_url', sa.String(), nullable=True),
+        sa.Column('contact_email', sa.String(), nullable=False),
+    )
+    op.create_index('ix_sponsor_name', 'sponsor', ['name'])
+    
+    op.create_table(
+        'season',
+        *_base_columns(),
+        sa.Column('name', sa.String(), nullable=False, unique=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('start_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_date', sa.DateTime(timezone=True), nullable=False),
+    )
+    
+    op.create_table(
+        'badge',
+        *_base_columns(),
+        sa.Column('name', sa.String(), nullable=False, unique=True),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('image_url', sa.String(), nullable=False),
+        sa.Column('criteria', sa.JSON(), nullable=False),
+    )
+    
+    op.create_table(
+        'challenge',
+        *_base_columns(),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('rules', sa.Text(), nullable=False),
+        sa.Column('evaluation_criteria', sa.JSON(), nullable=False),
+        sa.Column('data_pack_url', sa.String(), nullable=True),
+        sa.Column('submission_deadline', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('is_sponsored', sa.Boolean(), nullable=True),
+        sa.Column('prize_amount', sa.Numeric(10, 2), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('sponsor_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('sponsor.id'), nullable=True),
+        sa.Column('season_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('season.id'), nullable=True),
+    )
+    
+    op.create_table(
+        'submission',
+        *_base_columns(),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('challenge_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('challenge.id'), nullable=False),
+        sa.Column('repo_url', sa.String(), nullable=False),
+        sa.Column('deck_url', sa.String(), nullable=True),
+        sa.Column('video_url', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('llm_score', sa.Numeric(5, 2), nullable=True),
+        sa.Column('human_score', sa.Numeric(5, 2), nullable=True),
+        sa.Column('final_score', sa.Numeric(5, 2), nullable=True),
+        sa.Column('evaluation_data', sa.JSON(), nullable=True),
+        sa.Column('feedback', sa.Text(), nullable=True),
+        sa.Column(
+            'status',
+            sa.Enum(
+                'PENDING', 'PROCESSING', 'EVALUATED', 'REVIEWED', 'COMPLETED', 'REJECTED',
+                name='submissionstatus'
+            ),
+            nullable=False
+        ),
+    )
+    
+    op.create_table(
+        'userbadge',
+        *_base_columns(),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('badge_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('badge.id'), nullable=False),
+        sa.Column('submission_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('submission.id'), nullable=True),
+        sa.Column('awarded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    
+    op.create_table(
+        'notification',
+        *_base_columns(),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column(
+            'type',
+            sa.Enum(
+                'SUBMISSION_STATUS', 'BADGE_AWARDED', 'FEEDBACK_RECEIVED',
+                'CHALLENGE_REMINDER', 'SYSTEM_ANNOUNCEMENT', 'SPONSOR_MESSAGE',
+                name='notificationtype'
+            ),
+            nullable=False
+        ),
+        sa.Column('read', sa.Boolean(), nullable=True),
+        sa.Column('reference_id', postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    
+    op.create_table(
+        'leaderboardentry',
+        *_base_columns(),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('challenge_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('challenge.id'), nullable=False),
+        sa.Column('season_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('season.id'), nullable=True),
+        sa.Column('submission_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('submission.id'), nullable=False),
+        sa.Column('score', sa.Numeric(5, 2), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('percentile', sa.Numeric(5, 2), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('leaderboardentry')
+    op.drop_table('notification')
+    op.drop_table('userbadge')
+    op.drop_table('submission')
+    op.drop_table('challenge')
+    op.drop_table('badge')
+    op.drop_table('season')
+    op.drop_index('ix_sponsor_name', table_name='sponsor')
+    op.drop_table('sponsor')
+    op.drop_index('ix_user_email', table_name='user')
+    op.drop_table('user')
+    sa.Enum(name='notificationtype').drop(op.get_bind())
+    sa.Enum(name='submissionstatus').drop(op.get_bind())
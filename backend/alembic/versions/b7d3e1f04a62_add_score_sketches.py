@@ -0,0 +1,35 @@
+"""Add score sketches for percentile lookups
+
+Revision ID: b7d3e1f04a62
+Revises: a41d0e6b9c27
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e1f04a62'
+down_revision = 'a41d0e6b9c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scoresketch',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('scope_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.UniqueConstraint('scope', 'scope_id', name='uq_scoresketch_scope_scope_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scoresketch')
@@ -0,0 +1,49 @@
+"""Add leaderboard rosters and snapshots
+
+Revision ID: c59a2e7d1b08
+Revises: b7d3e1f04a62
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c59a2e7d1b08'
+down_revision = 'b7d3e1f04a62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'leaderboardroster',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('challenge_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('challenge.id'), nullable=False, unique=True),
+        sa.Column('user_ids', sa.LargeBinary(), nullable=False),
+    )
+    
+    op.create_table(
+        'leaderboardsnapshot',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('challenge_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('challenge.id'), nullable=False),
+        sa.Column('taken_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('checksum', sa.String(40), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+    )
+    op.create_index(
+        'ix_leaderboardsnapshot_challenge_id_taken_at', 'leaderboardsnapshot', ['challenge_id', 'taken_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leaderboardsnapshot_challenge_id_taken_at', table_name='leaderboardsnapshot')
+    op.drop_table('leaderboardsnapshot')
+    op.drop_table('leaderboardroster')
@@ -0,0 +1,73 @@
+"""Add precomputed season standings
+
+Revision ID: d2f6b8c4e913
+Revises: c59a2e7d1b08
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6b8c4e913'
+down_revision = 'c59a2e7d1b08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'seasonstanding',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('season_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('season.id'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('total_score', sa.Numeric(10, 2), nullable=False),
+        sa.Column('challenge_count', sa.Integer(), nullable=False),
+        sa.Column('best_rank', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.UniqueConstraint('season_id', 'user_id', name='uq_seasonstanding_season_id_user_id'),
+    )
+    op.create_index('ix_seasonstanding_season_id_rank', 'seasonstanding', ['season_id', 'rank'])
+    
+    # Fill the standings of existing seasons now rather than leaving them empty
+    # until a leaderboard is regenerated; same ranking as
+    # app.services.season_standings
+    op.execute(
+        """
+        INSERT INTO seasonstanding (
+            id, season_id, user_id, total_score, challenge_count, best_rank, rank
+        )
+        WITH season_stats AS (
+            SELECT
+                season_id,
+                user_id,
+                SUM(score) as total_score,
+                COUNT(DISTINCT challenge_id) as challenge_count,
+                MIN(rank) as best_rank
+            FROM leaderboardentry
+            WHERE season_id IS NOT NULL
+            GROUP BY season_id, user_id
+        )
+        SELECT
+            gen_random_uuid(),
+            season_id,
+            user_id,
+            total_score,
+            challenge_count,
+            best_rank,
+            ROW_NUMBER() OVER (
+                PARTITION BY season_id
+                ORDER BY total_score DESC, challenge_count DESC, best_rank, user_id
+            )
+        FROM season_stats
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_seasonstanding_season_id_rank', table_name='seasonstanding')
+    op.drop_table('seasonstanding')
@@ -0,0 +1,47 @@
+"""Add announcements and per-user announcement receipts
+
+Revision ID: e8a1c5d7f240
+Revises: d2f6b8c4e913
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a1c5d7f240'
+down_revision = 'd2f6b8c4e913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'announcement',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('created_by', postgresql.UUID(as_uuid=True), sa.ForeignKey('user.id'), nullable=True),
+    )
+    
+    op.create_table(
+        'announcementreceipt',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('announcement_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('announcement.id'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('dismissed', sa.Boolean(), nullable=False),
+        sa.UniqueConstraint(
+            'announcement_id', 'user_id', name='uq_announcementreceipt_announcement_id_user_id'
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('announcementreceipt')
+    op.drop_table('announcement')
@@ -0,0 +1,42 @@
+"""Add the denormalized unread notification counter to users
+
+Revision ID: f3b9d0a6c715
+Revises: e8a1c5d7f240
+Create Date: 2026-10-19 09:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9d0a6c715'
+down_revision = 'e8a1c5d7f240'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The server default fills existing rows without rewriting the table
+    op.add_column(
+        'user',
+        sa.Column('unread_notification_count', sa.Integer(), server_default='0', nullable=False)
+    )
+    
+    # Same predicate as app.services.unread_counter's recount
+    op.execute(
+        """
+        UPDATE "user" SET unread_notification_count = unread.count
+        FROM (
+            SELECT user_id, count(*) AS count
+            FROM notification
+            WHERE read IS false
+            GROUP BY user_id
+        ) unread
+        WHERE "user".id = unread.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'unread_notification_count')
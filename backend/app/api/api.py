@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.endpoints import auth, users, challenges, submissions, badges, sponsors, seasons, notifications, leaderboards
+from app.api.endpoints import auth, users, challenges, submissions, badges, sponsors, seasons, notifications, leaderboards, system
 
 # Create the main API router
 api_router = APIRouter()
@@ -14,3 +14,4 @@ api_router.include_router(sponsors.router, prefix="/sponsors", tags=["sponsors"]
 api_router.include_router(seasons.router, prefix="/seasons", tags=["seasons"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 api_router.include_router(leaderboards.router, prefix="/leaderboards", tags=["leaderboards"])
+api_router.include_router(system.router, prefix="/system", tags=["system"])
@@ -1,13 +1,18 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db
+from app.db.replicas import get_read_db
 from app.core.config import settings
+from app.core.rate_limit import POLICIES, RateLimitPolicy, get_rate_limiter, retry_after_header
+from app.core.security import decode_access_token
 from app.models.user import User
 from app.schemas.token import TokenPayload
-from typing import Generator, Optional
+from app.services import user_cache
+from app.services.user_cache import AuthenticatedUser
+from typing import Any, Callable, Generator, Optional
 import uuid
 
 # OAuth2 token URL
@@ -16,11 +21,12 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 async def get_current_user(
-    db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
-) -> User:
+) -> AuthenticatedUser:
     """
-    Validate access token and return current user
+    Validate access token and return current user.
+    Returns the cached authorization fields (id, is_active, is_admin, name,
+    created_at); use get_current_user_record for the full row.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,9 +36,7 @@ async def get_current_user(
     
     try:
         # Decode JWT token
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         token_data = TokenPayload(**payload)
         
         if token_data.sub is None:
@@ -42,13 +46,24 @@ async def get_current_user(
     except (JWTError, ValidationError):
         raise credentials_exception
     
-    # Get user from database
-    from sqlalchemy import select
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalars().first()
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        raise credentials_exception
     
+    user = await user_cache.get(user_uuid)
     if user is None:
-        raise credentials_exception
+        # Get user from database, in a short-lived session so streaming
+        # endpoints don't keep the connection for the whole response
+        from sqlalchemy import select
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(User).where(User.id == user_uuid))
+            db_user = result.scalars().first()
+        
+        if db_user is None:
+            raise credentials_exception
+        user = await user_cache.store(db_user)
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -57,9 +72,29 @@ async def get_current_user(
     
     return user
 
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
+async def get_current_user_record(
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> User:
+    """
+    Load the current user's full row, for endpoints that return or modify it
+    """
+    from sqlalchemy import select
+    result = await db.execute(select(User).where(User.id == current_user.id))
+    user = result.scalars().first()
+    
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return user
+
+async def get_current_active_user(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+) -> AuthenticatedUser:
     """
     Get current active user
     """
@@ -71,8 +106,8 @@ async def get_current_active_user(
     return current_user
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_user),
+) -> AuthenticatedUser:
     """
     Get current admin user
     """
@@ -82,3 +117,44 @@ async def get_current_admin_user(
             detail="Not enough permissions"
         )
     return current_user
+
+def client_ip(request: Request) -> str:
+    """
+    The caller's IP address, from X-Forwarded-For only when
+    RATE_LIMIT_TRUST_FORWARDED_FOR says a proxy sets it
+    """
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+async def _enforce_rate_limit(policy: RateLimitPolicy, key: str) -> None:
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    
+    allowed, retry_after = await get_rate_limiter().hit(policy, key)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": retry_after_header(retry_after)},
+        )
+
+def rate_limit(policy_name: str, per: str = "ip") -> Callable[..., Any]:
+    """
+    Dependency throttling a route with one of the rate_limit.POLICIES,
+    keyed per client IP or, for authenticated routes, per user
+    """
+    policy = POLICIES[policy_name]
+    
+    if per == "user":
+        async def limit_per_user(current_user: AuthenticatedUser = Depends(get_current_user)) -> None:
+            await _enforce_rate_limit(policy, f"user:{current_user.id}")
+        return limit_per_user
+    if per == "ip":
+        async def limit_per_ip(request: Request) -> None:
+            await _enforce_rate_limit(policy, f"ip:{client_ip(request)}")
+        return limit_per_ip
+    
+    raise ValueError(f"Unknown rate limit key: {per}")
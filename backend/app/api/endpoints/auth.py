@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_db, get_current_user
-from app.core.security import verify_password, get_password_hash, create_token_response
+from app.api.deps import get_db, get_current_user_record, rate_limit
+from app.core.security import verify_and_update_password, get_password_hash, create_token_response
 from app.models.user import User
+from app.services import user_cache
 from app.schemas import UserCreate, User as UserSchema, UserUpdate, Token
 from typing import Any
 from sqlalchemy import select
@@ -11,7 +12,7 @@ import uuid
 
 router = APIRouter()
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit("login"))])
 async def login_access_token(
     db: AsyncSession = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
@@ -23,7 +24,12 @@ async def login_access_token(
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalars().first()
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if user:
+        verified, new_hash = await verify_and_update_password(form_data.password, user.password_hash)
+    else:
+        verified, new_hash = False, None
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -35,9 +41,15 @@ async def login_access_token(
             detail="Inactive user"
         )
     
+    # Upgrade the stored hash if BCRYPT_ROUNDS has changed since it was made
+    if new_hash:
+        user.password_hash = new_hash
+        db.add(user)
+        await db.commit()
+    
     return create_token_response(str(user.id))
 
-@router.post("/register", response_model=UserSchema)
+@router.post("/register", response_model=UserSchema, dependencies=[Depends(rate_limit("register"))])
 async def register_user(
     *,
     db: AsyncSession = Depends(get_db),
@@ -61,7 +73,7 @@ async def register_user(
         id=user_id,
         email=user_in.email,
         name=user_in.name,
-        password_hash=get_password_hash(user_in.password),
+        password_hash=await get_password_hash(user_in.password),
         bio=user_in.bio,
         github_url=user_in.github_url,
         portfolio_url=user_in.portfolio_url,
@@ -74,7 +86,7 @@ async def register_user(
 
 @router.get("/me", response_model=UserSchema)
 async def read_user_me(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_record)
 ) -> Any:
     """
     Get current user
@@ -86,7 +98,7 @@ async def update_user_me(
     *,
     db: AsyncSession = Depends(get_db),
     user_in: UserUpdate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_record)
 ) -> Any:
     """
     Update current user
@@ -94,12 +106,13 @@ async def update_user_me(
     # Update user attributes
     for key, value in user_in.dict(exclude_unset=True).items():
         if key == "password" and value:
-            setattr(current_user, "password_hash", get_password_hash(value))
+            setattr(current_user, "password_hash", await get_password_hash(value))
         elif hasattr(current_user, key):
             setattr(current_user, key, value)
     
     db.add(current_user)
     await db.commit()
     await db.refresh(current_user)
+    await user_cache.invalidate(current_user.id)
     
     return current_user
@@ -1,21 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_db, get_current_admin_user, get_current_user
+from app.api.deps import get_db, get_read_db, get_current_admin_user, get_current_user
+from app.services.user_cache import AuthenticatedUser
 from app.models.user import User
 from app.models.badge import Badge
 from app.models.user_badge import UserBadge
+from app.models.notification import NotificationType
 from app.schemas import Badge as BadgeSchema, BadgeCreate, BadgeUpdate
 from app.schemas.badge import BadgeWithUserCount
 from app.schemas.user_badge import UserBadge as UserBadgeSchema, UserBadgeCreate
+from app.schemas.user_badge import BulkUserBadgeCreate, BulkUserBadgeResult, InvalidUserBadge
+from app.models.submission import Submission
+from app.core.config import settings
+from app.services import badge_cache, badge_rules, notification_service
 from typing import Any, List, Optional
-from sqlalchemy import select, func
+from sqlalchemy import select, func, and_, or_, case, text
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
 import uuid
 
 router = APIRouter()
 
 @router.get("/", response_model=List[BadgeSchema])
 async def read_badges(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db("badges")),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
@@ -29,37 +36,22 @@ async def read_badges(
 
 @router.get("/with-counts", response_model=List[BadgeWithUserCount])
 async def read_badges_with_counts(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db("badges")),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
     """
-    Retrieve all badges with user counts
+    Retrieve all badges with user counts.
+    Served from cache, refreshed with one grouped query after badges change.
     """
-    # Get all badges
-    badges_result = await db.execute(select(Badge).offset(skip).limit(limit))
-    badges = badges_result.scalars().all()
-    
-    # Get user counts for each badge
-    badges_with_counts = []
-    for badge in badges:
-        count_result = await db.execute(
-            select(func.count(UserBadge.id)).where(UserBadge.badge_id == badge.id)
-        )
-        user_count = count_result.scalar()
-        
-        badge_with_count = BadgeWithUserCount.from_orm(badge)
-        badge_with_count.user_count = user_count
-        badges_with_counts.append(badge_with_count)
-    
-    return badges_with_counts
+    return await badge_cache.get_badges_with_counts(db, skip, limit)
 
 @router.post("/", response_model=BadgeSchema)
 async def create_badge(
     *,
     db: AsyncSession = Depends(get_db),
     badge_in: BadgeCreate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Create new badge (admin only)
@@ -87,13 +79,14 @@ async def create_badge(
     db.add(db_badge)
     await db.commit()
     await db.refresh(db_badge)
+    await badge_cache.invalidate()
     
     return db_badge
 
 @router.get("/{badge_id}", response_model=BadgeSchema)
 async def read_badge(
     badge_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db("badges"))
 ) -> Any:
     """
     Get a specific badge by id
@@ -115,7 +108,7 @@ async def update_badge(
     db: AsyncSession = Depends(get_db),
     badge_id: uuid.UUID,
     badge_in: BadgeUpdate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Update a badge (admin only)
@@ -139,6 +132,7 @@ async def update_badge(
     db.add(badge)
     await db.commit()
     await db.refresh(badge)
+    await badge_cache.invalidate()
     
     return badge
 
@@ -147,7 +141,7 @@ async def award_badge(
     *,
     db: AsyncSession = Depends(get_db),
     badge_award: UserBadgeCreate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Award a badge to a user (admin only)
@@ -217,15 +211,144 @@ async def award_badge(
     db.add(db_user_badge)
     await db.commit()
     await db.refresh(db_user_badge)
+    await badge_cache.invalidate()
     
-    # TODO: Create notification for user about new badge
+    await notification_service.enqueue_notifications([
+        notification_service.notification_row(
+            badge_award.user_id,
+            "You earned a badge",
+            f"You have been awarded the {badge.name} badge.",
+            NotificationType.BADGE_AWARDED,
+            badge.id
+        )
+    ], total=1)
     
     return db_user_badge
 
+def _requested_awards(awards: List[UserBadgeCreate]) -> Any:
+    """
+    Turn requested awards into a derived table, passed as three arrays
+    so thousands of rows cost one round trip
+    """
+    return (
+        text(
+            "SELECT * FROM unnest("
+            "CAST(:user_ids AS uuid[]), CAST(:badge_ids AS uuid[]), CAST(:submission_ids AS uuid[])"
+            ") AS requested(user_id, badge_id, submission_id)"
+        )
+        .bindparams(
+            user_ids=[award.user_id for award in awards],
+            badge_ids=[award.badge_id for award in awards],
+            submission_ids=[award.submission_id for award in awards]
+        )
+        .columns(
+            user_id=UUID(as_uuid=True),
+            badge_id=UUID(as_uuid=True),
+            submission_id=UUID(as_uuid=True)
+        )
+        .subquery("requested")
+    )
+
+@router.post("/award/bulk", response_model=BulkUserBadgeResult)
+async def award_badges_bulk(
+    *,
+    db: AsyncSession = Depends(get_db),
+    bulk_award: BulkUserBadgeCreate,
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Award many badges at once (admin only).
+    Validates every tuple with set-based queries, skips badges users already
+    hold, and notifies the recipients in one background job.
+    """
+    awards = bulk_award.awards
+    
+    if len(awards) > settings.BULK_BADGE_AWARD_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_BADGE_AWARD_MAX} awards per request"
+        )
+    
+    if not awards:
+        return BulkUserBadgeResult(requested=0, awarded=0, already_held=0)
+    
+    requested = _requested_awards(awards)
+    submission_matches = and_(
+        Submission.id == requested.c.submission_id,
+        Submission.user_id == requested.c.user_id
+    )
+    
+    # Find every invalid tuple in one pass
+    reason = case(
+        (User.id.is_(None), "User not found"),
+        (Badge.id.is_(None), "Badge not found"),
+        else_="Submission not found or does not belong to user"
+    )
+    invalid_result = await db.execute(
+        select(requested.c.user_id, requested.c.badge_id, requested.c.submission_id, reason.label("reason"))
+        .outerjoin(User, User.id == requested.c.user_id)
+        .outerjoin(Badge, Badge.id == requested.c.badge_id)
+        .outerjoin(Submission, submission_matches)
+        .where(
+            or_(
+                User.id.is_(None),
+                Badge.id.is_(None),
+                and_(requested.c.submission_id.is_not(None), Submission.id.is_(None))
+            )
+        )
+    )
+    invalid = [InvalidUserBadge(**row._mapping) for row in invalid_result.all()]
+    
+    # Insert the valid ones in one statement; duplicates and held badges are skipped
+    valid_awards = (
+        select(
+            func.gen_random_uuid(),
+            requested.c.user_id,
+            requested.c.badge_id,
+            requested.c.submission_id
+        )
+        .join(User, User.id == requested.c.user_id)
+        .join(Badge, Badge.id == requested.c.badge_id)
+        .outerjoin(Submission, submission_matches)
+        .where(or_(requested.c.submission_id.is_(None), Submission.id.is_not(None)))
+        .distinct(requested.c.user_id, requested.c.badge_id)
+        .order_by(requested.c.user_id, requested.c.badge_id)
+    )
+    inserted_result = await db.execute(
+        pg_insert(UserBadge)
+        .from_select(["id", "user_id", "badge_id", "submission_id"], valid_awards)
+        .on_conflict_do_nothing(index_elements=["user_id", "badge_id"])
+        .returning(UserBadge.user_id, UserBadge.badge_id)
+    )
+    inserted = inserted_result.all()
+    
+    await db.commit()
+    
+    badges_result = await db.execute(
+        select(Badge).where(Badge.id.in_({badge_id for _, badge_id in inserted}))
+    )
+    badges = {badge.id: badge for badge in badges_result.scalars().all()}
+    
+    await badge_rules.notify_awards([(user_id, badges[badge_id]) for user_id, badge_id in inserted])
+    
+    invalid_keys = {(award.user_id, award.badge_id, award.submission_id) for award in invalid}
+    valid_pairs = {
+        (award.user_id, award.badge_id)
+        for award in awards
+        if (award.user_id, award.badge_id, award.submission_id) not in invalid_keys
+    }
+    
+    return BulkUserBadgeResult(
+        requested=len(awards),
+        awarded=len(inserted),
+        already_held=len(valid_pairs) - len(inserted),
+        invalid=invalid
+    )
+
 @router.get("/{badge_id}/users", response_model=List[UserBadgeSchema])
 async def read_badge_users(
     badge_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db("badges")),
     skip: int = 0,
     limit: int = 100
 ) -> Any:
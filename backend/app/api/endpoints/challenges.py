@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_db, get_current_user, get_current_admin_user
-from app.models.user import User
+from app.api.deps import get_db, get_read_db, get_current_user, get_current_admin_user, rate_limit
+from app.services.user_cache import AuthenticatedUser
+from app.db import replicas
 from app.models.challenge import Challenge
 from app.models.sponsor import Sponsor
 from app.schemas import Challenge as ChallengeSchema, ChallengeCreate, ChallengeUpdate
@@ -15,7 +16,7 @@ router = APIRouter()
 
 @router.get("/", response_model=List[ChallengeSchema])
 async def read_challenges(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db("challenges")),
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
@@ -50,7 +51,7 @@ async def read_challenges(
 @router.get("/recommended", response_model=List[ChallengeSchema])
 async def read_recommended_challenges(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     limit: int = 5
 ) -> Any:
     """
@@ -87,7 +88,7 @@ async def create_challenge(
     *,
     db: AsyncSession = Depends(get_db),
     challenge_in: ChallengeCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Create new challenge (admin or sponsor only)
@@ -137,13 +138,14 @@ async def create_challenge(
     db.add(db_challenge)
     await db.commit()
     await db.refresh(db_challenge)
+    await replicas.mark_written("challenges")
     
     return db_challenge
 
 @router.get("/{challenge_id}", response_model=ChallengeSchema)
 async def read_challenge(
     challenge_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db("challenges"))
 ) -> Any:
     """
     Get a specific challenge by id
@@ -165,7 +167,7 @@ async def update_challenge(
     db: AsyncSession = Depends(get_db),
     challenge_id: uuid.UUID,
     challenge_in: ChallengeUpdate,
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Update a challenge (admin or sponsor only)
@@ -207,6 +209,7 @@ async def update_challenge(
     db.add(challenge)
     await db.commit()
     await db.refresh(challenge)
+    await replicas.mark_written("challenges")
     
     return challenge
 
@@ -216,7 +219,7 @@ async def read_challenge_submissions(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Get all submissions for a challenge (admin or sponsor only)
@@ -256,10 +259,10 @@ async def read_challenge_submissions(
     
     return submissions
 
-@router.get("/search/by-title", response_model=List[ChallengeSchema])
+@router.get("/search/by-title", response_model=List[ChallengeSchema], dependencies=[Depends(rate_limit("search"))])
 async def search_challenges_by_title(
     title: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db("challenges")),
     skip: int = 0,
     limit: int = 10,
     active_only: bool = True
@@ -283,7 +286,7 @@ async def search_challenges_by_title(
 async def delete_challenge(
     challenge_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Delete a challenge (admin only)
@@ -302,5 +305,6 @@ async def delete_challenge(
     
     db.add(challenge)
     await db.commit()
+    await replicas.mark_written("challenges")
     
     return None
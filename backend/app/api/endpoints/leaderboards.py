@@ -1,29 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_read_db, get_current_user, get_current_admin_user
+from app.services.user_cache import AuthenticatedUser
+from app.db.session import AsyncSessionLocal
+from app.services import events, leaderboard_cache, leaderboard_history, leaderboard_stream, score_sketches, season_standings
 from app.models.user import User
 from app.models.challenge import Challenge
 from app.models.season import Season
 from app.models.submission import Submission
 from app.models.leaderboard_entry import LeaderboardEntry
+from app.models.season_standing import SeasonStanding
+from app.models.career_standing import CareerStanding
+from app.models.user_badge import UserBadge
 from app.schemas.leaderboard import LeaderboardEntry as LeaderboardEntrySchema
 from app.schemas.leaderboard import LeaderboardEntryWithUser, ChallengeLeaderboard, SeasonLeaderboard, CareerLeaderboardEntry
-from typing import Any, List, Optional
-from sqlalchemy import select, func, desc, and_
+from app.schemas.user import User as UserSchema
+from app.schemas.challenge import Challenge as ChallengeSchema
+from app.schemas.leaderboard import SeasonStandingEntry, ChallengeLeaderboardWindow, SeasonLeaderboardWindow, CareerLeaderboardWindow
+from app.schemas.leaderboard import PercentileEstimate, RankHistoryPoint, SeasonStandings
+from typing import Any, AsyncIterator, List, Optional
+from datetime import datetime
+from sqlalchemy import select, func, desc, and_, tuple_, union_all
+import csv
+import io
+import json
 import uuid
 
 router = APIRouter()
 
+# Columns written by the streaming leaderboard export, in order
+EXPORT_COLUMNS = [
+    "rank", "score", "percentile", "user_id", "user_name", "email",
+    "github_url", "portfolio_url", "resume_url", "challenge_id", "submission_id",
+]
+
+# Rows fetched per server-side cursor round trip during exports
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
 @router.get("/challenge/{challenge_id}", response_model=ChallengeLeaderboard)
 async def read_challenge_leaderboard(
     challenge_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db("leaderboards:challenge", "challenge_id")),
     skip: int = 0,
     limit: int = 100
 ) -> Any:
     """
-    Get leaderboard for a specific challenge
+    Get leaderboard for a specific challenge.
+    Served as a raw JSON response with an ETag, bypassing response_model;
+    the body is built from ChallengeLeaderboard so it matches the schema.
     """
+    # Serve from cache (or a 304) until the leaderboard is regenerated
+    cache_key, etag, cached_response = await leaderboard_cache.lookup(
+        request, "challenge", challenge_id, skip, limit
+    )
+    if cached_response is not None:
+        return cached_response
+    
     # Check if challenge exists
     challenge_result = await db.execute(select(Challenge).where(Challenge.id == challenge_id))
     challenge = challenge_result.scalars().first()
@@ -54,8 +93,8 @@ async def read_challenge_leaderboard(
         user = user_result.scalars().first()
         
         entry_with_user = LeaderboardEntryWithUser.from_orm(entry)
-        entry_with_user.user = user
-        entry_with_user.challenge = challenge
+        entry_with_user.user = UserSchema.from_orm(user) if user else None
+        entry_with_user.challenge = ChallengeSchema.from_orm(challenge) if challenge else None
         
         entries_with_users.append(entry_with_user)
     
@@ -75,18 +114,27 @@ async def read_challenge_leaderboard(
         total_participants=total_participants
     )
     
-    return challenge_leaderboard
+    return await leaderboard_cache.store(request, cache_key, etag, challenge_leaderboard)
 
 @router.get("/season/{season_id}", response_model=SeasonLeaderboard)
 async def read_season_leaderboard(
     season_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db("leaderboards:season", "season_id")),
     skip: int = 0,
     limit: int = 100
 ) -> Any:
     """
-    Get leaderboard for a specific season
+    Get leaderboard for a specific season.
+    Served as a raw JSON response with an ETag, bypassing response_model;
+    the body is built from SeasonLeaderboard so it matches the schema.
     """
+    cache_key, etag, cached_response = await leaderboard_cache.lookup(
+        request, "season", season_id, skip, limit
+    )
+    if cached_response is not None:
+        return cached_response
+    
     # Check if season exists
     season_result = await db.execute(select(Season).where(Season.id == season_id))
     season = season_result.scalars().first()
@@ -121,8 +169,8 @@ async def read_season_leaderboard(
         challenge = challenge_result.scalars().first()
         
         entry_with_user = LeaderboardEntryWithUser.from_orm(entry)
-        entry_with_user.user = user
-        entry_with_user.challenge = challenge
+        entry_with_user.user = UserSchema.from_orm(user) if user else None
+        entry_with_user.challenge = ChallengeSchema.from_orm(challenge) if challenge else None
         
         entries_with_users.append(entry_with_user)
     
@@ -142,88 +190,365 @@ async def read_season_leaderboard(
         total_participants=total_participants
     )
     
-    return season_leaderboard
+    return await leaderboard_cache.store(request, cache_key, etag, season_leaderboard)
+
+def _season_standing_entry(standing: SeasonStanding, user_name: str) -> SeasonStandingEntry:
+    return SeasonStandingEntry(
+        rank=standing.rank,
+        user_id=standing.user_id,
+        user_name=user_name,
+        total_score=standing.total_score,
+        challenge_count=standing.challenge_count,
+        best_rank=standing.best_rank
+    )
+
+@router.get("/season/{season_id}/standings", response_model=SeasonStandings)
+async def read_season_standings(
+    season_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db("leaderboards:season", "season_id")),
+    skip: int = 0,
+    limit: int = 100
+) -> Any:
+    """
+    Get the overall season ranking (per-user totals across the season's challenges).
+    Served as a raw JSON response with an ETag, bypassing response_model;
+    the body is built from SeasonStandings so it matches the schema.
+    """
+    cache_key, etag, cached_response = await leaderboard_cache.lookup(
+        request, "season", season_id, "standings", skip, limit
+    )
+    if cached_response is not None:
+        return cached_response
+    
+    season_result = await db.execute(select(Season.name).where(Season.id == season_id))
+    season_name = season_result.scalar()
+    
+    if season_name is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Season not found"
+        )
+    
+    # Stored ranks are dense, so a page is a range scan on (season_id, rank)
+    # rather than an OFFSET over the whole season
+    standings_result = await db.execute(
+        select(SeasonStanding, User.name)
+        .join(User, User.id == SeasonStanding.user_id)
+        .where(SeasonStanding.season_id == season_id, SeasonStanding.rank > skip)
+        .order_by(SeasonStanding.rank)
+        .limit(limit)
+    )
+    rows = standings_result.all()
+    
+    async def count_participants() -> int:
+        count_result = await db.execute(
+            select(func.count()).select_from(SeasonStanding).where(SeasonStanding.season_id == season_id)
+        )
+        return count_result.scalar()
+    
+    total_participants = await leaderboard_cache.cached_value(
+        "season", season_id, "standings-count", count_participants
+    )
+    
+    standings_page = SeasonStandings(
+        season_id=season_id,
+        season_name=season_name,
+        entries=[_season_standing_entry(standing, user_name) for standing, user_name in rows],
+        total_participants=total_participants
+    )
+    
+    return await leaderboard_cache.store(request, cache_key, etag, standings_page)
+
+@router.post("/season/{season_id}/standings/refresh", status_code=status.HTTP_204_NO_CONTENT)
+async def regenerate_season_standings(
+    season_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Recompute a season's standings from its leaderboard entries (admin only)
+    """
+    season_result = await db.execute(select(Season).where(Season.id == season_id))
+    season = season_result.scalars().first()
+    
+    if not season:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Season not found"
+        )
+    
+    await season_standings.refresh_season_standings(db, season_id)
+    await db.commit()
+    await leaderboard_cache.invalidate("season", season_id)
+    
+    return None
+
+def _career_standings_query() -> Any:
+    # Badge counts are read live for just the returned rows; they don't affect rank
+    badge_count = (
+        select(func.count(UserBadge.id))
+        .where(UserBadge.user_id == CareerStanding.user_id)
+        .scalar_subquery()
+    )
+    return (
+        select(CareerStanding, User.name, badge_count)
+        .join(User, User.id == CareerStanding.user_id)
+    )
+
+def _career_entry(standing: CareerStanding, user_name: str, badge_count: int) -> CareerLeaderboardEntry:
+    return CareerLeaderboardEntry(
+        user_id=standing.user_id,
+        user_name=user_name,
+        total_score=standing.total_score,
+        challenge_count=standing.challenge_count,
+        average_score=standing.average_score,
+        best_rank=standing.best_rank,
+        badge_count=badge_count,
+        rank=standing.rank
+    )
 
 @router.get("/career", response_model=List[CareerLeaderboardEntry])
 async def read_career_leaderboard(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db(leaderboard_cache.read_scope("career", leaderboard_cache.CAREER_SCOPE_ID))),
     skip: int = 0,
     limit: int = 100
 ) -> Any:
     """
-    Get career leaderboard (aggregated scores across all challenges)
-    """
-    # This query uses SQLAlchemy Core to efficiently compute career stats
-    # We'll calculate various metrics per user:
-    # - Total score (sum of all submission scores)
-    # - Challenge count (number of challenges participated in)
-    # - Average score
-    # - Best rank
-    # - Badge count
-    
-    # 1. Get users with their total score and challenge count
-    from sqlalchemy import Integer, Float, distinct
-    from sqlalchemy.sql import text, values, literal_column
-    
-    query = text("""
-        WITH user_stats AS (
-            SELECT 
-                s.user_id,
-                COUNT(DISTINCT s.challenge_id) as challenge_count,
-                SUM(s.final_score) as total_score,
-                AVG(s.final_score) as average_score,
-                MIN(le.rank) as best_rank
-            FROM submission s
-            LEFT JOIN leaderboard_entry le ON s.id = le.submission_id
-            WHERE s.final_score IS NOT NULL
-            GROUP BY s.user_id
-        ),
-        badge_counts AS (
-            SELECT
-                user_id,
-                COUNT(id) as badge_count
-            FROM user_badge
-            GROUP BY user_id
+    Get career leaderboard (aggregated scores across all challenges), from
+    the precomputed career standings.
+    Served as a raw JSON response with an ETag, bypassing response_model;
+    the body is built from CareerLeaderboardEntry so it matches the schema.
+    """
+    cache_key, etag, cached_response = await leaderboard_cache.lookup(
+        request, "career", leaderboard_cache.CAREER_SCOPE_ID, skip, limit
+    )
+    if cached_response is not None:
+        return cached_response
+    
+    # Stored ranks are dense, so a page is a range scan rather than an OFFSET
+    result = await db.execute(
+        _career_standings_query()
+        .where(CareerStanding.rank > skip, CareerStanding.rank <= skip + limit)
+        .order_by(CareerStanding.rank)
+    )
+    career_entries = [_career_entry(*row) for row in result.all()]
+    
+    return await leaderboard_cache.store(request, cache_key, etag, career_entries)
+
+async def _stream_leaderboard_export(
+    criterion: Any,
+    export_format: str
+) -> AsyncIterator[str]:
+    """
+    Yield a leaderboard export row by row from a server-side cursor.
+    Uses its own session so the cursor outlives the request dependencies.
+    """
+    query = (
+        select(LeaderboardEntry, User)
+        .join(User, User.id == LeaderboardEntry.user_id)
+        .where(criterion)
+        .order_by(LeaderboardEntry.rank, LeaderboardEntry.challenge_id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    if export_format == "csv":
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query)
+        
+        async for partition in result.partitions():
+            for entry, user in partition:
+                values = [
+                    entry.rank,
+                    float(entry.score),
+                    float(entry.percentile) if entry.percentile is not None else None,
+                    str(user.id),
+                    user.name,
+                    user.email,
+                    user.github_url,
+                    user.portfolio_url,
+                    user.resume_url,
+                    str(entry.challenge_id),
+                    str(entry.submission_id),
+                ]
+                
+                if export_format == "csv":
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))))
+                    buffer.write("\n")
+            
+            # Hand each batch to the client and drop it before fetching the next
+            session.expunge_all()
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+@router.get("/challenge/{challenge_id}/export")
+async def export_challenge_leaderboard(
+    challenge_id: uuid.UUID,
+    export_format: str = Query("csv", alias="format", regex="^(csv|ndjson)$"),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Stream the full leaderboard for a challenge with user details as CSV or NDJSON (admin only)
+    """
+    # Checked in a short-lived session, released before the export's own
+    # session opens, so the download holds a single pooled connection
+    async with AsyncSessionLocal() as db:
+        challenge_result = await db.execute(select(Challenge.id).where(Challenge.id == challenge_id))
+        challenge_exists = challenge_result.scalar() is not None
+    
+    if not challenge_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Challenge not found"
         )
-        SELECT
-            u.id as user_id,
-            u.name as user_name,
-            COALESCE(us.total_score, 0) as total_score,
-            COALESCE(us.challenge_count, 0) as challenge_count,
-            COALESCE(us.average_score, 0) as average_score,
-            COALESCE(us.best_rank, 0) as best_rank,
-            COALESCE(bc.badge_count, 0) as badge_count
-        FROM "user" u
-        LEFT JOIN user_stats us ON u.id = us.user_id
-        LEFT JOIN badge_counts bc ON u.id = bc.user_id
-        ORDER BY total_score DESC, challenge_count DESC, average_score DESC
-        LIMIT :limit OFFSET :skip
-    """)
-    
-    result = await db.execute(query, {"limit": limit, "skip": skip})
-    rows = result.fetchall()
-    
-    # Create CareerLeaderboardEntry objects from query results
-    career_entries = []
-    for row in rows:
-        entry = CareerLeaderboardEntry(
-            user_id=row.user_id,
-            user_name=row.user_name,
-            total_score=row.total_score,
-            challenge_count=row.challenge_count,
-            average_score=row.average_score,
-            best_rank=row.best_rank,
-            badge_count=row.badge_count
+    
+    return StreamingResponse(
+        _stream_leaderboard_export(LeaderboardEntry.challenge_id == challenge_id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="leaderboard-{challenge_id}.{export_format}"'
+        }
+    )
+
+@router.get("/season/{season_id}/export")
+async def export_season_leaderboard(
+    season_id: uuid.UUID,
+    export_format: str = Query("csv", alias="format", regex="^(csv|ndjson)$"),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Stream every leaderboard entry in a season with user details as CSV or NDJSON (admin only)
+    """
+    # Checked in a short-lived session, released before the export's own
+    # session opens, so the download holds a single pooled connection
+    async with AsyncSessionLocal() as db:
+        season_result = await db.execute(select(Season.id).where(Season.id == season_id))
+        season_exists = season_result.scalar() is not None
+    
+    if not season_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Season not found"
         )
-        career_entries.append(entry)
     
-    return career_entries
+    return StreamingResponse(
+        _stream_leaderboard_export(LeaderboardEntry.season_id == season_id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="season-leaderboard-{season_id}.{export_format}"'
+        }
+    )
+
+async def _estimate_percentile(
+    db: AsyncSession,
+    scope: str,
+    scope_id: uuid.UUID,
+    score: Optional[float],
+    percentile: Optional[float]
+) -> PercentileEstimate:
+    if score is None and percentile is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide a score or a percentile"
+        )
+    
+    sketch = await score_sketches.get_sketch(db, scope, scope_id)
+    
+    if sketch is None or sketch.n == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No scores recorded for this {scope}"
+        )
+    
+    if score is not None:
+        percentile = sketch.percentile_of(score)
+    else:
+        score = sketch.score_at(percentile)
+    
+    return PercentileEstimate(count=sketch.n, score=score, percentile=percentile)
+
+@router.get("/challenge/{challenge_id}/percentile", response_model=PercentileEstimate)
+async def read_challenge_percentile(
+    challenge_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db("leaderboards:challenge", "challenge_id")),
+    score: Optional[float] = Query(None, ge=0, le=100),
+    percentile: Optional[float] = Query(None, ge=0, le=100)
+) -> Any:
+    """
+    Estimate the percentile of a score, or the score at a percentile, for a challenge
+    """
+    return await _estimate_percentile(db, "challenge", challenge_id, score, percentile)
+
+@router.get("/season/{season_id}/percentile", response_model=PercentileEstimate)
+async def read_season_percentile(
+    season_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db("leaderboards:season", "season_id")),
+    score: Optional[float] = Query(None, ge=0, le=100),
+    percentile: Optional[float] = Query(None, ge=0, le=100)
+) -> Any:
+    """
+    Estimate the percentile of a score, or the score at a percentile, for a season
+    """
+    return await _estimate_percentile(db, "season", season_id, score, percentile)
+
+@router.get("/challenge/{challenge_id}/live")
+async def stream_challenge_leaderboard(challenge_id: uuid.UUID) -> Any:
+    """
+    Subscribe to live rank deltas for a challenge as server-sent events.
+    Each "delta" event lists the entries that moved with their new rank and
+    score; a "resync" event means the client should refetch the full page.
+    The existence check uses a short-lived session, so open streams don't
+    hold a pooled connection.
+    """
+    async with AsyncSessionLocal() as db:
+        challenge_result = await db.execute(select(Challenge.id).where(Challenge.id == challenge_id))
+        challenge_exists = challenge_result.scalar() is not None
+    
+    if not challenge_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Challenge not found"
+        )
+    
+    return StreamingResponse(
+        leaderboard_stream.subscribe(challenge_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/challenge/{challenge_id}/history/{user_id}", response_model=List[RankHistoryPoint])
+async def read_user_rank_history(
+    challenge_id: uuid.UUID,
+    user_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db("leaderboards:challenge", "challenge_id")),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(200, ge=1, le=1000)
+) -> Any:
+    """
+    Get a user's rank trajectory on a challenge from the latest `limit`
+    leaderboard snapshots in the range.
+    A point is recorded whenever the leaderboard changed between snapshots.
+    """
+    return await leaderboard_history.get_rank_trajectory(db, challenge_id, user_id, since, until, limit)
 
 @router.get("/user/{user_id}/rank/{challenge_id}", response_model=LeaderboardEntrySchema)
 async def read_user_rank_for_challenge(
     user_id: uuid.UUID,
     challenge_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db("leaderboards:challenge", "challenge_id"))
 ) -> Any:
     """
     Get a user's rank for a specific challenge
@@ -265,11 +590,168 @@ async def read_user_rank_for_challenge(
     
     return entry
 
+@router.get("/challenge/{challenge_id}/around/{user_id}", response_model=ChallengeLeaderboardWindow)
+async def read_challenge_rank_window(
+    challenge_id: uuid.UUID,
+    user_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db("leaderboards:challenge", "challenge_id")),
+    k: int = Query(5, ge=1, le=50)
+) -> Any:
+    """
+    Get the k entries ranked above and below a user on a challenge leaderboard
+    """
+    # Ties share a rank, so entries are ordered by (rank, user_id) and the
+    # window is at most k on each side of the user's position in that order.
+    # The user's position is resolved inline so the window is one round trip.
+    user_entry = (
+        select(LeaderboardEntry.rank, LeaderboardEntry.user_id)
+        .where(
+            LeaderboardEntry.challenge_id == challenge_id,
+            LeaderboardEntry.user_id == user_id
+        )
+        .cte("user_entry")
+    )
+    position = tuple_(LeaderboardEntry.rank, LeaderboardEntry.user_id)
+    user_position = tuple_(user_entry.c.rank, user_entry.c.user_id)
+    above = (
+        select(LeaderboardEntry.id)
+        .where(LeaderboardEntry.challenge_id == challenge_id, position < user_position)
+        .order_by(LeaderboardEntry.rank.desc(), LeaderboardEntry.user_id.desc())
+        .limit(k)
+        .subquery()
+    )
+    from_user = (
+        select(LeaderboardEntry.id)
+        .where(LeaderboardEntry.challenge_id == challenge_id, position >= user_position)
+        .order_by(LeaderboardEntry.rank, LeaderboardEntry.user_id)
+        .limit(k + 1)
+        .subquery()
+    )
+    window_ids = union_all(select(above.c.id), select(from_user.c.id))
+    
+    window_result = await db.execute(
+        select(LeaderboardEntry, User, Challenge)
+        .join(User, User.id == LeaderboardEntry.user_id)
+        .join(Challenge, Challenge.id == LeaderboardEntry.challenge_id)
+        .where(LeaderboardEntry.id.in_(window_ids))
+        .order_by(LeaderboardEntry.rank, LeaderboardEntry.user_id)
+    )
+    rows = window_result.all()
+    
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User has no ranking for this challenge"
+        )
+    
+    entries_with_users = []
+    for entry, user, challenge in rows:
+        entry_with_user = LeaderboardEntryWithUser.from_orm(entry)
+        entry_with_user.user = UserSchema.from_orm(user) if user else None
+        entry_with_user.challenge = ChallengeSchema.from_orm(challenge) if challenge else None
+        entries_with_users.append(entry_with_user)
+    
+    user_rank = next(entry.rank for entry in entries_with_users if entry.user_id == user_id)
+    
+    return ChallengeLeaderboardWindow(
+        challenge_id=challenge_id,
+        user_id=user_id,
+        user_rank=user_rank,
+        entries=entries_with_users
+    )
+
+@router.get("/season/{season_id}/around/{user_id}", response_model=SeasonLeaderboardWindow)
+async def read_season_rank_window(
+    season_id: uuid.UUID,
+    user_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db("leaderboards:season", "season_id")),
+    k: int = Query(5, ge=1, le=50)
+) -> Any:
+    """
+    Get the k standings ranked above and below a user on a season leaderboard
+    """
+    # The user's rank is resolved inline so the whole window is a single
+    # range scan on (season_id, rank)
+    user_rank = (
+        select(SeasonStanding.rank)
+        .where(
+            SeasonStanding.season_id == season_id,
+            SeasonStanding.user_id == user_id
+        )
+        .scalar_subquery()
+    )
+    
+    window_result = await db.execute(
+        select(SeasonStanding, User.name)
+        .join(User, User.id == SeasonStanding.user_id)
+        .where(
+            SeasonStanding.season_id == season_id,
+            SeasonStanding.rank.between(user_rank - k, user_rank + k)
+        )
+        .order_by(SeasonStanding.rank)
+    )
+    rows = window_result.all()
+    
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User has no ranking for this season"
+        )
+    
+    entries = [_season_standing_entry(standing, user_name) for standing, user_name in rows]
+    user_rank = next(entry.rank for entry in entries if entry.user_id == user_id)
+    
+    return SeasonLeaderboardWindow(
+        season_id=season_id,
+        user_id=user_id,
+        user_rank=user_rank,
+        entries=entries
+    )
+
+@router.get("/career/around/{user_id}", response_model=CareerLeaderboardWindow)
+async def read_career_rank_window(
+    user_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db(leaderboard_cache.read_scope("career", leaderboard_cache.CAREER_SCOPE_ID))),
+    k: int = Query(5, ge=1, le=50)
+) -> Any:
+    """
+    Get the k entries ranked above and below a user on the career leaderboard
+    """
+    # The user's stored rank is resolved inline so the whole window is a
+    # single range scan on rank
+    user_rank = (
+        select(CareerStanding.rank)
+        .where(CareerStanding.user_id == user_id)
+        .scalar_subquery()
+    )
+    
+    result = await db.execute(
+        _career_standings_query()
+        .where(CareerStanding.rank.between(user_rank - k, user_rank + k))
+        .order_by(CareerStanding.rank)
+    )
+    rows = result.all()
+    
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    entries = [_career_entry(*row) for row in rows]
+    user_rank = next(entry.rank for entry in entries if entry.user_id == user_id)
+    
+    return CareerLeaderboardWindow(
+        user_id=user_id,
+        user_rank=user_rank,
+        entries=entries
+    )
+
 @router.post("/generate/{challenge_id}", response_model=List[LeaderboardEntrySchema])
 async def generate_leaderboard_for_challenge(
     challenge_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Generate or update leaderboard entries for a challenge based on final submission scores.
@@ -334,12 +816,41 @@ async def generate_leaderboard_for_challenge(
         db.add(entry)
         new_entries.append(entry)
     
+    # Keep the season's overall standings in step with this challenge; career
+    # standings span every challenge and are refreshed on their own schedule
+    await db.flush()
+    if challenge.season_id is not None:
+        await season_standings.refresh_season_standings(db, challenge.season_id)
+    
+    # Record the new rankings in the leaderboard history
+    await leaderboard_history.take_snapshot(db, challenge_id)
+    
+    # Rebuild the percentile sketches so they reflect re-reviewed scores
+    await score_sketches.rebuild_sketch(
+        db, "challenge", challenge_id,
+        (float(submission.final_score) for submission in submissions)
+    )
+    if challenge.season_id is not None:
+        season_scores = await db.stream_scalars(
+            select(Submission.final_score)
+            .join(Challenge, Challenge.id == Submission.challenge_id)
+            .where(
+                Challenge.season_id == challenge.season_id,
+                Submission.final_score.is_not(None)
+            )
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        await score_sketches.rebuild_sketch(db, "season", challenge.season_id, season_scores)
+    
     await db.commit()
+    await leaderboard_cache.invalidate_for_challenge(challenge_id, challenge.season_id)
+    leaderboard_stream.notify(challenge_id)
+    
+    # Rank-based badges (top 10%, winner) are awarded by the badge worker
+    events.publish(events.LEADERBOARD_GENERATED, challenge_id=challenge_id)
     
     # Refresh all entries to get their full data
     for entry in new_entries:
         await db.refresh(entry)
     
-    # TODO: Check for badge awards based on rank (e.g., top 10%, challenge winner)
-    
     return new_entries
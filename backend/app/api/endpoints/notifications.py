@@ -1,36 +1,159 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_db, get_current_user, get_current_admin_user
+from app.services.user_cache import AuthenticatedUser
 from app.models.user import User
 from app.models.notification import Notification, NotificationType
+from app.models.announcement import Announcement, AnnouncementReceipt
 from app.schemas import Notification as NotificationSchema, NotificationCreate, NotificationUpdate
-from typing import Any, List, Optional
-from sqlalchemy import select, func, desc
+from app.schemas import Announcement as AnnouncementSchema
+from app.schemas.notification import BulkNotificationCreate, NotificationJobStatus
+from app.models.challenge import Challenge
+from app.models.submission import Submission
+from app.db.session import AsyncSessionLocal
+from app.core.config import settings
+from app.services import notification_service, notification_stream, unread_counter
+from typing import Any, List, Optional, Set
+from sqlalchemy import select, func, desc, and_, or_, cast, literal, null, false, union_all, distinct, tuple_, text
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+import base64
 import uuid
+from datetime import datetime
 
 router = APIRouter()
 
+# Notifications sent per read when catching a live stream up
+STREAM_BATCH_SIZE = 100
+
+def _personal_notifications(user: AuthenticatedUser) -> Any:
+    """
+    Select a user's own notification rows in the merged notification shape
+    """
+    return select(
+        Notification.id,
+        Notification.user_id,
+        Notification.title,
+        Notification.message,
+        Notification.type,
+        Notification.read,
+        Notification.reference_id,
+        Notification.created_at
+    ).where(Notification.user_id == user.id)
+
+def _receipt_join(user: AuthenticatedUser) -> Any:
+    return and_(
+        AnnouncementReceipt.announcement_id == Announcement.id,
+        AnnouncementReceipt.user_id == user.id
+    )
+
+def _visible_announcements(user: AuthenticatedUser) -> Any:
+    """
+    Select the announcements a user can see (sent since they joined and not
+    dismissed) in the merged notification shape; read = has a receipt
+    """
+    return (
+        select(
+            Announcement.id,
+            literal(user.id, UUID(as_uuid=True)).label("user_id"),
+            Announcement.title,
+            Announcement.message,
+            cast(
+                literal(NotificationType.SYSTEM_ANNOUNCEMENT, Notification.type.type),
+                Notification.type.type
+            ).label("type"),
+            AnnouncementReceipt.id.is_not(None).label("read"),
+            cast(null(), UUID(as_uuid=True)).label("reference_id"),
+            Announcement.created_at
+        )
+        .outerjoin(AnnouncementReceipt, _receipt_join(user))
+        .where(
+            Announcement.created_at >= user.created_at,
+            or_(AnnouncementReceipt.dismissed.is_(None), AnnouncementReceipt.dismissed.is_(False))
+        )
+    )
+
+def _encode_cursor(created_at: datetime, notification_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{notification_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str) -> Any:
+    try:
+        created_at, notification_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(notification_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+async def _read_merged_notification(
+    db: AsyncSession,
+    user: AuthenticatedUser,
+    notification_id: uuid.UUID
+) -> Optional[NotificationSchema]:
+    """
+    Look up a notification or a visible announcement by id for a user
+    """
+    result = await db.execute(
+        union_all(
+            _personal_notifications(user).where(Notification.id == notification_id),
+            _visible_announcements(user).where(Announcement.id == notification_id)
+        )
+    )
+    row = result.first()
+    
+    return NotificationSchema.from_orm(row) if row else None
+
 @router.get("/", response_model=List[NotificationSchema])
 async def read_notifications(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
     unread_only: bool = False,
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
-    Retrieve current user's notifications
+    Retrieve current user's notifications.
+    Pass the X-Next-Cursor header of a full page as cursor to get the next
+    page by keyset on (created_at, id); skip is kept for older clients.
     """
-    query = select(Notification).where(Notification.user_id == current_user.id)
+    personal = _personal_notifications(current_user)
+    announcements = _visible_announcements(current_user)
     
     if unread_only:
-        query = query.where(Notification.read.is_(False))
+        personal = personal.where(Notification.read.is_(False))
+        announcements = announcements.where(AnnouncementReceipt.id.is_(None))
     
-    # Order by created_at (most recent first)
-    query = query.order_by(desc(Notification.created_at)).offset(skip).limit(limit)
+    # Each branch is served by a (user_id, created_at, id) index
+    if cursor:
+        before_created_at, before_id = _decode_cursor(cursor)
+        personal = personal.where(
+            tuple_(Notification.created_at, Notification.id) < tuple_(before_created_at, before_id)
+        )
+        announcements = announcements.where(
+            tuple_(Announcement.created_at, Announcement.id) < tuple_(before_created_at, before_id)
+        )
+    
+    # Merge announcements in at read time, ordered by created_at (most recent first)
+    merged = union_all(personal, announcements).subquery()
+    query = (
+        select(merged)
+        .order_by(desc(merged.c.created_at), desc(merged.c.id))
+        .limit(limit)
+    )
+    if not cursor:
+        query = query.offset(skip)
     
     result = await db.execute(query)
-    notifications = result.scalars().all()
+    notifications = [NotificationSchema.from_orm(row) for row in result.all()]
+    
+    if notifications and len(notifications) == limit:
+        last = notifications[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last.created_at, last.id)
     
     return notifications
 
@@ -39,7 +162,7 @@ async def create_notification(
     *,
     db: AsyncSession = Depends(get_db),
     notification_in: NotificationCreate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Create new notification (admin only)
@@ -66,6 +189,8 @@ async def create_notification(
     )
     
     db.add(db_notification)
+    await unread_counter.increment(db, [notification_in.user_id])
+    await notification_stream.publish(db, [notification_in.user_id])
     await db.commit()
     await db.refresh(db_notification)
     
@@ -74,37 +199,148 @@ async def create_notification(
 @router.get("/unread-count", response_model=int)
 async def get_unread_count(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    recount: bool = False,
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
-    Get count of unread notifications for current user
+    Get count of unread notifications for current user.
+    Served from a maintained counter; pass recount=true to rebuild it.
     """
-    result = await db.execute(
-        select(func.count()).where(
-            Notification.user_id == current_user.id,
-            Notification.read.is_(False)
+    if recount:
+        personal_unread = await unread_counter.recount(db, current_user.id)
+        await db.commit()
+    else:
+        personal_unread = await unread_counter.get_unread_notification_count(db, current_user.id)
+    
+    announcements_unread = await unread_counter.get_unread_announcement_count(db, current_user)
+    
+    return personal_unread + announcements_unread
+
+async def _stream_cursor(user: AuthenticatedUser, last_event_id: Optional[str]) -> Any:
+    """
+    Find the (created_at, id) position a stream starts after: the client's
+    last received notification, or else the newest one it already has
+    """
+    async with AsyncSessionLocal() as db:
+        if last_event_id:
+            try:
+                last_id = uuid.UUID(last_event_id)
+            except ValueError:
+                last_id = None
+            
+            if last_id is not None:
+                notification = await _read_merged_notification(db, user, last_id)
+                if notification:
+                    return (notification.created_at, notification.id)
+        
+        merged = union_all(_personal_notifications(user), _visible_announcements(user)).subquery()
+        result = await db.execute(
+            select(merged.c.created_at, merged.c.id)
+            .order_by(desc(merged.c.created_at), desc(merged.c.id))
+            .limit(1)
         )
-    )
-    count = result.scalar()
+        row = result.first()
+        
+        return (row.created_at, row.id) if row else None
+
+async def _notification_events(user: AuthenticatedUser, last_event_id: Optional[str]):
+    """
+    Yield server-sent events for a user's new notifications and announcements.
+    Reads with a short-lived session per wake-up so idle streams don't hold
+    a pooled connection; new announcements arrive already loaded, so a
+    broadcast doesn't make every stream query at once.
+    """
+    cursor = await _stream_cursor(user, last_event_id)
+    
+    yield ": connected\n\n"
     
-    return count
+    # Announcements pushed ahead of the cursor, skipped when a re-read reaches them
+    pushed: Set[uuid.UUID] = set()
+    
+    async for wakeup in notification_stream.wakeups(user.id):
+        if wakeup is None:
+            yield ": keepalive\n\n"
+            continue
+        
+        for announcement in wakeup.announcements:
+            notification = NotificationSchema(
+                **announcement,
+                user_id=user.id,
+                type=NotificationType.SYSTEM_ANNOUNCEMENT,
+                read=False
+            )
+            if notification.id in pushed:
+                continue
+            if cursor is not None and (notification.created_at, notification.id) <= cursor:
+                continue
+            
+            pushed.add(notification.id)
+            yield notification_stream.format_event(
+                "notification", jsonable_encoder(notification), event_id=notification.id
+            )
+        
+        if not wakeup.reread:
+            continue
+        
+        while True:
+            merged = union_all(_personal_notifications(user), _visible_announcements(user)).subquery()
+            query = (
+                select(merged)
+                .order_by(merged.c.created_at, merged.c.id)
+                .limit(STREAM_BATCH_SIZE)
+            )
+            if cursor is not None:
+                last_created_at, last_id = cursor
+                query = query.where(
+                    tuple_(merged.c.created_at, merged.c.id)
+                    > tuple_(literal(last_created_at), literal(last_id, UUID(as_uuid=True)))
+                )
+            
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(query)
+                rows = result.all()
+            
+            for row in rows:
+                notification = NotificationSchema.from_orm(row)
+                cursor = (notification.created_at, notification.id)
+                if notification.id in pushed:
+                    pushed.discard(notification.id)
+                    continue
+                yield notification_stream.format_event(
+                    "notification", jsonable_encoder(notification), event_id=notification.id
+                )
+            
+            if len(rows) < STREAM_BATCH_SIZE:
+                break
+
+@router.get("/stream")
+async def stream_notifications(
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> Any:
+    """
+    Subscribe to the current user's new notifications as server-sent events.
+    Each "notification" event carries the notification's id, so a reconnecting
+    client resumes after the last one it received (Last-Event-ID header or
+    last_event_id query parameter) without gaps.
+    """
+    return StreamingResponse(
+        _notification_events(current_user, last_event_id_header or last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.get("/{notification_id}", response_model=NotificationSchema)
 async def read_notification(
     notification_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Get a specific notification by id
     """
-    result = await db.execute(
-        select(Notification).where(
-            Notification.id == notification_id,
-            Notification.user_id == current_user.id
-        )
-    )
-    notification = result.scalars().first()
+    notification = await _read_merged_notification(db, current_user, notification_id)
     
     if not notification:
         raise HTTPException(
@@ -118,7 +354,7 @@ async def read_notification(
 async def mark_notification_read(
     notification_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Mark a notification as read
@@ -131,25 +367,43 @@ async def mark_notification_read(
     )
     notification = result.scalars().first()
     
-    if not notification:
+    if notification:
+        if not notification.read:
+            await unread_counter.decrement(db, current_user.id)
+        
+        # Mark as read
+        notification.read = True
+        
+        db.add(notification)
+        await db.commit()
+        await db.refresh(notification)
+        
+        return notification
+    
+    # Otherwise it may be an announcement: record a read receipt
+    announcement = await _read_merged_notification(db, current_user, notification_id)
+    
+    if not announcement:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
     
-    # Mark as read
-    notification.read = True
-    
-    db.add(notification)
+    await db.execute(
+        pg_insert(AnnouncementReceipt)
+        .values(id=uuid.uuid4(), announcement_id=notification_id, user_id=current_user.id, dismissed=False)
+        .on_conflict_do_nothing(index_elements=["announcement_id", "user_id"])
+    )
     await db.commit()
-    await db.refresh(notification)
+    await unread_counter.invalidate_announcements(current_user.id)
     
-    return notification
+    announcement.read = True
+    return announcement
 
 @router.put("/mark-all-read", status_code=status.HTTP_204_NO_CONTENT)
 async def mark_all_notifications_read(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Mark all notifications as read for the current user
@@ -167,7 +421,29 @@ async def mark_all_notifications_read(
     )
     
     await db.execute(stmt)
+    await unread_counter.reset(db, current_user.id)
+    
+    # Add read receipts for every unread announcement in one statement
+    unread_announcements = (
+        select(
+            func.gen_random_uuid(),
+            Announcement.id,
+            literal(current_user.id, UUID(as_uuid=True)),
+            false()
+        )
+        .outerjoin(AnnouncementReceipt, _receipt_join(current_user))
+        .where(
+            Announcement.created_at >= current_user.created_at,
+            AnnouncementReceipt.id.is_(None)
+        )
+    )
+    await db.execute(
+        pg_insert(AnnouncementReceipt)
+        .from_select(["id", "announcement_id", "user_id", "dismissed"], unread_announcements)
+        .on_conflict_do_nothing(index_elements=["announcement_id", "user_id"])
+    )
     await db.commit()
+    await unread_counter.invalidate_announcements(current_user.id)
     
     return None
 
@@ -175,7 +451,7 @@ async def mark_all_notifications_read(
 async def delete_notification(
     notification_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Delete a notification
@@ -188,53 +464,160 @@ async def delete_notification(
     )
     notification = result.scalars().first()
     
-    if not notification:
+    if notification:
+        if not notification.read:
+            await unread_counter.decrement(db, current_user.id)
+        
+        # Delete notification
+        await db.delete(notification)
+        await db.commit()
+        
+        return None
+    
+    # Announcements are shared, so "deleting" one dismisses it for this user
+    announcement = await _read_merged_notification(db, current_user, notification_id)
+    
+    if not announcement:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
     
-    # Delete notification
-    await db.delete(notification)
+    await db.execute(
+        pg_insert(AnnouncementReceipt)
+        .values(id=uuid.uuid4(), announcement_id=notification_id, user_id=current_user.id, dismissed=True)
+        .on_conflict_do_update(
+            index_elements=["announcement_id", "user_id"],
+            set_={"dismissed": True}
+        )
+    )
     await db.commit()
+    await unread_counter.invalidate_announcements(current_user.id)
     
     return None
 
-@router.post("/system-announcement", response_model=List[NotificationSchema])
+@router.post("/system-announcement", response_model=AnnouncementSchema)
 async def create_system_announcement(
     *,
     db: AsyncSession = Depends(get_db),
     title: str,
     message: str,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Create a system announcement for all active users (admin only).
+    Stored as a single row and merged into each user's notifications when read.
+    """
+    announcement_id = uuid.uuid4()
+    db_announcement = Announcement(
+        id=announcement_id,
+        title=title,
+        message=message,
+        created_by=current_user.id
+    )
+    
+    db.add(db_announcement)
+    await notification_stream.publish_announcement(db, announcement_id)
+    await db.commit()
+    await db.refresh(db_announcement)
+    await unread_counter.invalidate_announcements()
+    
+    return db_announcement
+
+@router.post("/bulk", response_model=NotificationJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def create_bulk_notifications(
+    *,
+    db: AsyncSession = Depends(get_db),
+    bulk_in: BulkNotificationCreate,
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
-    Create a system announcement notification for all active users (admin only)
+    Send a notification to many users in the background (admin only).
+    Ids that match no user are skipped and reported on the job.
+    Poll /notifications/jobs/{job_id} for progress.
     """
-    # Get all active users
-    users_result = await db.execute(select(User).where(User.is_active.is_(True)))
-    users = users_result.scalars().all()
+    requested = set(bulk_in.user_ids)
     
-    notifications = []
+    # One array-bound lookup, so the check costs a single round trip at any size
+    result = await db.execute(
+        text('SELECT id FROM "user" WHERE id = ANY(CAST(:ids AS uuid[]))'),
+        {"ids": list(requested)}
+    )
+    known = set(result.scalars().all())
+    rejected = [str(user_id) for user_id in requested - known]
     
-    # Create notification for each user
-    for user in users:
-        notification_id = uuid.uuid4()
-        db_notification = Notification(
-            id=notification_id,
-            user_id=user.id,
-            title=title,
-            message=message,
-            type=NotificationType.SYSTEM_ANNOUNCEMENT
+    rows = [
+        notification_service.notification_row(
+            user_id, bulk_in.title, bulk_in.message, bulk_in.type, bulk_in.reference_id
         )
-        
-        db.add(db_notification)
-        notifications.append(db_notification)
+        for user_id in known
+    ]
     
-    await db.commit()
+    job = await notification_service.enqueue_notifications(
+        rows, total=len(rows), rejected_user_ids=rejected
+    )
     
-    # Refresh all notifications to get their full data
-    for notification in notifications:
-        await db.refresh(notification)
+    return job.to_dict()
+
+async def _challenge_reminder_rows(challenge_id: uuid.UUID, title: str, message: str):
+    # Streams participants with its own session, since the job outlives the request
+    async with AsyncSessionLocal() as db:
+        participants = await db.stream_scalars(
+            select(distinct(Submission.user_id))
+            .where(Submission.challenge_id == challenge_id)
+            .execution_options(yield_per=settings.NOTIFICATION_BULK_CHUNK_SIZE)
+        )
+        async for user_id in participants:
+            yield notification_service.notification_row(
+                user_id, title, message, NotificationType.CHALLENGE_REMINDER, challenge_id
+            )
+
+@router.post("/challenge-reminder/{challenge_id}", response_model=NotificationJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def create_challenge_reminder(
+    *,
+    db: AsyncSession = Depends(get_db),
+    challenge_id: uuid.UUID,
+    title: str,
+    message: str,
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Send a reminder to every participant of a challenge in the background (admin only)
+    """
+    challenge_result = await db.execute(select(Challenge).where(Challenge.id == challenge_id))
+    challenge = challenge_result.scalars().first()
     
-    return notifications
+    if not challenge:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Challenge not found"
+        )
+    
+    count_result = await db.execute(
+        select(func.count(distinct(Submission.user_id))).where(Submission.challenge_id == challenge_id)
+    )
+    
+    job = await notification_service.enqueue_notifications(
+        _challenge_reminder_rows(challenge_id, title, message),
+        total=count_result.scalar()
+    )
+    
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}", response_model=NotificationJobStatus)
+async def read_notification_job(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Get the progress of a bulk notification job (admin only)
+    """
+    job = await notification_service.get_job_status(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notification job not found"
+        )
+    
+    return job
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_db, get_current_admin_user
-from app.models.user import User
+from app.services.user_cache import AuthenticatedUser
 from app.models.season import Season
 from app.models.challenge import Challenge
 from app.schemas import Season as SeasonSchema, SeasonCreate, SeasonUpdate
@@ -66,7 +66,7 @@ async def create_season(
     *,
     db: AsyncSession = Depends(get_db),
     season_in: SeasonCreate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Create new season (admin only)
@@ -144,7 +144,7 @@ async def update_season(
     db: AsyncSession = Depends(get_db),
     season_id: uuid.UUID,
     season_in: SeasonUpdate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Update a season (admin only)
@@ -245,7 +245,7 @@ async def read_season_challenges(
 async def delete_season(
     season_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Delete a season (admin only)
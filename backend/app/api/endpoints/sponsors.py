@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_db, get_current_admin_user, get_current_user
-from app.models.user import User
+from app.api.deps import get_db, get_current_admin_user, get_current_user, rate_limit
+from app.services.user_cache import AuthenticatedUser
 from app.models.sponsor import Sponsor
 from app.models.challenge import Challenge
 from app.schemas import Sponsor as SponsorSchema, SponsorCreate, SponsorUpdate
@@ -31,7 +31,7 @@ async def create_sponsor(
     *,
     db: AsyncSession = Depends(get_db),
     sponsor_in: SponsorCreate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Create new sponsor (admin only)
@@ -88,7 +88,7 @@ async def update_sponsor(
     db: AsyncSession = Depends(get_db),
     sponsor_id: uuid.UUID,
     sponsor_in: SponsorUpdate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Update a sponsor (admin only)
@@ -153,7 +153,7 @@ async def read_sponsor_challenges(
 async def delete_sponsor(
     sponsor_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Delete a sponsor (admin only)
@@ -185,7 +185,7 @@ async def delete_sponsor(
     
     return None
 
-@router.get("/search/by-name", response_model=List[SponsorSchema])
+@router.get("/search/by-name", response_model=List[SponsorSchema], dependencies=[Depends(rate_limit("search"))])
 async def search_sponsors_by_name(
     name: str,
     db: AsyncSession = Depends(get_db),
@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_db, get_current_user, get_current_admin_user
-from app.models.user import User
+from app.api.deps import get_db, get_current_user, get_current_admin_user, rate_limit
+from app.services.user_cache import AuthenticatedUser
 from app.models.submission import Submission, SubmissionStatus
 from app.models.challenge import Challenge
 from app.schemas import Submission as SubmissionSchema, SubmissionCreate, SubmissionUpdate
 from app.schemas.submission import SubmissionWithEvaluation
+from app.models.notification import NotificationType
+from app.services import events, leaderboard_cache, notification_service, score_sketches
 from typing import Any, List, Optional
 from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 import uuid
 from datetime import datetime, timezone
 
@@ -20,7 +23,7 @@ async def read_submissions(
     limit: int = 100,
     status: Optional[SubmissionStatus] = None,
     challenge_id: Optional[uuid.UUID] = None,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Retrieve submissions with optional filtering (admin only)
@@ -47,7 +50,7 @@ async def read_my_submissions(
     skip: int = 0,
     limit: int = 100,
     challenge_id: Optional[uuid.UUID] = None,
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Retrieve current user's submissions
@@ -73,7 +76,7 @@ async def create_submission(
     *,
     db: AsyncSession = Depends(get_db),
     submission_in: SubmissionCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Create new submission
@@ -130,9 +133,19 @@ async def create_submission(
     )
     
     db.add(db_submission)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request created it first (uq_submission_user_id_challenge_id)
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You already have a submission for this challenge. Please update it instead."
+        )
     await db.refresh(db_submission)
     
+    events.publish(events.SUBMISSION_CREATED, challenge_id=db_submission.challenge_id, user_id=current_user.id)
+    
     # TODO: Queue submission for automated evaluation
     # This would be handled by a background task/worker
     
@@ -142,7 +155,7 @@ async def create_submission(
 async def read_submission(
     submission_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Get a specific submission by id
@@ -179,7 +192,7 @@ async def update_submission(
     db: AsyncSession = Depends(get_db),
     submission_id: uuid.UUID,
     submission_in: SubmissionUpdate,
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Update a submission
@@ -241,11 +254,15 @@ async def update_submission(
     
     return submission
 
-@router.post("/{submission_id}/evaluate", response_model=SubmissionWithEvaluation)
+@router.post(
+    "/{submission_id}/evaluate",
+    response_model=SubmissionWithEvaluation,
+    dependencies=[Depends(rate_limit("evaluate", per="user"))]
+)
 async def evaluate_submission(
     submission_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Trigger evaluation for a submission (admin only)
@@ -278,7 +295,7 @@ async def review_submission(
     submission_id: uuid.UUID,
     human_score: float = Body(..., ge=0, le=100),
     feedback: str = Body(...),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Submit human review for a submission (admin only)
@@ -299,6 +316,10 @@ async def review_submission(
             detail="Submission must be evaluated by AI before human review"
         )
     
+    # Only the first final score is streamed into the percentile sketches;
+    # re-reviews are picked up when the leaderboard is regenerated
+    is_first_final_score = submission.final_score is None
+    
     # Update human review data
     submission.human_score = human_score
     submission.feedback = feedback
@@ -311,11 +332,64 @@ async def review_submission(
     else:
         submission.final_score = human_score
     
+    challenge_result = await db.execute(select(Challenge.season_id).where(Challenge.id == submission.challenge_id))
+    season_id = challenge_result.scalar()
+    
+    if is_first_final_score:
+        await score_sketches.record_score(
+            db, submission.challenge_id, season_id, float(submission.final_score)
+        )
+    
+    db.add(submission)
+    await db.commit()
+    await db.refresh(submission)
+    
+    events.publish(events.SUBMISSION_REVIEWED, challenge_id=submission.challenge_id, user_id=submission.user_id)
+    
+    # Final scores feed the career leaderboard, so drop cached pages
+    await leaderboard_cache.invalidate_for_challenge(submission.challenge_id, season_id)
+    
+    # Let the submitter know their review is in, without waiting on the insert
+    await notification_service.enqueue_notifications([
+        notification_service.notification_row(
+            submission.user_id,
+            "Your submission has been reviewed",
+            "A judge has reviewed your submission and left feedback.",
+            NotificationType.FEEDBACK_RECEIVED,
+            submission.id
+        )
+    ], total=1)
+    
+    return submission
+
+@router.put("/{submission_id}/favorite", response_model=SubmissionSchema)
+async def mark_submission_favorite(
+    *,
+    db: AsyncSession = Depends(get_db),
+    submission_id: uuid.UUID,
+    favorite: bool = Body(True, embed=True),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Mark or unmark a submission as a sponsor favorite (admin only, on the sponsor's behalf)
+    """
+    result = await db.execute(select(Submission).where(Submission.id == submission_id))
+    submission = result.scalars().first()
+    
+    if not submission:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Submission not found"
+        )
+    
+    submission.is_sponsor_favorite = favorite
+    
     db.add(submission)
     await db.commit()
     await db.refresh(submission)
     
-    # TODO: Update leaderboard and check for badge awards
+    if favorite:
+        events.publish(events.SUBMISSION_FAVORITED, challenge_id=submission.challenge_id, user_id=submission.user_id)
     
     return submission
 
@@ -323,7 +397,7 @@ async def review_submission(
 async def delete_submission(
     submission_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Delete a submission
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from app.api.deps import get_current_admin_user
+from app.services.user_cache import AuthenticatedUser
+from app.db.query_stats import route_metrics
+from app.db.replicas import replicas
+from app.db.session import engine
+from app.schemas.system import DatabasePoolStatus, RouteQueryStats
+from typing import Any, List
+
+router = APIRouter()
+
+@router.get("/db-pool", response_model=List[DatabasePoolStatus])
+async def read_database_pools(
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Database connection pool occupancy and wait times (admin only)
+    """
+    pools = [{"name": "primary", **engine.pool.stats()}]
+    for replica in replicas:
+        pools.append({
+            "name": replica.name,
+            "healthy": replica.healthy,
+            "lag_seconds": replica.lag_seconds,
+            **replica.engine.pool.stats()
+        })
+    return pools
+
+@router.get("/db-queries", response_model=List[RouteQueryStats])
+async def read_query_stats(
+    limit: int = 50,
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Per-route query counts and database time, busiest first (admin only)
+    """
+    routes = sorted(route_metrics.values(), key=lambda metrics: metrics.db_seconds, reverse=True)
+    return [metrics.to_dict() for metrics in routes[:limit]]
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_db, get_current_admin_user, get_current_user
+from app.api.deps import get_db, get_read_db, get_current_admin_user, get_current_user, rate_limit
+from app.services.user_cache import AuthenticatedUser
 from app.models.user import User
 from app.schemas import User as UserSchema, UserCreate, UserUpdate
 from app.schemas.badge import Badge
+from app.services import user_cache
 from typing import Any, List, Optional
 from sqlalchemy import select, func
 import uuid
@@ -15,7 +17,7 @@ async def read_users(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Retrieve users (admin only)
@@ -28,7 +30,7 @@ async def read_users(
 async def read_user(
     user_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> Any:
     """
     Get a specific user by id
@@ -54,7 +56,7 @@ async def read_user(
 @router.get("/{user_id}/badges", response_model=List[Badge])
 async def read_user_badges(
     user_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db("badges"))
 ) -> Any:
     """
     Get all badges for a user
@@ -88,7 +90,7 @@ async def update_user(
     db: AsyncSession = Depends(get_db),
     user_id: uuid.UUID,
     user_in: UserUpdate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Update a user (admin only)
@@ -106,7 +108,7 @@ async def update_user(
     update_data = user_in.dict(exclude_unset=True)
     if "password" in update_data and update_data["password"]:
         from app.core.security import get_password_hash
-        update_data["password_hash"] = get_password_hash(update_data.pop("password"))
+        update_data["password_hash"] = await get_password_hash(update_data.pop("password"))
     
     for key, value in update_data.items():
         if hasattr(user, key):
@@ -116,13 +118,18 @@ async def update_user(
     await db.commit()
     await db.refresh(user)
     
+    # With Redis, deactivation and admin changes reach every worker at once;
+    # a worker that misses the invalidation (or any worker, without Redis)
+    # serves the old entry for at most AUTH_USER_CACHE_TTL_SECONDS
+    await user_cache.invalidate(user.id)
+    
     return user
 
-@router.get("/search/by-email", response_model=UserSchema)
+@router.get("/search/by-email", response_model=UserSchema, dependencies=[Depends(rate_limit("search", per="user"))])
 async def search_user_by_email(
     email: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Search for a user by email (admin only)
@@ -138,13 +145,13 @@ async def search_user_by_email(
     
     return user
 
-@router.get("/search/by-name", response_model=List[UserSchema])
+@router.get("/search/by-name", response_model=List[UserSchema], dependencies=[Depends(rate_limit("search", per="user"))])
 async def search_users_by_name(
     name: str,
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 10,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ) -> Any:
     """
     Search for users by name (admin only)
@@ -0,0 +1,129 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+
+class CacheBackend:
+    """
+    Minimal async key/value interface shared by the cache backends.
+    Values are strings; callers serialize before storing.
+    """
+    
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+    
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        raise NotImplementedError
+    
+    async def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """
+        Set a key only if it does not exist yet. Returns True if it was set.
+        """
+        raise NotImplementedError
+    
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+    
+    async def incr(self, key: str, amount: int = 1) -> int:
+        raise NotImplementedError
+
+class MemoryCache(CacheBackend):
+    """
+    In-process LRU cache with per-key expiry. Only suitable for single-worker
+    deployments, since invalidations are not shared between processes.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+    
+    def _get_live(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def _store(self, key: str, value: str, ttl: Optional[int]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+    
+    async def get(self, key: str) -> Optional[str]:
+        return self._get_live(key)
+    
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self._store(key, value, ttl)
+    
+    async def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        if self._get_live(key) is not None:
+            return False
+        self._store(key, value, ttl)
+        return True
+    
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+    
+    async def clear(self) -> None:
+        self._data.clear()
+    
+    async def incr(self, key: str, amount: int = 1) -> int:
+        item = self._data.get(key)
+        expires_at = item[1] if item else None
+        value = int(self._get_live(key) or 0) + amount
+        self._data[key] = (str(value), expires_at)
+        self._data.move_to_end(key)
+        return value
+
+class RedisCache(CacheBackend):
+    """
+    Redis-backed cache shared by every API worker (uses REDIS_URL)
+    """
+    
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        
+        self.client = redis.from_url(url, decode_responses=True)
+    
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(key)
+    
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        await self.client.set(key, value, ex=ttl)
+    
+    async def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        return bool(await self.client.set(key, value, ex=ttl, nx=True))
+    
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+    
+    async def incr(self, key: str, amount: int = 1) -> int:
+        return await self.client.incrby(key, amount)
+
+_caches: Dict[str, CacheBackend] = {}
+
+def get_cache(backend: Optional[str] = None) -> CacheBackend:
+    """
+    Return the process-wide cache for the given backend name
+    ("memory" or "redis"), defaulting to settings.CACHE_BACKEND
+    """
+    backend = backend or settings.CACHE_BACKEND
+    
+    if backend not in _caches:
+        if backend == "redis":
+            _caches[backend] = RedisCache(settings.REDIS_URL)
+        elif backend == "memory":
+            _caches[backend] = MemoryCache(max_entries=settings.MEMORY_CACHE_MAX_ENTRIES)
+        else:
+            raise ValueError(f"Unknown cache backend: {backend}")
+    
+    return _caches[backend]
@@ -18,11 +18,35 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: PostgresDsn
+    DB_POOL_SIZE: int = 10              # Connections kept open per worker
+    DB_MAX_OVERFLOW: int = 10           # Extra connections allowed at peak, closed when returned
+    DB_POOL_TIMEOUT: float = 30         # Seconds a request waits for a free connection
+    DB_POOL_RECYCLE: int = 1800         # Reconnect connections older than this (-1 never)
+    DB_POOL_PRE_PING: bool = True       # Test connections on checkout; costs a round trip each
+    DB_POOL_WARMUP_CONNECTIONS: int = 5  # Opened at startup, capped at DB_POOL_SIZE
+    
+    # Read replicas for read-only endpoints (none: everything reads from the primary)
+    DATABASE_REPLICA_URLS: List[str] = []
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5         # Lagging replicas are skipped
+    DATABASE_REPLICA_CHECK_INTERVAL_SECONDS: float = 5
+    DATABASE_REPLICA_CHECK_TIMEOUT_SECONDS: float = 2
+    
+    # Per-request query stats (X-DB-* headers in development, /api/system/db-queries)
+    DB_QUERY_STATS_ENABLED: bool = True
+    DB_SLOW_QUERY_MS: float = 200       # Statements slower than this are logged with their parameters
+    DB_N_PLUS_ONE_THRESHOLD: int = 5    # Same statement this many times in one request is flagged
     
     # Authentication
     SECRET_KEY: str
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"            # HS*, or RS*/ES* with the PEM keys below
+    JWT_PRIVATE_KEY: Optional[str] = None   # PEM signing key for asymmetric algorithms
+    JWT_PUBLIC_KEY: Optional[str] = None    # PEM verification key; enough for services that only verify
+    JWT_CACHE_MAX_ENTRIES: int = 10000      # Verified tokens remembered per worker
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12             # Changing this rehashes passwords on next login
+    PASSWORD_HASH_WORKERS: int = 4      # Threads running bcrypt off the event loop
+    AUTH_USER_CACHE_TTL_SECONDS: int = 10           # Per-worker authenticated user cache
+    AUTH_USER_SHARED_CACHE_TTL_SECONDS: int = 300   # Redis tier, when CACHE_BACKEND=redis
     
     # AWS S3 or equivalent for file storage
     S3_ACCESS_KEY: str
@@ -33,6 +57,21 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str
     
+    # Caching ("memory" for single-node runs, "redis" for multi-worker fleets)
+    CACHE_BACKEND: str = "memory"
+    MEMORY_CACHE_MAX_ENTRIES: int = 10000
+    LEADERBOARD_CACHE_TTL_SECONDS: int = 300
+    
+    # Rate limiting (the backend defaults to CACHE_BACKEND)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Optional[str] = None
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False   # Only behind a proxy that sets X-Forwarded-For
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10          # Per client IP
+    RATE_LIMIT_REGISTER_PER_HOUR: int = 5          # Per client IP
+    RATE_LIMIT_EVALUATE_PER_HOUR: int = 30         # Per user, refilled steadily
+    RATE_LIMIT_EVALUATE_BURST: int = 5
+    RATE_LIMIT_SEARCH_PER_MINUTE: int = 60         # Per user, or per IP when anonymous
+    
     # AI Services
     OPENAI_API_KEY: str
     
@@ -42,12 +81,56 @@ class Settings(BaseSettings):
     SMTP_USER: str
     SMTP_PASSWORD: str
     EMAIL_FROM: EmailStr
+    SMTP_USE_TLS: bool = False          # Implicit TLS (usually port 465)
+    SMTP_START_TLS: bool = True         # Upgrade with STARTTLS (usually port 587)
+    SMTP_POOL_SIZE: int = 3             # Persistent connections per worker
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    SMTP_RATE_LIMIT_PER_SECOND: float = 10  # 0 disables rate limiting
+    SMTP_SEND_ATTEMPTS: int = 3
+    
+    # Largest number of awards accepted by one bulk badge award request
+    BULK_BADGE_AWARD_MAX: int = 10000
+    
+    # Seconds the badge worker gathers events before evaluating them together
+    BADGE_WORKER_COALESCE_SECONDS: float = 1
+    
+    # Notification email digests (0 disables them)
+    EMAIL_DIGEST_INTERVAL_MINUTES: int = 0
+    EMAIL_DIGEST_MAX_ITEMS: int = 20
     
     # Application-specific settings
     MAX_SUBMISSION_SIZE_MB: int = 100  # Maximum file size for submissions
     CHALLENGES_PER_PAGE: int = 10      # Pagination default
     SUBMISSIONS_PER_PAGE: int = 10     # Pagination default
     
+    # Rows per multi-row INSERT (and per transaction) for bulk notifications
+    NOTIFICATION_BULK_CHUNK_SIZE: int = 1000
+    
+    # Leaderboard history (0 disables periodic snapshots)
+    LEADERBOARD_SNAPSHOT_INTERVAL_MINUTES: int = 60
+    # Decompressed snapshots kept per worker for rank history reads
+    LEADERBOARD_SNAPSHOT_CACHE_SIZE: int = 64
+    
+    # Career standings span every challenge, so they're recomputed on this
+    # interval rather than on each leaderboard generation (0 disables it)
+    CAREER_STANDINGS_REFRESH_MINUTES: int = 5
+    
+    # Seconds between live leaderboard producers checking for a new version
+    LEADERBOARD_STREAM_POLL_SECONDS: int = 2
+    
+    # Read notifications older than this are purged (0 disables the retention job)
+    NOTIFICATION_RETENTION_DAYS: int = 90
+    NOTIFICATION_RETENTION_INTERVAL_MINUTES: int = 60
+    
+    # Rows deleted per retention transaction
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = 1000
+    
+    @field_validator("NOTIFICATION_BULK_CHUNK_SIZE")
+    def clamp_notification_chunk_size(cls, v: int) -> int:
+        # A chunk is one multi-row INSERT binding 7 parameters per notification,
+        # and asyncpg accepts at most 32767 parameters per statement
+        return max(1, min(v, 32767 // 7))
+    
     # Function to validate the PostgreSQL dsn
     @field_validator("DATABASE_URL")
     def assemble_db_connection(cls, v: Optional[str], info: dict) -> Any:
@@ -0,0 +1,213 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.core.cache import get_cache
+from app.core.config import settings
+
+class RateLimitPolicy:
+    """
+    How often one client may call a route.
+    
+    "sliding_window" allows `limit` calls in any `period` seconds, weighting
+    the previous fixed window by how much of it still overlaps. "token_bucket"
+    allows bursts of up to `burst` calls, refilled at `limit` per `period`.
+    """
+    
+    def __init__(self, name: str, limit: int, period: int, algorithm: str = "sliding_window", burst: Optional[int] = None):
+        if algorithm not in ("sliding_window", "token_bucket"):
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+        
+        self.name = name
+        self.limit = limit
+        self.period = period
+        self.algorithm = algorithm
+        self.burst = burst or limit
+    
+    @property
+    def refill_rate(self) -> float:
+        # Tokens per second, for token buckets
+        return self.limit / self.period
+
+# Route-level policies, applied with deps.rate_limit(name)
+POLICIES: Dict[str, RateLimitPolicy] = {
+    "login": RateLimitPolicy("login", settings.RATE_LIMIT_LOGIN_PER_MINUTE, 60),
+    "register": RateLimitPolicy("register", settings.RATE_LIMIT_REGISTER_PER_HOUR, 3600),
+    "evaluate": RateLimitPolicy(
+        "evaluate",
+        settings.RATE_LIMIT_EVALUATE_PER_HOUR,
+        3600,
+        algorithm="token_bucket",
+        burst=settings.RATE_LIMIT_EVALUATE_BURST
+    ),
+    "search": RateLimitPolicy("search", settings.RATE_LIMIT_SEARCH_PER_MINUTE, 60),
+}
+
+def _sliding_window_retry_after(policy: RateLimitPolicy, current: int, previous: int, elapsed: float) -> float:
+    # Seconds until the weighted count drops below the limit again
+    remaining = policy.period - elapsed
+    if current >= policy.limit or previous == 0:
+        return remaining
+    return max(0.0, min(remaining, policy.period * (1 - (policy.limit - current) / previous) - elapsed))
+
+class RateLimiter:
+    """
+    Counts calls per (policy, client key). hit() records a call if the
+    policy allows it and returns (allowed, seconds until the next call
+    would be allowed).
+    """
+    
+    async def hit(self, policy: RateLimitPolicy, key: str) -> Tuple[bool, float]:
+        if policy.algorithm == "token_bucket":
+            return await self._token_bucket(policy, key)
+        return await self._sliding_window(policy, key)
+    
+    async def _sliding_window(self, policy: RateLimitPolicy, key: str) -> Tuple[bool, float]:
+        raise NotImplementedError
+    
+    async def _token_bucket(self, policy: RateLimitPolicy, key: str) -> Tuple[bool, float]:
+        raise NotImplementedError
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    Per-process counters for single-node runs. Each worker limits on its
+    own, so with several workers the effective limit multiplies.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._state: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+    
+    def _load(self, key: str) -> Optional[Tuple[float, float]]:
+        state = self._state.get(key)
+        if state is not None:
+            self._state.move_to_end(key)
+        return state
+    
+    def _save(self, key: str, state: Tuple[float, float]) -> None:
+        self._state[key] = state
+        self._state.move_to_end(key)
+        
+        while len(self._state) > self.max_entries:
+            self._state.popitem(last=False)
+    
+    async def _sliding_window(self, policy: RateLimitPolicy, key: str) -> Tuple[bool, float]:
+        now = time.time()
+        window = int(now // policy.period)
+        elapsed = now - window * policy.period
+        
+        current = self._load(f"{policy.name}:{key}:{window}")
+        previous = self._load(f"{policy.name}:{key}:{window - 1}")
+        current = int(current[0]) if current else 0
+        previous = int(previous[0]) if previous else 0
+        
+        weighted = previous * (1 - elapsed / policy.period) + current
+        if weighted >= policy.limit:
+            return False, _sliding_window_retry_after(policy, current, previous, elapsed)
+        
+        self._save(f"{policy.name}:{key}:{window}", (current + 1, now))
+        return True, 0.0
+    
+    async def _token_bucket(self, policy: RateLimitPolicy, key: str) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket_key = f"{policy.name}:{key}"
+        
+        state = self._load(bucket_key)
+        tokens, updated = state if state else (float(policy.burst), now)
+        tokens = min(float(policy.burst), tokens + (now - updated) * policy.refill_rate)
+        
+        if tokens < 1:
+            self._save(bucket_key, (tokens, now))
+            return False, (1 - tokens) / policy.refill_rate
+        
+        self._save(bucket_key, (tokens - 1, now))
+        return True, 0.0
+
+# Both scripts read the clock from Redis so every worker agrees on it
+SLIDING_WINDOW_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local period = tonumber(ARGV[2])
+local window = math.floor(now / period)
+local elapsed = now - window * period
+local current_key = KEYS[1] .. ':' .. window
+local current = tonumber(redis.call('GET', current_key) or '0')
+local previous = tonumber(redis.call('GET', KEYS[1] .. ':' .. (window - 1)) or '0')
+if previous * (1 - elapsed / period) + current >= tonumber(ARGV[1]) then
+    return {0, current, previous, tostring(elapsed)}
+end
+redis.call('INCR', current_key)
+redis.call('EXPIRE', current_key, period * 2)
+return {1, current, previous, tostring(elapsed)}
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Counters shared by every API worker (uses REDIS_URL). Each check is one
+    atomic Lua script, so concurrent workers can't both take the last call.
+    """
+    
+    def __init__(self):
+        client = get_cache("redis").client
+        self._sliding_window_script = client.register_script(SLIDING_WINDOW_SCRIPT)
+        self._token_bucket_script = client.register_script(TOKEN_BUCKET_SCRIPT)
+    
+    async def _sliding_window(self, policy: RateLimitPolicy, key: str) -> Tuple[bool, float]:
+        allowed, current, previous, elapsed = await self._sliding_window_script(
+            keys=[f"ratelimit:{policy.name}:{key}"],
+            args=[policy.limit, policy.period]
+        )
+        if allowed:
+            return True, 0.0
+        return False, _sliding_window_retry_after(policy, int(current), int(previous), float(elapsed))
+    
+    async def _token_bucket(self, policy: RateLimitPolicy, key: str) -> Tuple[bool, float]:
+        allowed, tokens = await self._token_bucket_script(
+            keys=[f"ratelimit:{policy.name}:{key}"],
+            args=[policy.refill_rate, policy.burst]
+        )
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / policy.refill_rate
+
+_limiter: Optional[RateLimiter] = None
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Return the process-wide rate limiter for RATE_LIMIT_BACKEND, which
+    defaults to CACHE_BACKEND
+    """
+    global _limiter
+    
+    if _limiter is None:
+        backend = settings.RATE_LIMIT_BACKEND or settings.CACHE_BACKEND
+        if backend == "redis":
+            _limiter = RedisRateLimiter()
+        elif backend == "memory":
+            _limiter = MemoryRateLimiter(max_entries=settings.MEMORY_CACHE_MAX_ENTRIES)
+        else:
+            raise ValueError(f"Unknown rate limit backend: {backend}")
+    
+    return _limiter
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
@@ -1,23 +1,124 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
-from jose import jwt
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
+from jose import jwk, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context; pinning min/max rounds to the configured cost
+# makes needs_update() flag hashes made with any other cost
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# bcrypt releases the GIL, so a small thread pool keeps it off the event loop
+# while bounding how many hashes run at once
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+async def _run_hasher(func: Any, *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await _run_hasher(pwd_context.verify, plain_password, hashed_password)
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses an outdated scheme or cost,
+    return a new hash to store in its place
+    """
+    return await _run_hasher(pwd_context.verify_and_update, plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """
     Hash a password for storing
     """
-    return pwd_context.hash(password)
+    return await _run_hasher(pwd_context.hash, password)
+
+def _is_asymmetric(algorithm: str) -> bool:
+    # python-jose 3.3.0 implements RS* and ES*, but not PS* or EdDSA
+    return algorithm[:2] in ("RS", "ES")
+
+@lru_cache()
+def _signing_key() -> Any:
+    # PEM keys are parsed once rather than on every sign
+    if _is_asymmetric(settings.ALGORITHM):
+        if not settings.JWT_PRIVATE_KEY:
+            raise RuntimeError(f"JWT_PRIVATE_KEY is required to sign {settings.ALGORITHM} tokens")
+        return jwk.construct(settings.JWT_PRIVATE_KEY, settings.ALGORITHM)
+    return settings.SECRET_KEY
+
+@lru_cache()
+def _verification_key() -> Any:
+    # PEM keys are parsed once rather than on every verify
+    if _is_asymmetric(settings.ALGORITHM):
+        if not settings.JWT_PUBLIC_KEY:
+            raise RuntimeError(f"JWT_PUBLIC_KEY is required to verify {settings.ALGORITHM} tokens")
+        return jwk.construct(settings.JWT_PUBLIC_KEY, settings.ALGORITHM)
+    return settings.SECRET_KEY
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of token -> verified payload, so a token reused across a
+    session has its signature checked once. Entries are dropped at the
+    token's own expiry, so an expired token is always re-verified (and
+    rejected) by jwt.decode.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+    
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[token]
+            return None
+        
+        self._entries.move_to_end(token)
+        return payload
+    
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        # Tokens without an expiry are never cached
+        if not isinstance(payload.get("exp"), (int, float)):
+            return
+        
+        self._entries[token] = (payload, float(payload["exp"]))
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+_verified_tokens = VerifiedTokenCache(settings.JWT_CACHE_MAX_ENTRIES)
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a JWT and return its payload, from the verified-token cache when
+    this worker has already checked it. Raises JWTError if it is invalid.
+    """
+    payload = _verified_tokens.get(token)
+    if payload is None:
+        payload = jwt.decode(token, _verification_key(), algorithms=[settings.ALGORITHM])
+        _verified_tokens.put(token, payload)
+    return payload
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -32,7 +133,7 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _signing_key(), algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def create_token_response(user_id: str) -> dict:
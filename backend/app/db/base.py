@@ -9,3 +9,8 @@ from app.models.sponsor import Sponsor
 from app.models.season import Season
 from app.models.notification import Notification
 from app.models.leaderboard_entry import LeaderboardEntry
+from app.models.score_sketch import ScoreSketch
+from app.models.leaderboard_snapshot import LeaderboardRoster, LeaderboardSnapshot
+from app.models.season_standing import SeasonStanding
+from app.models.announcement import Announcement, AnnouncementReceipt
+from app.models.career_standing import CareerStanding
@@ -74,7 +74,7 @@ async def create_admin_user(db: AsyncSession) -> None:
             email=admin_email,
             name="Admin User",
             is_admin=True,
-            password_hash=get_password_hash("changeme"),  # Default password should be changed
+            password_hash=await get_password_hash("changeme"),  # Default password should be changed
             bio="System administrator account",
         )
         db.add(admin_user)
@@ -0,0 +1,56 @@
+import logging
+import time
+from typing import Any, Dict
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default asyncio connection pool, also recording how long checkouts
+    wait for a free connection and how often they time out
+    """
+    
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            # Every connection stayed checked out for pool_timeout seconds
+            self.timeouts += 1
+            logger.warning(
+                f"Database pool exhausted: {self.checkedout()} connections checked out, "
+                f"waited {self._timeout}s"
+            )
+            raise
+        
+        waited = time.perf_counter() - start
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return connection
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current occupancy plus checkout wait statistics since startup
+        """
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(0, self.overflow()),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+            "wait_seconds_avg": self.wait_seconds_total / self.checkouts if self.checkouts else 0.0,
+        }
@@ -0,0 +1,164 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Runs of bind placeholders, so IN lists of any length share one shape
+PLACEHOLDERS = re.compile(r"(?:\$\d+|%s)(?:\s*,\s*(?:\$\d+|%s))*")
+
+class RequestQueryStats:
+    """
+    Queries run while handling one HTTP request
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Counter = Counter()
+    
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        self.shapes[PLACEHOLDERS.sub("?", statement)] += 1
+    
+    def repeated_shapes(self) -> List[Any]:
+        """
+        Statements run often enough in this request to suggest an N+1 loop
+        """
+        return [
+            (shape, count) for shape, count in self.shapes.most_common()
+            if count >= settings.DB_N_PLUS_ONE_THRESHOLD
+        ]
+
+class RouteQueryMetrics:
+    """
+    Query totals for one route across requests, since startup
+    """
+    
+    def __init__(self, route: str):
+        self.route = route
+        self.requests = 0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.max_queries = 0
+        self.max_db_seconds = 0.0
+        self.suspected_n_plus_one = 0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+    
+    def add(self, stats: RequestQueryStats, suspected_n_plus_one: bool) -> None:
+        self.requests += 1
+        self.queries += stats.count
+        self.db_seconds += stats.seconds
+        self.max_queries = max(self.max_queries, stats.count)
+        self.max_db_seconds = max(self.max_db_seconds, stats.seconds)
+        if suspected_n_plus_one:
+            self.suspected_n_plus_one += 1
+        if stats.slowest_seconds > self.slowest_seconds:
+            self.slowest_seconds = stats.slowest_seconds
+            self.slowest_statement = stats.slowest_statement
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "route": self.route,
+            "requests": self.requests,
+            "queries": self.queries,
+            "db_seconds": self.db_seconds,
+            "avg_queries": self.queries / self.requests if self.requests else 0.0,
+            "avg_db_seconds": self.db_seconds / self.requests if self.requests else 0.0,
+            "max_queries": self.max_queries,
+            "max_db_seconds": self.max_db_seconds,
+            "suspected_n_plus_one": self.suspected_n_plus_one,
+            "slowest_seconds": self.slowest_seconds,
+            "slowest_statement": self.slowest_statement,
+        }
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+route_metrics: Dict[str, RouteQueryMetrics] = {}
+
+def _truncate(value: Any, limit: int = 1000) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, "_query_started_at", None)
+    if started_at is None:
+        return
+    seconds = time.perf_counter() - started_at
+    
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    
+    if seconds * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow query ({seconds * 1000:.1f} ms): {statement} | parameters: {_truncate(parameters)}"
+        )
+
+def instrument(engine: AsyncEngine) -> None:
+    """
+    Time every statement an engine runs, for per-request stats and the
+    slow query log
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+def _route_name(request: Request) -> str:
+    route = request.scope.get("route")
+    if route is not None:
+        return f"{request.method} {route.path}"
+    endpoint = request.scope.get("endpoint")
+    return f"{request.method} {getattr(endpoint, '__name__', 'unmatched')}"
+
+async def record_request_queries(request: Request, call_next: Any) -> Response:
+    """
+    HTTP middleware collecting the queries each request runs: adds
+    X-DB-* headers in development, aggregates per-route metrics and warns
+    about suspected N+1 query loops
+    """
+    if not settings.DB_QUERY_STATS_ENABLED:
+        return await call_next(request)
+    
+    stats = RequestQueryStats()
+    token = _current.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+    
+    # Queries a streamed body runs after the headers are sent aren't reported
+    route = _route_name(request)
+    repeated = stats.repeated_shapes()
+    for shape, count in repeated:
+        logger.warning(f"Suspected N+1 in {route}: statement ran {count} times in one request: {shape}")
+    
+    if route not in route_metrics:
+        route_metrics[route] = RouteQueryMetrics(route)
+    route_metrics[route].add(stats, suspected_n_plus_one=bool(repeated))
+    
+    if settings.ENVIRONMENT == "development":
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+        response.headers["X-DB-Slowest-Ms"] = f"{stats.slowest_seconds * 1000:.1f}"
+        if repeated:
+            response.headers["X-DB-Suspected-N-Plus-One"] = str(len(repeated))
+    
+    return response
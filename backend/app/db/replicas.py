@@ -0,0 +1,163 @@
+import asyncio
+import itertools
+import logging
+import math
+import uuid
+from typing import Any, AsyncIterator, Callable, List, Optional
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, create_engine, warm_up_pool
+
+logger = logging.getLogger(__name__)
+
+# Seconds of WAL the replica has received but not yet replayed; 0 when caught up
+# (an idle primary would otherwise look like growing lag)
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class Replica:
+    """
+    A read replica's engine and session factory, with its last measured lag
+    """
+    
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine: AsyncEngine = create_engine(url)
+        self.session_factory = sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False
+        )
+        self.lag_seconds: Optional[float] = None
+        # Unused until the first lag check succeeds
+        self.healthy = False
+    
+    async def _measure_lag(self) -> Any:
+        async with self.engine.connect() as connection:
+            return await connection.scalar(LAG_QUERY)
+    
+    async def check(self) -> None:
+        try:
+            lag = await asyncio.wait_for(
+                self._measure_lag(),
+                timeout=settings.DATABASE_REPLICA_CHECK_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            if self.healthy:
+                logger.warning(f"Read replica {self.name} is unreachable, reading from the primary: {e}")
+            self.healthy = False
+            self.lag_seconds = None
+            return
+        
+        self.lag_seconds = float(lag or 0)
+        healthy = self.lag_seconds <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+        if self.healthy and not healthy:
+            logger.warning(f"Read replica {self.name} is {self.lag_seconds:.1f}s behind, reading from the primary")
+        self.healthy = healthy
+
+replicas: List[Replica] = [
+    Replica(f"replica-{number}", url)
+    for number, url in enumerate(settings.DATABASE_REPLICA_URLS, start=1)
+]
+
+_round_robin = itertools.count()
+
+def _written_key(scope: str) -> str:
+    return f"db:recent-write:{scope}"
+
+async def mark_written(scope: str) -> None:
+    """
+    Record a committed write to a read scope, so reads in that scope stay on
+    the primary until every replica in use has replayed it
+    """
+    if replicas:
+        # A replica in use is at most MAX_LAG behind, as of its last check
+        ttl = settings.DATABASE_REPLICA_MAX_LAG_SECONDS + settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS
+        await get_cache().set(_written_key(scope), "1", ttl=math.ceil(ttl))
+
+async def choose_session_factory(scope: str) -> Any:
+    """
+    Pick a healthy replica round-robin, or the primary when there are none,
+    all are lagging, or the scope was written to recently
+    """
+    healthy = [replica for replica in replicas if replica.healthy]
+    if not healthy:
+        return AsyncSessionLocal
+    if await get_cache().get(_written_key(scope)) is not None:
+        return AsyncSessionLocal
+    
+    return healthy[next(_round_robin) % len(healthy)].session_factory
+
+def get_read_db(scope: str, scope_id_param: Optional[str] = None) -> Callable[..., AsyncIterator[AsyncSession]]:
+    """
+    Dependency factory for read-only endpoints: a session on a read replica
+    when one is healthy, otherwise on the primary. Writes and flows that
+    must see the caller's own writes use get_db instead.
+    
+    With scope_id_param, the scope is narrowed by that path parameter
+    ("{scope}:{value}"), so a write marked on one challenge or season only
+    keeps reads of that one on the primary.
+    """
+    async def read_db(request: Request) -> AsyncIterator[AsyncSession]:
+        read_scope = scope
+        if scope_id_param is not None:
+            scope_id = request.path_params[scope_id_param]
+            try:
+                # Match the canonical form writers mark, however the URL spells it
+                scope_id = str(uuid.UUID(scope_id))
+            except ValueError:
+                pass
+            read_scope = f"{scope}:{scope_id}"
+        
+        session_factory = await choose_session_factory(read_scope)
+        session = session_factory()
+        
+        if session_factory is not AsyncSessionLocal:
+            try:
+                # Connect now, so an unreachable replica falls back before the endpoint runs
+                await session.connection()
+            except Exception as e:
+                logger.warning(f"Read replica connection failed, reading from the primary: {e}")
+                for replica in replicas:
+                    if replica.session_factory is session_factory:
+                        replica.healthy = False
+                await session.close()
+                session = AsyncSessionLocal()
+        
+        try:
+            yield session
+        finally:
+            await session.close()
+    
+    return read_db
+
+async def check_replicas() -> None:
+    await asyncio.gather(*(replica.check() for replica in replicas))
+
+async def start_replicas() -> None:
+    """
+    Measure every replica's lag and open its pool before taking traffic
+    """
+    await check_replicas()
+    await asyncio.gather(*(warm_up_pool(replica.engine) for replica in replicas if replica.healthy))
+
+async def run_replica_monitor() -> None:
+    """
+    Re-measure replica lag every DATABASE_REPLICA_CHECK_INTERVAL_SECONDS
+    """
+    while True:
+        await asyncio.sleep(settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS)
+        try:
+            await check_replicas()
+        except Exception as e:
+            logger.error(f"Replica lag check failed: {e}")
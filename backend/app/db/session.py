@@ -1,13 +1,40 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+import logging
+from typing import Optional
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.db import query_stats
+from app.db.pool import InstrumentedQueuePool
+
+logger = logging.getLogger(__name__)
+
+def create_engine(url: str, pooled: bool = True) -> AsyncEngine:
+    """
+    Create an async engine with the DB_POOL_* settings, instrumented for
+    per-request query stats. Unpooled engines open a fresh connection per
+    checkout, for long-held connections that shouldn't take a pool slot.
+    """
+    pool_options = dict(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    ) if pooled else dict(poolclass=NullPool)
+    
+    engine = create_async_engine(
+        str(url).replace("postgresql://", "postgresql+asyncpg://"),
+        echo=settings.ENVIRONMENT == "development",
+        **pool_options
+    )
+    query_stats.instrument(engine)
+    return engine
 
 # Create async SQLAlchemy engine
-engine = create_async_engine(
-    str(settings.DATABASE_URL).replace("postgresql://", "postgresql+asyncpg://"),
-    echo=settings.ENVIRONMENT == "development",
-    pool_pre_ping=True
-)
+engine = create_engine(settings.DATABASE_URL)
 
 # Create sessionmaker for async sessions
 AsyncSessionLocal = sessionmaker(
@@ -27,3 +54,27 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+async def warm_up_pool(target: AsyncEngine = engine, connections: Optional[int] = None) -> None:
+    """
+    Open pool connections up front so the first requests after startup
+    don't each pay for a new connection
+    """
+    connections = min(
+        settings.DB_POOL_WARMUP_CONNECTIONS if connections is None else connections,
+        settings.DB_POOL_SIZE
+    )
+    if connections <= 0:
+        return
+    
+    results = await asyncio.gather(
+        *(target.connect().start() for _ in range(connections)),
+        return_exceptions=True
+    )
+    opened = [result for result in results if not isinstance(result, BaseException)]
+    failed = [result for result in results if isinstance(result, BaseException)]
+    if failed:
+        logger.warning(f"Database pool warm-up opened {len(opened)} of {connections} connections: {failed[0]}")
+    
+    # Closing returns them to the pool, where they stay open
+    await asyncio.gather(*(connection.close() for connection in opened))
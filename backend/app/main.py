@@ -1,9 +1,19 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from app.core.config import settings
 from app.api.api import api_router
 from app.db.init_db import create_initial_data
+from app.db.query_stats import record_request_queries
+from app.db.session import warm_up_pool
+from app.db.replicas import replicas, run_replica_monitor, start_replicas
+from app.services.leaderboard_history import run_snapshot_scheduler
+from app.services.career_standings import run_career_standings_scheduler
+from app.services.notification_retention import run_retention_scheduler
+from app.services.email_digest import run_digest_scheduler
+from app.services.badge_worker import worker as badge_worker
+from app.services.user_cache import run_invalidation_listener
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -23,13 +33,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Count each request's queries and database time, and flag N+1 loops
+app.middleware("http")(record_request_queries)
+
 # Include API router
 app.include_router(api_router, prefix="/api")
 
 @app.on_event("startup")
 async def startup_event():
+    # Open database connections before traffic arrives
+    await warm_up_pool()
+    
+    # Route read-only endpoints to replicas that keep up with the primary
+    if replicas:
+        await start_replicas()
+        app.state.replica_monitor_task = asyncio.create_task(run_replica_monitor())
+    
+    # Drop locally cached users as soon as any worker invalidates them
+    if settings.CACHE_BACKEND == "redis":
+        app.state.user_invalidation_task = asyncio.create_task(run_invalidation_listener())
+    
     # Create initial data (admin user, default badges, etc.)
     await create_initial_data()
+    
+    # Periodically snapshot leaderboards for rank history
+    if settings.LEADERBOARD_SNAPSHOT_INTERVAL_MINUTES > 0:
+        app.state.snapshot_task = asyncio.create_task(run_snapshot_scheduler())
+    
+    # Periodically recompute career standings for reviewed scores and new users
+    if settings.CAREER_STANDINGS_REFRESH_MINUTES > 0:
+        app.state.career_standings_task = asyncio.create_task(run_career_standings_scheduler())
+    
+    # Periodically purge old read notifications
+    if settings.NOTIFICATION_RETENTION_DAYS > 0 and settings.NOTIFICATION_RETENTION_INTERVAL_MINUTES > 0:
+        app.state.retention_task = asyncio.create_task(run_retention_scheduler())
+    
+    # Award badges in the background as submissions, reviews and leaderboards change
+    badge_worker.start()
+    
+    # Periodically email digests of unread notifications
+    if settings.EMAIL_DIGEST_INTERVAL_MINUTES > 0:
+        app.state.digest_task = asyncio.create_task(run_digest_scheduler())
 
 @app.get("/")
 def root():
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, String, Text, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class Announcement(Base):
+    """
+    Announcement model for system-wide broadcasts. Stored once and merged into
+    each user's notifications at read time instead of being copied per user.
+    """
+    title = Column(String, nullable=False)
+    message = Column(Text, nullable=False)
+    
+    # Admin who sent the announcement
+    created_by = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=True)
+    
+    # Relationships
+    receipts = relationship("AnnouncementReceipt", back_populates="announcement", cascade="all, delete-orphan")
+
+class AnnouncementReceipt(Base):
+    """
+    AnnouncementReceipt model - a user's read (or dismissed) marker for an announcement.
+    A missing receipt means the announcement is unread.
+    """
+    __table_args__ = (
+        UniqueConstraint("announcement_id", "user_id", name="uq_announcementreceipt_announcement_id_user_id"),
+    )
+    
+    # Foreign keys
+    announcement_id = Column(UUID(as_uuid=True), ForeignKey("announcement.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
+    
+    # Dismissed announcements are hidden, the equivalent of deleting a notification
+    dismissed = Column(Boolean, default=False, nullable=False)
+    
+    # Relationships
+    announcement = relationship("Announcement", back_populates="receipts")
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, Numeric, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class CareerStanding(Base):
+    """
+    CareerStanding model holding a user's totals and overall rank across all
+    challenges, recomputed every CAREER_STANDINGS_REFRESH_MINUTES
+    """
+    __table_args__ = (
+        UniqueConstraint("user_id", name="uq_careerstanding_user_id"),
+        # Ranks are dense (1..N), so pages and rank windows are range scans
+        Index("ix_careerstanding_rank", "rank"),
+    )
+    
+    # Foreign key
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
+    
+    # Aggregates over the user's scored submissions
+    total_score = Column(Numeric(12, 2), nullable=False)
+    challenge_count = Column(Integer, nullable=False)
+    average_score = Column(Numeric(5, 2), nullable=False)
+    best_rank = Column(Integer, nullable=False)
+    rank = Column(Integer, nullable=False)
+    
+    # Relationships
+    user = relationship("User")
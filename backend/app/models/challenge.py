@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, Text, ForeignKey, DateTime, Numeric, JSON
+from sqlalchemy import Boolean, Column, String, Text, ForeignKey, DateTime, Index, Numeric, JSON, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -8,6 +8,19 @@ class Challenge(Base):
     """
     Challenge model
     """
+    __table_args__ = (
+        # Active challenge listings and recommendations, by deadline
+        # (predicate matches is_active.is_(True))
+        Index(
+            "ix_challenge_active_submission_deadline",
+            "submission_deadline",
+            postgresql_where=text("is_active IS true")
+        ),
+        # Listings filtered by season or sponsor, by deadline
+        Index("ix_challenge_season_id_submission_deadline", "season_id", "submission_deadline"),
+        Index("ix_challenge_sponsor_id_submission_deadline", "sponsor_id", "submission_deadline"),
+    )
+    
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     rules = Column(Text, nullable=False)
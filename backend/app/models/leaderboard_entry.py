@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Numeric
+from sqlalchemy import Column, ForeignKey, Index, Integer, Numeric, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -7,6 +7,16 @@ class LeaderboardEntry(Base):
     """
     LeaderboardEntry model for tracking user rankings in challenges and seasons
     """
+    __table_args__ = (
+        # Serves rank-ordered pages and "around me" rank windows per challenge
+        Index("ix_leaderboardentry_challenge_id_rank", "challenge_id", "rank"),
+        # One entry per user per challenge; serves a user's rank lookups
+        UniqueConstraint("challenge_id", "user_id", name="uq_leaderboardentry_challenge_id_user_id"),
+        # Rank-ordered season leaderboards and season standings
+        Index("ix_leaderboardentry_season_id_rank", "season_id", "rank"),
+        Index("ix_leaderboardentry_submission_id", "submission_id"),
+    )
+    
     # Foreign keys
     user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
     challenge_id = Column(UUID(as_uuid=True), ForeignKey("challenge.id"), nullable=False)
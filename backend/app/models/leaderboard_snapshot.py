@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base_class import Base
+
+class LeaderboardRoster(Base):
+    """
+    LeaderboardRoster model mapping a challenge's participants to the small
+    integer indexes used inside leaderboard snapshots. Append-only, so an
+    index stays valid for every snapshot of the challenge.
+    """
+    challenge_id = Column(UUID(as_uuid=True), ForeignKey("challenge.id"), nullable=False, unique=True)
+    
+    # Concatenated 16-byte user UUIDs; a user's position is their index
+    user_ids = Column(LargeBinary, nullable=False)
+
+class LeaderboardSnapshot(Base):
+    """
+    LeaderboardSnapshot model storing a point-in-time copy of a challenge
+    leaderboard as a compressed columnar blob (user index, score, rank)
+    """
+    __table_args__ = (
+        Index("ix_leaderboardsnapshot_challenge_id_taken_at", "challenge_id", "taken_at"),
+    )
+    
+    challenge_id = Column(UUID(as_uuid=True), ForeignKey("challenge.id"), nullable=False)
+    taken_at = Column(DateTime(timezone=True), nullable=False)
+    
+    # Snapshot payload; identical consecutive leaderboards share a checksum and are stored once
+    entry_count = Column(Integer, nullable=False)
+    checksum = Column(String(40), nullable=False)
+    data = Column(LargeBinary, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, ForeignKey, Boolean, Index, Enum as SQLEnum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -30,3 +30,20 @@ class Notification(Base):
     
     # Relationships
     user = relationship("User", back_populates="notifications")
+    
+    __table_args__ = (
+        # A user's notifications, newest first, with (created_at, id) keyset pagination
+        Index("ix_notification_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Unread-only listings and unread recounts (predicate matches read.is_(False))
+        Index(
+            "ix_notification_user_id_unread",
+            "user_id", "created_at", "id",
+            postgresql_where=text("read IS false")
+        ),
+        # Retention purge of old read notifications
+        Index(
+            "ix_notification_read_created_at",
+            "created_at",
+            postgresql_where=text("read IS true")
+        ),
+    )
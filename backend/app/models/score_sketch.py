@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, JSON, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base_class import Base
+
+class ScoreSketch(Base):
+    """
+    ScoreSketch model holding a streaming quantile sketch of the final scores
+    in a challenge or season, for percentile lookups without sorting scores
+    """
+    __table_args__ = (
+        UniqueConstraint("scope", "scope_id", name="uq_scoresketch_scope_scope_id"),
+    )
+    
+    # "challenge" or "season"
+    scope = Column(String, nullable=False)
+    scope_id = Column(UUID(as_uuid=True), nullable=False)
+    
+    # Number of scores summarized and the serialized KLL sketch
+    count = Column(Integer, nullable=False, default=0)
+    data = Column(JSON, nullable=False)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, Numeric, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class SeasonStanding(Base):
+    """
+    SeasonStanding model holding a user's aggregated totals and overall rank
+    in a season, recomputed whenever one of its challenge leaderboards is generated
+    """
+    __table_args__ = (
+        UniqueConstraint("season_id", "user_id", name="uq_seasonstanding_season_id_user_id"),
+        Index("ix_seasonstanding_season_id_rank", "season_id", "rank"),
+    )
+    
+    # Foreign keys
+    season_id = Column(UUID(as_uuid=True), ForeignKey("season.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
+    
+    # Aggregates over the user's leaderboard entries in the season
+    total_score = Column(Numeric(10, 2), nullable=False)
+    challenge_count = Column(Integer, nullable=False)
+    best_rank = Column(Integer, nullable=False)
+    rank = Column(Integer, nullable=False)
+    
+    # Relationships
+    season = relationship("Season")
+    user = relationship("User")
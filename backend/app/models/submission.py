@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, Numeric, Enum as SQLEnum, JSON
+from sqlalchemy import Boolean, Column, String, Text, ForeignKey, Index, Numeric, Enum as SQLEnum, JSON, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -17,6 +17,15 @@ class Submission(Base):
     """
     Submission model for challenge entries
     """
+    __table_args__ = (
+        # One submission per user per challenge; also serves lookups by user
+        UniqueConstraint("user_id", "challenge_id", name="uq_submission_user_id_challenge_id"),
+        # A challenge's submissions, and its scored ones by score for leaderboard generation
+        Index("ix_submission_challenge_id_final_score", "challenge_id", "final_score"),
+        # Admin listings filtered by status
+        Index("ix_submission_status", "status"),
+    )
+    
     # Foreign keys
     user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
     challenge_id = Column(UUID(as_uuid=True), ForeignKey("challenge.id"), nullable=False)
@@ -36,6 +45,9 @@ class Submission(Base):
     evaluation_data = Column(JSON, nullable=True)
     feedback = Column(Text, nullable=True)
     
+    # Marked by the challenge sponsor; counted by "sponsor_favorite" badges
+    is_sponsor_favorite = Column(Boolean, default=False, server_default="false", nullable=False)
+    
     # Status of the submission
     status = Column(SQLEnum(SubmissionStatus), default=SubmissionStatus.PENDING, nullable=False)
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
 from app.db.base_class import Base
 from sqlalchemy.orm import relationship
 
@@ -16,6 +16,13 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False)
     
+    # Denormalized count of unread personal notifications, kept in step by
+    # app.services.unread_counter (announcements are counted separately)
+    unread_notification_count = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Notifications created up to this time have been included in an email digest
+    last_digest_sent_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Relationships
     submissions = relationship("Submission", back_populates="user", cascade="all, delete-orphan")
     badges = relationship("UserBadge", back_populates="user", cascade="all, delete-orphan")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, DateTime, func
+from sqlalchemy import Column, ForeignKey, DateTime, Index, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -7,6 +7,15 @@ class UserBadge(Base):
     """
     UserBadge model - represents the many-to-many relationship between Users and Badges
     """
+    __table_args__ = (
+        # A badge is held at most once per user; rule-based awards rely on this
+        # for ON CONFLICT DO NOTHING. Also serves lookups by user.
+        UniqueConstraint("user_id", "badge_id", name="uq_userbadge_user_id_badge_id"),
+        # A badge's holders and holder counts
+        Index("ix_userbadge_badge_id", "badge_id"),
+        Index("ix_userbadge_submission_id", "submission_id"),
+    )
+    
     # Foreign keys
     user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
     badge_id = Column(UUID(as_uuid=True), ForeignKey("badge.id"), nullable=False)
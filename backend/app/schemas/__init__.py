@@ -7,6 +7,6 @@ from app.schemas.badge import Badge, BadgeCreate, BadgeUpdate
 from app.schemas.user_badge import UserBadge, UserBadgeCreate
 from app.schemas.sponsor import Sponsor, SponsorCreate, SponsorUpdate
 from app.schemas.season import Season, SeasonCreate, SeasonUpdate
-from app.schemas.notification import Notification, NotificationCreate, NotificationUpdate
+from app.schemas.notification import Notification, NotificationCreate, NotificationUpdate, Announcement
 from app.schemas.leaderboard import LeaderboardEntry
 from app.schemas.token import Token, TokenPayload
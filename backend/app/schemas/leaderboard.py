@@ -61,6 +61,23 @@ class CareerLeaderboardEntry(BaseModel):
     average_score: float
     best_rank: int
     badge_count: int
+    rank: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
+
+
+# Season standing entry (aggregated across a season's challenges)
+class SeasonStandingEntry(BaseModel):
+    """
+    Schema for a user's aggregated standing within a season
+    """
+    rank: int
+    user_id: UUID4
+    user_name: str
+    total_score: float
+    challenge_count: int
+    best_rank: int
     
     class Config:
         from_attributes = True
@@ -96,3 +113,72 @@ class SeasonLeaderboard(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+# Approximate percentile lookup backed by a streaming quantile sketch
+class PercentileEstimate(BaseModel):
+    """
+    Schema for an estimated score/percentile pair
+    """
+    count: int
+    score: float
+    percentile: float
+
+
+# Point in a user's rank history, decoded from a leaderboard snapshot
+class RankHistoryPoint(BaseModel):
+    """
+    Schema for a user's rank and score at a snapshot time
+    """
+    taken_at: datetime
+    rank: int
+    score: float
+
+
+# Rank windows ("around me") for API response
+class ChallengeLeaderboardWindow(BaseModel):
+    """
+    Schema for the entries ranked around a user on a challenge leaderboard
+    """
+    from typing import List
+    
+    challenge_id: UUID4
+    user_id: UUID4
+    user_rank: int
+    entries: List[LeaderboardEntryWithUser]
+
+
+class SeasonLeaderboardWindow(BaseModel):
+    """
+    Schema for the standings ranked around a user on a season leaderboard
+    """
+    from typing import List
+    
+    season_id: UUID4
+    user_id: UUID4
+    user_rank: int
+    entries: List[SeasonStandingEntry]
+
+
+class CareerLeaderboardWindow(BaseModel):
+    """
+    Schema for the entries ranked around a user on the career leaderboard
+    """
+    from typing import List
+    
+    user_id: UUID4
+    user_rank: int
+    entries: List[CareerLeaderboardEntry]
+
+
+# Season standings for API response
+class SeasonStandings(BaseModel):
+    """
+    Schema for a season's overall ranking of users
+    """
+    from typing import List
+    
+    season_id: UUID4
+    season_name: str
+    entries: List[SeasonStandingEntry]
+    total_participants: int
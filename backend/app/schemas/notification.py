@@ -1,5 +1,5 @@
 from pydantic import BaseModel, UUID4
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from app.models.notification import NotificationType
 
@@ -64,3 +64,42 @@ class NotificationWithRelations(Notification):
     from app.schemas.user import User
     
     user: Optional[User] = None
+
+
+# System-wide announcement (stored once, merged into every user's notifications)
+class Announcement(BaseModel):
+    """
+    Schema for system announcement response
+    """
+    id: UUID4
+    title: str
+    message: str
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+# Properties to receive on bulk notification creation
+class BulkNotificationCreate(BaseModel):
+    """
+    Schema for sending the same notification to many users
+    """
+    user_ids: List[UUID4]
+    title: str
+    message: str
+    type: NotificationType
+    reference_id: Optional[UUID4] = None
+
+
+# Progress of a background bulk notification write
+class NotificationJobStatus(BaseModel):
+    """
+    Schema for bulk notification job progress
+    """
+    id: str
+    status: str
+    total: Optional[int] = None
+    written: int = 0
+    error: Optional[str] = None
+    rejected_user_ids: List[str] = []
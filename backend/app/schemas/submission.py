@@ -46,6 +46,7 @@ class SubmissionInDBBase(SubmissionBase):
     llm_score: Optional[float] = None
     human_score: Optional[float] = None
     final_score: Optional[float] = None
+    is_sponsor_favorite: bool = False
     status: SubmissionStatus
     
     class Config:
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class DatabasePoolStatus(BaseModel):
+    """
+    Connection pool occupancy and checkout wait statistics for one engine
+    """
+    name: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_avg: float
+    healthy: Optional[bool] = None          # Replicas only
+    lag_seconds: Optional[float] = None     # Replicas only, as of the last check
+
+
+class RouteQueryStats(BaseModel):
+    """
+    Database queries run by one route's requests since startup
+    """
+    route: str
+    requests: int
+    queries: int
+    db_seconds: float
+    avg_queries: float
+    avg_db_seconds: float
+    max_queries: int
+    max_db_seconds: float
+    suspected_n_plus_one: int       # Requests that repeated a statement DB_N_PLUS_ONE_THRESHOLD times
+    slowest_seconds: float
+    slowest_statement: Optional[str] = None
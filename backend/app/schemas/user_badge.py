@@ -1,5 +1,5 @@
 from pydantic import BaseModel, UUID4
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -23,6 +23,33 @@ class UserBadgeCreate(UserBadgeBase):
     submission_id: Optional[UUID4] = None
 
 
+# Properties to receive on bulk badge awards
+class BulkUserBadgeCreate(BaseModel):
+    """
+    Schema for awarding many (user, badge, submission) tuples at once
+    """
+    awards: List[UserBadgeCreate]
+
+
+# A requested award that failed validation
+class InvalidUserBadge(UserBadgeCreate):
+    """
+    Schema for a rejected bulk award and why it was rejected
+    """
+    reason: str
+
+
+# Outcome of a bulk badge award
+class BulkUserBadgeResult(BaseModel):
+    """
+    Schema for bulk badge award results
+    """
+    requested: int
+    awarded: int
+    already_held: int
+    invalid: List[InvalidUserBadge] = []
+
+
 # Properties shared by models stored in DB
 class UserBadgeInDBBase(UserBadgeBase):
     """
@@ -0,0 +1,66 @@
+import json
+import uuid
+from typing import Any, Dict, List
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import get_cache
+from app.db import replicas
+from app.models.badge import Badge
+from app.models.user_badge import UserBadge
+from app.schemas.badge import BadgeWithUserCount
+
+# Cached pages expire even without invalidation, as a backstop
+BADGE_COUNTS_TTL_SECONDS = 300
+
+VERSION_KEY = "badges:version"
+
+async def _version() -> str:
+    cache = get_cache()
+    version = await cache.get(VERSION_KEY)
+    if version is None:
+        await cache.add(VERSION_KEY, uuid.uuid4().hex)
+        version = await cache.get(VERSION_KEY)
+    return version
+
+async def invalidate() -> None:
+    """
+    Drop every cached badge page, after badges change or are awarded.
+    Call after committing so a concurrent read can't re-cache old counts.
+    """
+    await replicas.mark_written("badges")
+    await get_cache().set(VERSION_KEY, uuid.uuid4().hex)
+
+async def get_badges_with_counts(db: AsyncSession, skip: int, limit: int) -> List[Dict[str, Any]]:
+    """
+    Get a page of badges with their holder counts from one GROUP BY query,
+    cached until the next invalidate()
+    """
+    cache = get_cache()
+    key = f"badges:with-counts:{await _version()}:{skip}:{limit}"
+    
+    cached = await cache.get(key)
+    if cached is not None:
+        return json.loads(cached)
+    
+    holders = (
+        select(UserBadge.badge_id, func.count(UserBadge.id).label("user_count"))
+        .group_by(UserBadge.badge_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(Badge, func.coalesce(holders.c.user_count, 0))
+        .outerjoin(holders, holders.c.badge_id == Badge.id)
+        .order_by(Badge.created_at, Badge.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    
+    badges = []
+    for badge, user_count in result.all():
+        badge_with_count = BadgeWithUserCount.from_orm(badge)
+        badge_with_count.user_count = user_count
+        badges.append(jsonable_encoder(badge_with_count))
+    
+    await cache.set(key, json.dumps(badges), ttl=BADGE_COUNTS_TTL_SECONDS)
+    return badges
@@ -0,0 +1,231 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Numeric, case, cast, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.models.badge import Badge
+from app.models.leaderboard_entry import LeaderboardEntry
+from app.models.notification import NotificationType
+from app.models.submission import Submission, SubmissionStatus
+from app.models.user_badge import UserBadge
+from app.services import badge_cache, notification_service
+
+logger = logging.getLogger(__name__)
+
+# Rule types understood by the engine, from Badge.criteria["type"]
+RULE_TYPES = ("submission", "ranking", "sponsor_favorite", "score")
+
+def _for_users(column: Any, challenge_id: Optional[Any], user_ids: Optional[Sequence[Any]]) -> List[Any]:
+    """
+    Restrict candidates to users with a submission in the challenge and/or
+    to the given users
+    """
+    conditions = []
+    if challenge_id is not None:
+        in_challenge = aliased(Submission)
+        conditions.append(
+            column.in_(select(in_challenge.user_id).where(in_challenge.challenge_id == challenge_id))
+        )
+    if user_ids is not None:
+        conditions.append(column.in_(list(user_ids)))
+    return conditions
+
+def _nth_submission(
+    count: int,
+    challenge_id: Optional[Any],
+    user_ids: Optional[Sequence[Any]],
+    favorites_only: bool = False
+) -> Any:
+    # The submission that took the user to `count` is the one the badge is for
+    ordered = (
+        select(
+            Submission.id,
+            Submission.user_id,
+            func.row_number().over(
+                partition_by=Submission.user_id,
+                order_by=(Submission.created_at, Submission.id)
+            ).label("position")
+        )
+        .where(
+            Submission.status != SubmissionStatus.REJECTED,
+            *_for_users(Submission.user_id, challenge_id, user_ids)
+        )
+    )
+    if favorites_only:
+        ordered = ordered.where(Submission.is_sponsor_favorite.is_(True))
+    ordered = ordered.subquery()
+    
+    return (
+        select(ordered.c.user_id, ordered.c.id.label("submission_id"))
+        .where(ordered.c.position == count)
+    )
+
+def _ranking(criteria: Dict[str, Any], challenge_id: Optional[Any], user_ids: Optional[Sequence[Any]]) -> Any:
+    ranked = select(
+        LeaderboardEntry.user_id,
+        LeaderboardEntry.submission_id,
+        LeaderboardEntry.rank,
+        func.count().over(partition_by=LeaderboardEntry.challenge_id).label("entries")
+    )
+    if challenge_id is not None:
+        ranked = ranked.where(LeaderboardEntry.challenge_id == challenge_id)
+    ranked = ranked.subquery()
+    
+    conditions = []
+    if criteria.get("position") is not None:
+        conditions.append(ranked.c.rank <= int(criteria["position"]))
+    if criteria.get("percentile") is not None:
+        # Top X% of the entries, always including the winner
+        conditions.append(
+            ranked.c.rank <= func.greatest(1, func.floor(ranked.c.entries * float(criteria["percentile"]) / 100))
+        )
+    if not conditions:
+        return None
+    if user_ids is not None:
+        conditions.append(ranked.c.user_id.in_(list(user_ids)))
+    
+    return select(ranked.c.user_id, ranked.c.submission_id).where(*conditions)
+
+def _score(criteria: Dict[str, Any], challenge_id: Optional[Any], user_ids: Optional[Sequence[Any]]) -> Any:
+    if criteria.get("value") is None:
+        return None
+    
+    # evaluation_data["scores"] maps each evaluation category to {"score": ..., "weight": ...}
+    scores = Submission.evaluation_data["scores"]
+    category = func.json_each(
+        case((func.json_typeof(scores) == "object", scores))
+    ).table_valued("key", "value").alias("category")
+    
+    conditions = [cast(category.c.value.op("->>")("score"), Numeric) >= float(criteria["value"])]
+    if criteria.get("category") not in (None, "any"):
+        conditions.append(category.c.key == criteria["category"])
+    
+    query = (
+        select(Submission.user_id, Submission.id.label("submission_id"))
+        .where(
+            Submission.status != SubmissionStatus.REJECTED,
+            select(literal(1)).select_from(category).where(*conditions).exists()
+        )
+    )
+    if challenge_id is not None:
+        query = query.where(Submission.challenge_id == challenge_id)
+    if user_ids is not None:
+        query = query.where(Submission.user_id.in_(list(user_ids)))
+    
+    return query
+
+def compile_rule(
+    criteria: Dict[str, Any],
+    challenge_id: Optional[Any] = None,
+    user_ids: Optional[Sequence[Any]] = None
+) -> Optional[Any]:
+    """
+    Compile a badge's criteria into one SELECT of (user_id, submission_id)
+    for every qualifying user, optionally limited to a challenge's
+    participants or to specific users. Returns None for criteria the
+    engine doesn't understand.
+    """
+    rule_type = criteria.get("type")
+    
+    if rule_type == "submission":
+        return _nth_submission(int(criteria.get("count", 1)), challenge_id, user_ids)
+    if rule_type == "sponsor_favorite":
+        return _nth_submission(int(criteria.get("count", 1)), challenge_id, user_ids, favorites_only=True)
+    if rule_type == "ranking":
+        return _ranking(criteria, challenge_id, user_ids)
+    if rule_type == "score":
+        return _score(criteria, challenge_id, user_ids)
+    
+    return None
+
+async def award_badge_rule(
+    db: AsyncSession,
+    badge: Badge,
+    challenge_id: Optional[Any] = None,
+    user_ids: Optional[Sequence[Any]] = None
+) -> List[Any]:
+    """
+    Award a badge to every qualifying user with a single
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING. Runs in the caller's
+    transaction. Returns the ids of the users newly awarded.
+    """
+    candidates = compile_rule(badge.criteria or {}, challenge_id, user_ids)
+    if candidates is None:
+        logger.warning(f"Badge {badge.name} has criteria the rule engine can't evaluate: {badge.criteria}")
+        return []
+    candidates = candidates.subquery()
+    
+    awards = (
+        select(
+            func.gen_random_uuid(),
+            candidates.c.user_id,
+            literal(badge.id, UUID(as_uuid=True)),
+            candidates.c.submission_id
+        )
+        .where(
+            ~exists().where(
+                UserBadge.user_id == candidates.c.user_id,
+                UserBadge.badge_id == badge.id
+            )
+        )
+        .distinct(candidates.c.user_id)
+        .order_by(candidates.c.user_id)
+    )
+    
+    result = await db.execute(
+        pg_insert(UserBadge)
+        .from_select(["id", "user_id", "badge_id", "submission_id"], awards)
+        .on_conflict_do_nothing(index_elements=["user_id", "badge_id"])
+        .returning(UserBadge.user_id)
+    )
+    return result.scalars().all()
+
+async def evaluate_badges(
+    db: AsyncSession,
+    challenge_id: Optional[Any] = None,
+    user_ids: Optional[Sequence[Any]] = None,
+    rule_types: Optional[Iterable[str]] = None
+) -> List[Tuple[Any, Badge]]:
+    """
+    Evaluate every badge (or those of the given rule types) with one
+    statement per badge. Runs in the caller's transaction; after it
+    commits, pass the result to notify_awards.
+    Returns (user_id, badge) for each new award.
+    """
+    badges_result = await db.execute(select(Badge))
+    rule_types = set(rule_types) if rule_types is not None else None
+    
+    awarded = []
+    for badge in badges_result.scalars().all():
+        if rule_types is not None and (badge.criteria or {}).get("type") not in rule_types:
+            continue
+        
+        for user_id in await award_badge_rule(db, badge, challenge_id, user_ids):
+            awarded.append((user_id, badge))
+    
+    return awarded
+
+async def notify_awards(awarded: Sequence[Tuple[Any, Badge]]) -> None:
+    """
+    Announce committed awards: refresh cached holder counts and enqueue one
+    BADGE_AWARDED notification per award in a single bulk job
+    """
+    if not awarded:
+        return
+    
+    await badge_cache.invalidate()
+    
+    await notification_service.enqueue_notifications(
+        [
+            notification_service.notification_row(
+                user_id,
+                "You earned a badge",
+                f"You have been awarded the {badge.name} badge.",
+                NotificationType.BADGE_AWARDED,
+                badge.id
+            )
+            for user_id, badge in awarded
+        ],
+        total=len(awarded)
+    )
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set, Tuple
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services import badge_rules, events
+
+logger = logging.getLogger(__name__)
+
+# Badge rule types each event can change the outcome of
+EVENT_RULES = {
+    events.SUBMISSION_CREATED: ("submission",),
+    events.SUBMISSION_REVIEWED: ("score",),
+    events.SUBMISSION_FAVORITED: ("sponsor_favorite",),
+    events.LEADERBOARD_GENERATED: ("ranking",),
+}
+
+class BadgeWorker:
+    """
+    Evaluates badges in the background for the users an event affected.
+    
+    Events are coalesced per (challenge, rule type) for BADGE_WORKER_COALESCE_SECONDS:
+    repeated events for the same users collapse into one evaluation, and
+    an event covering a whole challenge (user_id None) absorbs the per-user
+    ones for it.
+    """
+    
+    def __init__(self):
+        # (challenge_id, rule_type) -> affected user ids, or None for every participant
+        self.pending: Dict[Tuple[Any, str], Optional[Set[Any]]] = {}
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+    
+    def handle(self, event: events.Event) -> None:
+        challenge_id = event.data.get("challenge_id")
+        user_id = event.data.get("user_id")
+        
+        for rule_type in EVENT_RULES.get(event.type, ()):
+            key = (challenge_id, rule_type)
+            if user_id is None:
+                self.pending[key] = None
+            elif key not in self.pending:
+                self.pending[key] = {user_id}
+            elif self.pending[key] is not None:
+                self.pending[key].add(user_id)
+        
+        self.wakeup.set()
+    
+    async def _evaluate(self, challenge_id: Any, rule_type: str, user_ids: Optional[Set[Any]]) -> None:
+        async with AsyncSessionLocal() as db:
+            awarded = await badge_rules.evaluate_badges(
+                db,
+                challenge_id=challenge_id,
+                user_ids=sorted(user_ids, key=str) if user_ids is not None else None,
+                rule_types=(rule_type,)
+            )
+            await db.commit()
+        
+        await badge_rules.notify_awards(awarded)
+    
+    async def run(self) -> None:
+        while True:
+            await self.wakeup.wait()
+            await asyncio.sleep(settings.BADGE_WORKER_COALESCE_SECONDS)
+            self.wakeup.clear()
+            
+            batch, self.pending = self.pending, {}
+            for (challenge_id, rule_type), user_ids in batch.items():
+                try:
+                    await self._evaluate(challenge_id, rule_type, user_ids)
+                except Exception as e:
+                    logger.error(f"Badge evaluation failed for {rule_type} in challenge {challenge_id}: {e}")
+    
+    def start(self) -> None:
+        for event_type in EVENT_RULES:
+            events.bus.subscribe(event_type, self.handle)
+        self.task = asyncio.create_task(self.run())
+
+worker = BadgeWorker()
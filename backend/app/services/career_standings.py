@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services import leaderboard_cache
+
+logger = logging.getLogger(__name__)
+
+# Key for the advisory lock that serializes refreshes, which replace every row
+CAREER_STANDINGS_LOCK_KEY = 727202
+
+# Career stats per user, ranked across all users: total score, challenges
+# entered, average score and best rank. Users without scored submissions
+# rank last with zeros.
+REFRESH_CAREER_STANDINGS_SQL = text("""
+    INSERT INTO careerstanding (
+        id, user_id, total_score, challenge_count, average_score, best_rank, rank
+    )
+    WITH user_stats AS (
+        SELECT
+            s.user_id,
+            COUNT(DISTINCT s.challenge_id) as challenge_count,
+            SUM(s.final_score) as total_score,
+            AVG(s.final_score) as average_score,
+            MIN(le.rank) as best_rank
+        FROM submission s
+        LEFT JOIN leaderboardentry le ON s.id = le.submission_id
+        WHERE s.final_score IS NOT NULL
+        GROUP BY s.user_id
+    )
+    SELECT
+        gen_random_uuid(),
+        u.id,
+        COALESCE(us.total_score, 0),
+        COALESCE(us.challenge_count, 0),
+        COALESCE(us.average_score, 0),
+        COALESCE(us.best_rank, 0),
+        ROW_NUMBER() OVER (
+            ORDER BY
+                COALESCE(us.total_score, 0) DESC,
+                COALESCE(us.challenge_count, 0) DESC,
+                COALESCE(us.average_score, 0) DESC,
+                u.id
+        )
+    FROM "user" u
+    LEFT JOIN user_stats us ON u.id = us.user_id
+""")
+
+async def refresh_career_standings(db: AsyncSession) -> None:
+    """
+    Recompute every user's career standing with one DELETE and one
+    INSERT ... SELECT, so reads are range scans on the stored rank.
+    Runs in the caller's transaction; the caller commits.
+    """
+    # Concurrent refreshes would otherwise insert the same users twice
+    await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CAREER_STANDINGS_LOCK_KEY})
+    await db.execute(text("DELETE FROM careerstanding"))
+    await db.execute(REFRESH_CAREER_STANDINGS_SQL)
+
+async def run_career_standings_scheduler() -> None:
+    """
+    Background loop that recomputes career standings every
+    CAREER_STANDINGS_REFRESH_MINUTES, picking up reviewed scores and new users
+    """
+    interval = settings.CAREER_STANDINGS_REFRESH_MINUTES * 60
+    
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                await refresh_career_standings(db)
+                await db.commit()
+            await leaderboard_cache.invalidate("career", leaderboard_cache.CAREER_SCOPE_ID)
+        except Exception as e:
+            logger.error(f"Career standings refresh failed: {e}")
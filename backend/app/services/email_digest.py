@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from itertools import groupby
+from typing import Any, Dict, List, Sequence, Tuple
+from sqlalchemy import and_, exists, func, select, text, update
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, create_engine
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.mailer import build_message, get_smtp_pool
+
+logger = logging.getLogger(__name__)
+
+# Key for the advisory lock that keeps digests to one sender per run
+DIGEST_LOCK_KEY = 7304
+
+# Holds the run's advisory lock on a connection of its own, outside the
+# request pool, since it stays open for the whole SMTP run
+_lock_engine = create_engine(settings.DATABASE_URL, pooled=False)
+
+# Users whose digests are built and sent per round
+DIGEST_USER_BATCH_SIZE = 200
+
+def build_digest(user: Any, notifications: Sequence[Any], total: int) -> EmailMessage:
+    """
+    Build one user's digest email from their newest unread notifications
+    """
+    count = f"{total} new notification" + ("s" if total != 1 else "")
+    lines = [f"Hi {user.name},", "", f"You have {count} on EliteBuilders:", ""]
+    
+    for notification in notifications:
+        lines.append(f"- {notification.title}: {notification.message}")
+    
+    if total > len(notifications):
+        lines.append(f"...and {total - len(notifications)} more.")
+    
+    lines += ["", f"See them all at {settings.FRONTEND_URL}/notifications"]
+    
+    return build_message(user.email, f"You have {count}", "\n".join(lines))
+
+def _pending(since_column: Any, cutoff: datetime) -> Any:
+    return and_(
+        Notification.read.is_(False),
+        Notification.created_at <= cutoff,
+        Notification.created_at > func.coalesce(since_column, User.created_at)
+    )
+
+async def _load_batch(last_user_id: Any, cutoff: datetime) -> Tuple[List[Any], Dict[Any, List[Any]]]:
+    """
+    Load the next batch of users with pending notifications, after
+    last_user_id, and each one's newest pending notifications with their
+    full count. The session is closed before anything is sent.
+    """
+    async with AsyncSessionLocal() as db:
+        users_query = (
+            select(User)
+            .where(
+                User.is_active.is_(True),
+                exists().where(
+                    Notification.user_id == User.id,
+                    _pending(User.last_digest_sent_at, cutoff)
+                )
+            )
+            .order_by(User.id)
+            .limit(DIGEST_USER_BATCH_SIZE)
+        )
+        if last_user_id is not None:
+            users_query = users_query.where(User.id > last_user_id)
+        
+        users_result = await db.execute(users_query)
+        users = users_result.scalars().all()
+        if not users:
+            return [], {}
+        
+        # Each user's newest notifications, capped, with their full count
+        ranked = (
+            select(
+                Notification.user_id,
+                Notification.title,
+                Notification.message,
+                func.row_number().over(
+                    partition_by=Notification.user_id,
+                    order_by=Notification.created_at.desc()
+                ).label("position"),
+                func.count().over(partition_by=Notification.user_id).label("total")
+            )
+            .join(User, User.id == Notification.user_id)
+            .where(
+                Notification.user_id.in_([user.id for user in users]),
+                _pending(User.last_digest_sent_at, cutoff)
+            )
+            .subquery()
+        )
+        items_result = await db.execute(
+            select(ranked)
+            .where(ranked.c.position <= settings.EMAIL_DIGEST_MAX_ITEMS)
+            .order_by(ranked.c.user_id, ranked.c.position)
+        )
+        items = {
+            user_id: list(rows)
+            for user_id, rows in groupby(items_result.all(), key=lambda row: row.user_id)
+        }
+    
+    return list(users), items
+
+async def send_notification_digests() -> int:
+    """
+    Email every active user a digest of the unread notifications created
+    since their last digest, sending over the shared SMTP pool.
+    Returns the number of digests sent.
+    
+    Each batch is loaded in its own session, which is closed before the
+    SMTP sends, and the delivered users are marked in a separate short
+    transaction, so no pooled connection waits on the mail server; the run
+    lock lives on a dedicated unpooled connection.
+    """
+    cutoff = datetime.now(timezone.utc)
+    pool = get_smtp_pool()
+    sent = 0
+    
+    # A session-level lock on an unpooled autocommit connection: it spans the
+    # whole run without leaving a transaction idle or taking a pool slot, so
+    # only one worker sends per run
+    async with _lock_engine.connect() as lock_connection:
+        lock_connection = await lock_connection.execution_options(isolation_level="AUTOCOMMIT")
+        lock_result = await lock_connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": DIGEST_LOCK_KEY}
+        )
+        if not lock_result.scalar():
+            return 0
+        
+        try:
+            last_user_id = None
+            
+            while True:
+                users, items = await _load_batch(last_user_id, cutoff)
+                if not users:
+                    break
+                last_user_id = users[-1].id
+                
+                digest_users: List[Any] = [user for user in users if user.id in items]
+                errors = await pool.send_many(
+                    build_digest(user, items[user.id], items[user.id][0].total)
+                    for user in digest_users
+                )
+                
+                # Users whose send failed keep their window and are retried next run
+                delivered = [user.id for user, error in zip(digest_users, errors) if error is None]
+                if delivered:
+                    async with AsyncSessionLocal() as db:
+                        await db.execute(
+                            update(User)
+                            .where(User.id.in_(delivered))
+                            .values(last_digest_sent_at=cutoff)
+                        )
+                        await db.commit()
+                sent += len(delivered)
+        finally:
+            await lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": DIGEST_LOCK_KEY}
+            )
+    
+    return sent
+
+async def run_digest_scheduler() -> None:
+    """
+    Background loop that sends notification digests every
+    EMAIL_DIGEST_INTERVAL_MINUTES
+    """
+    interval = settings.EMAIL_DIGEST_INTERVAL_MINUTES * 60
+    
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            sent = await send_notification_digests()
+            logger.info(f"Sent {sent} notification digests")
+        except Exception as e:
+            logger.error(f"Notification digest run failed: {e}")
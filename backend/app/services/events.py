@@ -0,0 +1,60 @@
+import logging
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Event types published by the API
+SUBMISSION_CREATED = "submission.created"
+SUBMISSION_REVIEWED = "submission.reviewed"
+SUBMISSION_FAVORITED = "submission.favorited"
+LEADERBOARD_GENERATED = "leaderboard.generated"
+
+class Event:
+    """
+    Something that happened, with the ids a handler needs to react to it
+    """
+    
+    def __init__(self, type: str, **data: Any):
+        self.type = type
+        self.data = data
+    
+    def __repr__(self) -> str:
+        return f"Event({self.type!r}, {self.data!r})"
+
+Handler = Callable[[Event], None]
+
+class EventBus:
+    """
+    In-process publish/subscribe bus.
+    
+    Handlers run synchronously inside publish() and must only hand the event
+    off (e.g. queue it for a worker), so publishing never slows the request.
+    Publish after committing, so handlers see the change.
+    """
+    
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+    
+    def subscribe(self, event_type: str, handler: Handler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+    
+    def unsubscribe(self, event_type: str, handler: Handler) -> None:
+        handlers = self._handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+    
+    def publish(self, event_type: str, **data: Any) -> None:
+        event = Event(event_type, **data)
+        for handler in list(self._handlers.get(event_type, ())):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Handler for {event} failed: {e}")
+
+bus = EventBus()
+
+def publish(event_type: str, **data: Any) -> None:
+    """
+    Publish an event on the process-wide bus
+    """
+    bus.publish(event_type, **data)
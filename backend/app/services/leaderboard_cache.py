@@ -0,0 +1,156 @@
+import hashlib
+import json
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.db import replicas
+
+# Scope id used for the career leaderboard, which spans every challenge
+CAREER_SCOPE_ID = "all"
+
+def read_scope(scope: str, scope_id: Any) -> str:
+    """
+    The replica read scope of one leaderboard, matching
+    get_read_db(f"leaderboards:{scope}", "<scope>_id")
+    """
+    return f"leaderboards:{scope}:{scope_id}"
+
+def _version_key(scope: str, scope_id: Any) -> str:
+    return f"leaderboard:version:{scope}:{scope_id}"
+
+async def get_version(scope: str, scope_id: Any) -> str:
+    """
+    Get the current version token for a leaderboard scope
+    ("challenge", "season" or "career"), creating one if needed
+    """
+    cache = get_cache()
+    key = _version_key(scope, scope_id)
+    
+    version = await cache.get(key)
+    if version is None:
+        # Random tokens keep ETags from colliding across workers and restarts
+        await cache.add(key, uuid.uuid4().hex)
+        version = await cache.get(key)
+    
+    return version
+
+async def invalidate(scope: str, scope_id: Any) -> None:
+    """
+    Bump a scope's version so every cached page and ETag for it goes stale
+    """
+    # Keep this leaderboard's reads off the replicas until they have the
+    # change, so a lagging replica can't re-cache the old page under the new
+    # version; other leaderboards keep reading from the replicas
+    await replicas.mark_written(read_scope(scope, scope_id))
+    await get_cache().set(_version_key(scope, scope_id), uuid.uuid4().hex)
+
+async def invalidate_for_challenge(challenge_id: Any, season_id: Optional[Any] = None) -> None:
+    """
+    Invalidate every leaderboard that a change to a challenge's results affects
+    """
+    await invalidate("challenge", challenge_id)
+    if season_id is not None:
+        await invalidate("season", season_id)
+    await invalidate("career", CAREER_SCOPE_ID)
+
+async def cached_value(
+    scope: str,
+    scope_id: Any,
+    name: str,
+    compute: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Get a JSON-serializable value computed from a leaderboard scope (e.g. a
+    total count), cached under the scope's version so it goes stale with
+    the scope's pages
+    """
+    version = await get_version(scope, scope_id)
+    key = f"leaderboard:{scope}:{scope_id}:{version}:{name}"
+    cache = get_cache()
+    
+    payload = await cache.get(key)
+    if payload is not None:
+        return json.loads(payload)
+    
+    value = await compute()
+    await cache.set(key, json.dumps(value), ttl=settings.LEADERBOARD_CACHE_TTL_SECONDS)
+    return value
+
+def _if_none_match(request: Request) -> List[str]:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return []
+    return [tag.strip() for tag in if_none_match.split(",")]
+
+def _headers(cache_key: str, etag: str) -> Dict[str, str]:
+    # The version lets live stream subscribers tell whether their page is current
+    version = cache_key.split(":")[3]
+    return {"ETag": etag, "X-Leaderboard-Version": version}
+
+def _not_modified(cache_key: str, etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=_headers(cache_key, etag)
+    )
+
+async def lookup(
+    request: Request,
+    scope: str,
+    scope_id: Any,
+    *params: Any
+) -> Tuple[str, str, Optional[Response]]:
+    """
+    Resolve the cache key and ETag for a leaderboard page.
+    
+    Returns (cache_key, etag, response); response is a 304 when the client
+    already holds the current version, the cached body on a hit, or None
+    when the page has to be computed and passed to store().
+    
+    `If-None-Match: *` only matches a page known to exist: a cached one
+    here, or a freshly computed one in store(). A missing leaderboard
+    still gets its 404.
+    """
+    version = await get_version(scope, scope_id)
+    page = ":".join(str(param) for param in params)
+    
+    cache_key = f"leaderboard:{scope}:{scope_id}:{version}:{page}"
+    etag = '"' + hashlib.sha1(cache_key.encode()).hexdigest()[:20] + '"'
+    
+    candidates = _if_none_match(request)
+    if etag in candidates or f"W/{etag}" in candidates:
+        return cache_key, etag, _not_modified(cache_key, etag)
+    
+    payload = await get_cache().get(cache_key)
+    if payload is not None:
+        if "*" in candidates:
+            return cache_key, etag, _not_modified(cache_key, etag)
+        return cache_key, etag, Response(
+            content=payload,
+            media_type="application/json",
+            headers=_headers(cache_key, etag)
+        )
+    
+    return cache_key, etag, None
+
+async def store(request: Request, cache_key: str, etag: str, body: Any) -> Response:
+    """
+    Cache a freshly computed leaderboard page and return it as the response.
+    
+    The body must be an instance of the endpoint's response_model: the raw
+    Response skips FastAPI's response_model serialization, and this keeps
+    cached and uncached bodies identical to it.
+    """
+    payload = json.dumps(jsonable_encoder(body))
+    await get_cache().set(cache_key, payload, ttl=settings.LEADERBOARD_CACHE_TTL_SECONDS)
+    
+    if "*" in _if_none_match(request):
+        return _not_modified(cache_key, etag)
+    
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers=_headers(cache_key, etag)
+    )
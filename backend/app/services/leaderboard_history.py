@@ -0,0 +1,308 @@
+import asyncio
+import hashlib
+import logging
+import struct
+import sys
+import uuid
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.challenge import Challenge
+from app.models.leaderboard_entry import LeaderboardEntry
+from app.models.leaderboard_snapshot import LeaderboardRoster, LeaderboardSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for the advisory lock that keeps workers from snapshotting concurrently
+SNAPSHOT_LOCK_KEY = 727201
+
+_HEADER = struct.Struct("<I")
+
+def _to_le_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _from_le_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+def pack_snapshot(rows: List[Tuple[int, float, int]]) -> bytes:
+    """
+    Pack (user_index, score, rank) rows into a compressed columnar blob.
+    
+    Rows are sorted by user index and the index column is delta-encoded, so
+    it compresses to almost nothing. Scores are stored in hundredths, which
+    matches the Numeric(5, 2) precision of leaderboard scores.
+    """
+    rows = sorted(rows)
+    
+    indexes = [row[0] for row in rows]
+    deltas = array("I", [current - previous for previous, current in zip([0] + indexes, indexes)])
+    scores = array("i", [round(row[1] * 100) for row in rows])
+    ranks = array("I", [row[2] for row in rows])
+    
+    return zlib.compress(
+        _HEADER.pack(len(rows)) + _to_le_bytes(deltas) + _to_le_bytes(scores) + _to_le_bytes(ranks)
+    )
+
+def unpack_snapshot(data: bytes) -> Tuple[array, array, array]:
+    """
+    Unpack a snapshot blob into (user_indexes, scores in hundredths, ranks)
+    """
+    raw = zlib.decompress(data)
+    (count,) = _HEADER.unpack_from(raw)
+    
+    column = 4 * count
+    start = _HEADER.size
+    deltas = _from_le_bytes("I", raw[start:start + column])
+    scores = _from_le_bytes("i", raw[start + column:start + 2 * column])
+    ranks = _from_le_bytes("I", raw[start + 2 * column:start + 3 * column])
+    
+    return array("I", accumulate(deltas)), scores, ranks
+
+class DecodedSnapshotCache:
+    """
+    Bounded LRU of snapshot id -> unpacked columns, so trajectory reads of a
+    popular challenge decompress each snapshot once per worker. Snapshots
+    are never modified, so entries can't go stale; the bound caps memory.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[uuid.UUID, Tuple[array, array, array]]" = OrderedDict()
+    
+    def get(self, snapshot_id: uuid.UUID) -> Optional[Tuple[array, array, array]]:
+        columns = self._entries.get(snapshot_id)
+        if columns is not None:
+            self._entries.move_to_end(snapshot_id)
+        return columns
+    
+    def put(self, snapshot_id: uuid.UUID, columns: Tuple[array, array, array]) -> None:
+        self._entries[snapshot_id] = columns
+        self._entries.move_to_end(snapshot_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+_decoded_snapshots = DecodedSnapshotCache(settings.LEADERBOARD_SNAPSHOT_CACHE_SIZE)
+
+def _roster_index(roster: bytes, user_id: uuid.UUID) -> Optional[int]:
+    # Only matches aligned on a 16-byte boundary are real entries
+    position = roster.find(user_id.bytes)
+    while position != -1:
+        if position % 16 == 0:
+            return position // 16
+        position = roster.find(user_id.bytes, position + 1)
+    return None
+
+async def take_snapshot(db: AsyncSession, challenge_id: Any) -> Optional[LeaderboardSnapshot]:
+    """
+    Snapshot the current leaderboard of a challenge.
+    
+    Returns None when the leaderboard is empty or unchanged since the last
+    snapshot, so periodic runs only store a row when rankings have moved.
+    Runs in the caller's transaction; the caller commits.
+    """
+    entries_result = await db.execute(
+        select(LeaderboardEntry.user_id, LeaderboardEntry.score, LeaderboardEntry.rank)
+        .where(LeaderboardEntry.challenge_id == challenge_id)
+    )
+    entries = entries_result.all()
+    
+    if not entries:
+        return None
+    
+    # Make sure the roster exists, then lock it so concurrent snapshots of the
+    # challenge (e.g. from an admin request) can't assign the same index twice
+    await db.execute(
+        insert(LeaderboardRoster.__table__)
+        .values(challenge_id=challenge_id, user_ids=b"")
+        .on_conflict_do_nothing(index_elements=["challenge_id"])
+    )
+    
+    roster_result = await db.execute(
+        select(LeaderboardRoster)
+        .where(LeaderboardRoster.challenge_id == challenge_id)
+        .with_for_update()
+    )
+    roster = roster_result.scalars().one()
+    
+    roster_bytes = bytes(roster.user_ids)
+    positions: Dict[bytes, int] = {
+        roster_bytes[offset:offset + 16]: offset // 16
+        for offset in range(0, len(roster_bytes), 16)
+    }
+    
+    new_user_ids = []
+    rows = []
+    for user_id, score, rank in entries:
+        index = positions.get(user_id.bytes)
+        if index is None:
+            index = len(positions)
+            positions[user_id.bytes] = index
+            new_user_ids.append(user_id.bytes)
+        rows.append((index, float(score), rank))
+    
+    data = pack_snapshot(rows)
+    checksum = hashlib.sha1(data).hexdigest()
+    
+    latest_result = await db.execute(
+        select(LeaderboardSnapshot.checksum)
+        .where(LeaderboardSnapshot.challenge_id == challenge_id)
+        .order_by(LeaderboardSnapshot.taken_at.desc())
+        .limit(1)
+    )
+    if latest_result.scalar() == checksum:
+        return None
+    
+    if new_user_ids:
+        roster.user_ids = roster_bytes + b"".join(new_user_ids)
+    
+    snapshot = LeaderboardSnapshot(
+        id=uuid.uuid4(),
+        challenge_id=challenge_id,
+        taken_at=datetime.now(timezone.utc),
+        entry_count=len(rows),
+        checksum=checksum,
+        data=data
+    )
+    db.add(snapshot)
+    
+    return snapshot
+
+async def snapshot_active_leaderboards() -> int:
+    """
+    Snapshot every active challenge that has a leaderboard.
+    Returns the number of snapshots stored.
+    """
+    stored = 0
+    
+    async with AsyncSessionLocal() as db:
+        # Only one worker snapshots per run
+        lock_result = await db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": SNAPSHOT_LOCK_KEY}
+        )
+        if not lock_result.scalar():
+            return 0
+        
+        challenges_result = await db.execute(
+            select(LeaderboardEntry.challenge_id)
+            .join(Challenge, Challenge.id == LeaderboardEntry.challenge_id)
+            .where(Challenge.is_active.is_(True))
+            .group_by(LeaderboardEntry.challenge_id)
+        )
+        
+        for challenge_id in challenges_result.scalars().all():
+            if await take_snapshot(db, challenge_id) is not None:
+                stored += 1
+        
+        await db.commit()
+    
+    return stored
+
+async def run_snapshot_scheduler() -> None:
+    """
+    Background loop that snapshots leaderboards every
+    LEADERBOARD_SNAPSHOT_INTERVAL_MINUTES
+    """
+    interval = settings.LEADERBOARD_SNAPSHOT_INTERVAL_MINUTES * 60
+    
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            stored = await snapshot_active_leaderboards()
+            logger.info(f"Stored {stored} leaderboard snapshots")
+        except Exception as e:
+            logger.error(f"Leaderboard snapshot run failed: {e}")
+
+async def get_rank_trajectory(
+    db: AsyncSession,
+    challenge_id: Any,
+    user_id: uuid.UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 200
+) -> List[Dict[str, Any]]:
+    """
+    Get a user's (taken_at, rank, score) points from the latest `limit` of a
+    challenge's snapshots in the range, oldest first. Snapshots are only
+    stored on change, so each point holds until the next.
+    
+    Only snapshots this worker hasn't decoded recently are read from the
+    database and decompressed.
+    """
+    roster_result = await db.execute(
+        select(LeaderboardRoster.user_ids).where(LeaderboardRoster.challenge_id == challenge_id)
+    )
+    roster = roster_result.scalar()
+    
+    index = _roster_index(bytes(roster), user_id) if roster else None
+    if index is None:
+        return []
+    
+    query = (
+        select(LeaderboardSnapshot.id, LeaderboardSnapshot.taken_at)
+        .where(LeaderboardSnapshot.challenge_id == challenge_id)
+        .order_by(LeaderboardSnapshot.taken_at.desc())
+        .limit(limit)
+    )
+    if since is not None:
+        query = query.where(LeaderboardSnapshot.taken_at >= since)
+    if until is not None:
+        query = query.where(LeaderboardSnapshot.taken_at <= until)
+    
+    snapshots_result = await db.execute(query)
+    snapshots = list(reversed(snapshots_result.all()))
+    
+    # Look the user up in each snapshot as soon as it is decoded, so only
+    # one snapshot's columns are held beyond what the cache keeps
+    points: Dict[uuid.UUID, Optional[Tuple[int, int]]] = {}
+    
+    def add_point(snapshot_id: uuid.UUID, columns: Tuple[array, array, array]) -> None:
+        indexes, scores, ranks = columns
+        position = bisect_left(indexes, index)
+        if position < len(indexes) and indexes[position] == index:
+            points[snapshot_id] = (ranks[position], scores[position])
+        else:
+            points[snapshot_id] = None
+    
+    missing = []
+    for snapshot_id, _ in snapshots:
+        columns = _decoded_snapshots.get(snapshot_id)
+        if columns is None:
+            missing.append(snapshot_id)
+        else:
+            add_point(snapshot_id, columns)
+    
+    if missing:
+        data_result = await db.stream(
+            select(LeaderboardSnapshot.id, LeaderboardSnapshot.data)
+            .where(LeaderboardSnapshot.id.in_(missing))
+        )
+        async for snapshot_id, data in data_result:
+            columns = unpack_snapshot(data)
+            _decoded_snapshots.put(snapshot_id, columns)
+            add_point(snapshot_id, columns)
+    
+    return [
+        {
+            "taken_at": taken_at,
+            "rank": points[snapshot_id][0],
+            "score": points[snapshot_id][1] / 100
+        }
+        for snapshot_id, taken_at in snapshots
+        if points.get(snapshot_id) is not None
+    ]
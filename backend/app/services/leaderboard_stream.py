@@ -0,0 +1,172 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+from sqlalchemy import select
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.leaderboard_entry import LeaderboardEntry
+from app.services import leaderboard_cache
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before it is told to resync and dropped
+SUBSCRIBER_QUEUE_SIZE = 32
+
+# Seconds between SSE keep-alive comments, so proxies keep idle streams open
+KEEPALIVE_SECONDS = 15
+
+def format_event(event: str, data: Any) -> str:
+    """
+    Format a server-sent event
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def version_event(version: str) -> str:
+    """
+    Format the event telling a subscriber which leaderboard version its
+    deltas start from
+    """
+    return format_event("version", {"version": version})
+
+class ChallengeBroadcaster:
+    """
+    Single producer for one challenge's live leaderboard.
+    
+    Watches the challenge's leaderboard cache version (shared across
+    workers when the cache backend is Redis). When it changes, reads the
+    rankings once, diffs them against the previous read, and fans the
+    delta out to every subscriber, so watchers never query the database.
+    """
+    
+    def __init__(self, challenge_id: Any):
+        self.challenge_id = challenge_id
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.changed = asyncio.Event()
+        self.version: Optional[str] = None
+        self.ranks: Dict[str, Tuple[int, float]] = {}
+        self.task: Optional[asyncio.Task] = None
+    
+    async def _load_ranks(self) -> Dict[str, Tuple[int, float]]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(LeaderboardEntry.user_id, LeaderboardEntry.rank, LeaderboardEntry.score)
+                .where(LeaderboardEntry.challenge_id == self.challenge_id)
+            )
+            return {str(user_id): (rank, float(score)) for user_id, rank, score in result.all()}
+    
+    def _broadcast(self, message: str) -> None:
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow consumers are told to refetch the full page instead of buffering forever
+                self.subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+    
+    async def run(self) -> None:
+        while True:
+            if self.version is not None:
+                try:
+                    await asyncio.wait_for(
+                        self.changed.wait(), timeout=settings.LEADERBOARD_STREAM_POLL_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self.changed.clear()
+            
+            # The first load is retried here too, so a brief cache or database
+            # outage at startup doesn't leave the producer dead
+            try:
+                version = await leaderboard_cache.get_version("challenge", self.challenge_id)
+                if version == self.version:
+                    continue
+                
+                ranks = await self._load_ranks()
+            except Exception as e:
+                logger.error(f"Live leaderboard refresh failed for {self.challenge_id}: {e}")
+                if self.version is None:
+                    await asyncio.sleep(settings.LEADERBOARD_STREAM_POLL_SECONDS)
+                continue
+            
+            if self.version is None:
+                self.version = version
+                self.ranks = ranks
+                self._broadcast(version_event(version))
+                continue
+            
+            changed = [
+                {"user_id": user_id, "rank": rank, "score": score}
+                for user_id, (rank, score) in ranks.items()
+                if self.ranks.get(user_id) != (rank, score)
+            ]
+            removed = [user_id for user_id in self.ranks if user_id not in ranks]
+            
+            self.version = version
+            self.ranks = ranks
+            
+            if changed or removed:
+                changed.sort(key=lambda entry: entry["rank"])
+                self._broadcast(format_event("delta", {
+                    "version": version,
+                    "changed": changed,
+                    "removed": removed
+                }))
+
+_broadcasters: Dict[str, ChallengeBroadcaster] = {}
+
+def notify(challenge_id: Any) -> None:
+    """
+    Wake this worker's producer for a challenge right away instead of
+    waiting for its next version poll
+    """
+    broadcaster = _broadcasters.get(str(challenge_id))
+    if broadcaster is not None:
+        broadcaster.changed.set()
+
+async def subscribe(challenge_id: Any) -> AsyncIterator[str]:
+    """
+    Yield server-sent events with rank deltas for a challenge until the
+    client disconnects.
+    
+    The first event is a "version" event naming the leaderboard version the
+    deltas start from. A client whose page has a different
+    X-Leaderboard-Version header missed a change and should refetch it.
+    """
+    key = str(challenge_id)
+    broadcaster = _broadcasters.get(key)
+    if broadcaster is None or broadcaster.task.done():
+        broadcaster = _broadcasters[key] = ChallengeBroadcaster(challenge_id)
+        broadcaster.task = asyncio.create_task(broadcaster.run())
+    
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    broadcaster.subscribers.add(queue)
+    
+    try:
+        yield ": connected\n\n"
+        
+        # Producers that haven't loaded yet send this to every subscriber
+        # once they have
+        if broadcaster.version is not None:
+            yield version_event(broadcaster.version)
+        
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            
+            if message is None:
+                yield format_event("resync", {})
+                return
+            
+            yield message
+    finally:
+        broadcaster.subscribers.discard(queue)
+        
+        # The last subscriber to leave stops the producer
+        if not broadcaster.subscribers and _broadcasters.get(key) is broadcaster:
+            del _broadcasters[key]
+            broadcaster.task.cancel()
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+import aiosmtplib
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def build_message(to: str, subject: str, body: str, html: Optional[str] = None) -> EmailMessage:
+    """
+    Build an email from EMAIL_FROM, with an optional HTML alternative
+    """
+    message = EmailMessage()
+    message["From"] = settings.EMAIL_FROM
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+    if html is not None:
+        message.add_alternative(html, subtype="html")
+    return message
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether a send is worth retrying: dropped connections, timeouts and 4xx
+    replies (greylisting, rate limiting) are; 5xx rejections are not
+    """
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return 400 <= error.code < 500
+    return isinstance(error, (
+        aiosmtplib.SMTPServerDisconnected,
+        aiosmtplib.SMTPConnectError,
+        aiosmtplib.SMTPTimeoutError,
+        OSError
+    ))
+
+class RateLimiter:
+    """
+    Token bucket shared by every connection in a pool, keeping total sends
+    under the provider's per-second limit
+    """
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class SMTPPool:
+    """
+    Small pool of persistent, authenticated SMTP connections.
+    
+    Connections are opened lazily, reused across messages so the TCP, TLS and
+    AUTH handshakes are paid once per connection rather than once per email,
+    and recycled after max_messages_per_connection sends or any error.
+    
+    This is connection reuse only, not SMTP PIPELINING: aiosmtplib waits for
+    each command's reply before sending the next. Throughput comes from
+    running several connections concurrently.
+    """
+    
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        start_tls: bool = True,
+        size: int = 3,
+        max_messages_per_connection: int = 100,
+        rate_limit: float = 0,
+        timeout: float = 30
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username or None
+        self.password = password or None
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(rate_limit)
+        
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[aiosmtplib.SMTP] = []
+        self._sent: Dict[int, int] = {}
+    
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls and not self.use_tls,
+            timeout=self.timeout
+        )
+        await client.connect()
+        if self.username:
+            await client.login(self.username, self.password or "")
+        
+        self._sent[id(client)] = 0
+        return client
+    
+    async def _discard(self, client: aiosmtplib.SMTP) -> None:
+        self._sent.pop(id(client), None)
+        try:
+            if client.is_connected:
+                await client.quit()
+        except aiosmtplib.SMTPException:
+            client.close()
+    
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Borrow a connection; it goes back to the pool unless the block raised
+        """
+        async with self._slots:
+            client = None
+            while self._idle and client is None:
+                candidate = self._idle.pop()
+                if candidate.is_connected:
+                    client = candidate
+                else:
+                    self._sent.pop(id(candidate), None)
+            
+            if client is None:
+                client = await self._connect()
+            
+            try:
+                yield client
+            except BaseException:
+                await self._discard(client)
+                raise
+            
+            self._sent[id(client)] += 1
+            if self._sent[id(client)] >= self.max_messages_per_connection:
+                await self._discard(client)
+            else:
+                self._idle.append(client)
+    
+    async def send(self, message: EmailMessage, attempts: Optional[int] = None) -> None:
+        """
+        Send one message, retrying transient failures with exponential backoff
+        on a fresh connection
+        """
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception(is_transient),
+            stop=stop_after_attempt(attempts or settings.SMTP_SEND_ATTEMPTS),
+            wait=wait_exponential(multiplier=1, max=30),
+            reraise=True
+        ):
+            with attempt:
+                await self.rate_limiter.acquire()
+                async with self.connection() as client:
+                    await client.send_message(message)
+    
+    async def send_many(
+        self,
+        messages: Iterable[EmailMessage],
+        attempts: Optional[int] = None
+    ) -> List[Optional[Exception]]:
+        """
+        Send messages concurrently over the pool's connections.
+        Returns one entry per message: None if sent, else the final error.
+        """
+        return await asyncio.gather(
+            *(self._send_or_error(message, attempts) for message in messages)
+        )
+    
+    async def _send_or_error(self, message: EmailMessage, attempts: Optional[int]) -> Optional[Exception]:
+        try:
+            await self.send(message, attempts)
+        except (aiosmtplib.SMTPException, OSError) as e:
+            logger.error(f"Failed to send email to {message['To']}: {e}")
+            return e
+        return None
+    
+    async def close(self) -> None:
+        while self._idle:
+            await self._discard(self._idle.pop())
+
+_pool: Optional[SMTPPool] = None
+
+def get_smtp_pool() -> SMTPPool:
+    """
+    Return the process-wide SMTP pool configured from the SMTP_* settings
+    """
+    global _pool
+    if _pool is None:
+        _pool = SMTPPool(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            use_tls=settings.SMTP_USE_TLS,
+            start_tls=settings.SMTP_START_TLS,
+            size=settings.SMTP_POOL_SIZE,
+            max_messages_per_connection=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+            rate_limit=settings.SMTP_RATE_LIMIT_PER_SECOND
+        )
+    return _pool
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import delete, select
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+async def purge_read_notifications(
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Delete read notifications older than the retention period, a small batch
+    per transaction so the purge never holds long locks or bloats one
+    transaction. Unread notifications are kept regardless of age.
+    Returns the number of rows deleted.
+    """
+    retention_days = retention_days or settings.NOTIFICATION_RETENTION_DAYS
+    batch_size = batch_size or settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    
+    deleted = 0
+    
+    while True:
+        # SKIP LOCKED lets several workers purge side by side without waiting
+        batch = (
+            select(Notification.id)
+            .where(Notification.read.is_(True), Notification.created_at < cutoff)
+            .order_by(Notification.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(Notification)
+                .where(Notification.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+        
+        # Yield between batches so request handlers on this worker keep running
+        await asyncio.sleep(0)
+
+async def run_retention_scheduler() -> None:
+    """
+    Background loop that purges old read notifications every
+    NOTIFICATION_RETENTION_INTERVAL_MINUTES
+    """
+    interval = settings.NOTIFICATION_RETENTION_INTERVAL_MINUTES * 60
+    
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await purge_read_notifications()
+            logger.info(f"Purged {deleted} read notifications")
+        except Exception as e:
+            logger.error(f"Notification retention run failed: {e}")
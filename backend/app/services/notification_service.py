@@ -0,0 +1,178 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Set, Union
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.notification import Notification, NotificationType
+from app.services import notification_stream, unread_counter
+
+logger = logging.getLogger(__name__)
+
+# How long finished job progress stays queryable
+JOB_STATUS_TTL_SECONDS = 24 * 60 * 60
+
+# asyncpg accepts at most 32767 bind parameters per statement, and each
+# notification binds 7 (id, read and the notification_row fields)
+MAX_ROWS_PER_INSERT = 32767 // 7
+
+# Running jobs, referenced so the event loop doesn't garbage-collect them
+_running_jobs: Set[asyncio.Task] = set()
+
+def notification_row(
+    user_id: Any,
+    title: str,
+    message: str,
+    type: NotificationType,
+    reference_id: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Build a notification row for the bulk insert helpers
+    """
+    return {
+        "user_id": user_id,
+        "title": title,
+        "message": message,
+        "type": type,
+        "reference_id": reference_id,
+    }
+
+async def insert_notifications(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert notification rows with multi-row INSERTs of up to
+    MAX_ROWS_PER_INSERT rows and no per-row refresh, bumping the recipients'
+    unread counters and waking their live streams in the same transaction.
+    Runs in the caller's transaction; the caller commits.
+    """
+    if not rows:
+        return 0
+    
+    values = [
+        {"id": uuid.uuid4(), "read": False, **row}
+        for row in rows
+    ]
+    for start in range(0, len(values), MAX_ROWS_PER_INSERT):
+        await db.execute(insert(Notification).values(values[start:start + MAX_ROWS_PER_INSERT]))
+    await unread_counter.increment(db, [row["user_id"] for row in values])
+    await notification_stream.publish(db, [row["user_id"] for row in values])
+    
+    return len(values)
+
+class NotificationJob:
+    """
+    Progress of a background bulk notification write, mirrored to the cache
+    so any API worker can report it
+    """
+    
+    def __init__(self, total: Optional[int] = None, rejected_user_ids: Optional[List[str]] = None):
+        self.id = uuid.uuid4().hex
+        self.total = total
+        self.written = 0
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self.rejected_user_ids = rejected_user_ids or []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "written": self.written,
+            "error": self.error,
+            "rejected_user_ids": self.rejected_user_ids,
+        }
+    
+    async def save(self) -> None:
+        await get_cache().set(
+            f"notification-job:{self.id}", json.dumps(self.to_dict()), ttl=JOB_STATUS_TTL_SECONDS
+        )
+
+async def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the progress of a bulk notification job
+    """
+    payload = await get_cache().get(f"notification-job:{job_id}")
+    return json.loads(payload) if payload else None
+
+async def _chunks(
+    rows: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    size: int
+):
+    chunk = []
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    
+    if chunk:
+        yield chunk
+
+async def bulk_insert_notifications(
+    rows: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    job: Optional[NotificationJob] = None,
+    chunk_size: Optional[int] = None
+) -> int:
+    """
+    Write notification rows in chunks, one short transaction per chunk, so a
+    large blast never holds locks or memory for the whole run
+    """
+    chunk_size = chunk_size or settings.NOTIFICATION_BULK_CHUNK_SIZE
+    job = job or NotificationJob()
+    
+    job.status = "running"
+    await job.save()
+    
+    try:
+        async for chunk in _chunks(rows, chunk_size):
+            async with AsyncSessionLocal() as db:
+                job.written += await insert_notifications(db, chunk)
+                await db.commit()
+            await job.save()
+    except Exception as e:
+        logger.error(f"Bulk notification job {job.id} failed after {job.written} rows: {e}")
+        job.status = "failed"
+        job.error = str(e)
+        await job.save()
+        raise
+    
+    job.status = "completed"
+    await job.save()
+    
+    return job.written
+
+async def enqueue_notifications(
+    rows: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    total: Optional[int] = None,
+    rejected_user_ids: Optional[List[str]] = None
+) -> NotificationJob:
+    """
+    Start a bulk notification write in the background and return its job,
+    so the request that triggered it doesn't wait for the inserts
+    """
+    job = NotificationJob(total=total, rejected_user_ids=rejected_user_ids)
+    await job.save()
+    
+    async def run() -> None:
+        try:
+            await bulk_insert_notifications(rows, job)
+        except Exception:
+            # Already logged and recorded on the job
+            pass
+    
+    task = asyncio.create_task(run())
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+    
+    return job
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import AsyncSessionLocal, engine
+from app.models.announcement import Announcement
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel carrying "new notification" wake-ups between API workers
+CHANNEL = "notifications"
+
+# Payload prefix for system announcements, followed by the announcement id
+BROADCAST = "*"
+
+# Seconds between SSE keep-alive comments, so proxies keep idle streams open
+KEEPALIVE_SECONDS = 15
+
+# Seconds to wait before reconnecting the listener after its connection drops
+RECONNECT_SECONDS = 5
+
+def format_event(event: str, data: Any, event_id: Optional[Any] = None) -> str:
+    """
+    Format a server-sent event; the id lets clients resume with Last-Event-ID
+    """
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def publish(db: AsyncSession, user_ids: Iterable[Any]) -> None:
+    """
+    Wake the streams of the given users.
+    Runs in the caller's transaction: Postgres only delivers the NOTIFY when
+    it commits, so listeners never wake before the new rows are visible.
+    """
+    payloads = sorted({str(user_id) for user_id in user_ids})
+    if not payloads:
+        return
+    
+    await db.execute(
+        text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {"channel": CHANNEL, "payloads": payloads}
+    )
+
+async def publish_announcement(db: AsyncSession, announcement_id: Any) -> None:
+    """
+    Deliver a new announcement to every stream. Runs in the caller's
+    transaction, like publish.
+    """
+    await publish(db, [f"{BROADCAST}{announcement_id}"])
+
+class Subscription:
+    """
+    A stream's pending wake-up: whether it must re-read its notifications,
+    and announcements pushed to it since it last woke
+    """
+    
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.reread = False
+        self.announcements: List[Dict[str, Any]] = []
+    
+    def wake(self, announcement: Optional[Dict[str, Any]] = None) -> None:
+        if announcement is None:
+            self.reread = True
+        else:
+            self.announcements.append(announcement)
+        self.event.set()
+
+class NotificationListener:
+    """
+    One LISTEN connection per API worker, fanning wake-ups out to the
+    streams of the users connected to this worker.
+    
+    Personal wake-ups carry no rows: the stream re-reads its own
+    notifications after its last delivered id, so a missed or coalesced
+    wake-up can't lose a notification. Announcements go to every stream at
+    once, so the listener loads each one a single time and pushes the row to
+    every subscriber instead of having each of them re-query.
+    """
+    
+    def __init__(self):
+        self.subscribers: Dict[str, Set[Subscription]] = {}
+        self.task: Optional[asyncio.Task] = None
+        self._fan_outs: Set[asyncio.Task] = set()
+    
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        if payload.startswith(BROADCAST):
+            task = asyncio.create_task(self._fan_out_announcement(payload[len(BROADCAST):]))
+            self._fan_outs.add(task)
+            task.add_done_callback(self._fan_outs.discard)
+            return
+        
+        for subscription in self.subscribers.get(payload, ()):
+            subscription.wake()
+    
+    async def _fan_out_announcement(self, announcement_id: str) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(
+                        Announcement.id,
+                        Announcement.title,
+                        Announcement.message,
+                        Announcement.created_at
+                    ).where(Announcement.id == uuid.UUID(announcement_id))
+                )
+                row = result.first()
+        except Exception as e:
+            logger.error(f"Failed to load announcement {announcement_id}, waking every stream: {e}")
+            self._wake_all()
+            return
+        
+        if row is None:
+            return
+        
+        announcement = dict(row._mapping)
+        for subscriptions in self.subscribers.values():
+            for subscription in subscriptions:
+                subscription.wake(announcement)
+    
+    def _wake_all(self) -> None:
+        for subscriptions in self.subscribers.values():
+            for subscription in subscriptions:
+                subscription.wake()
+    
+    async def run(self) -> None:
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver_connection = raw.driver_connection
+                    await driver_connection.add_listener(CHANNEL, self._on_notify)
+                    
+                    # Anything sent while we were disconnected gets picked up on re-read
+                    self._wake_all()
+                    
+                    # Ping on the driver connection directly: an open SQLAlchemy
+                    # transaction would hold back NOTIFY delivery until it ended
+                    try:
+                        while True:
+                            await asyncio.sleep(KEEPALIVE_SECONDS)
+                            await driver_connection.execute("SELECT 1")
+                    finally:
+                        await driver_connection.remove_listener(CHANNEL, self._on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification listener connection lost: {e}")
+                await asyncio.sleep(RECONNECT_SECONDS)
+    
+    def _ensure_running(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+    
+    def subscribe(self, user_id: Any) -> Subscription:
+        """
+        Register a wake-up subscription for a user's stream
+        """
+        self._ensure_running()
+        
+        subscription = Subscription()
+        self.subscribers.setdefault(str(user_id), set()).add(subscription)
+        return subscription
+    
+    def unsubscribe(self, user_id: Any, subscription: Subscription) -> None:
+        key = str(user_id)
+        subscriptions = self.subscribers.get(key)
+        if subscriptions is None:
+            return
+        
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self.subscribers[key]
+        
+        # The last subscriber to leave stops the listener
+        if not self.subscribers and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+listener = NotificationListener()
+
+class Wakeup:
+    """
+    One wake-up of a stream: re-read its notifications if reread is set,
+    and deliver the announcements pushed with it
+    """
+    
+    def __init__(self, reread: bool, announcements: List[Dict[str, Any]]):
+        self.reread = reread
+        self.announcements = announcements
+
+async def wakeups(user_id: Any) -> AsyncIterator[Optional[Wakeup]]:
+    """
+    Yield a Wakeup whenever a user may have new notifications, and None
+    after KEEPALIVE_SECONDS without one, until the consumer stops iterating.
+    Yields a re-read once up front so the first read happens after subscribing.
+    """
+    subscription = listener.subscribe(user_id)
+    
+    try:
+        yield Wakeup(reread=True, announcements=[])
+        
+        while True:
+            try:
+                await asyncio.wait_for(subscription.event.wait(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            
+            subscription.event.clear()
+            wakeup = Wakeup(reread=subscription.reread, announcements=subscription.announcements)
+            subscription.reread = False
+            subscription.announcements = []
+            yield wakeup
+    finally:
+        listener.unsubscribe(user_id, subscription)
@@ -0,0 +1,210 @@
+import math
+import random
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple, Union
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.score_sketch import ScoreSketch
+
+class KLLSketch:
+    """
+    KLL streaming quantile sketch.
+    
+    Keeps a stack of compactors; when the sketch is full, the lowest full
+    compactor sorts its items and promotes every other one to the level
+    above with double the weight. Memory stays around 3k items no matter
+    how many scores are added, with rank error of roughly 1.7/k.
+    """
+    
+    def __init__(
+        self,
+        k: int = 200,
+        c: float = 2 / 3,
+        compactors: Optional[List[List[float]]] = None,
+        n: int = 0
+    ):
+        self.k = k
+        self.c = c
+        self.compactors = compactors or [[]]
+        self.n = n
+        self._update_max_size()
+    
+    def _capacity(self, height: int) -> int:
+        depth = len(self.compactors) - height - 1
+        return int(math.ceil(self.c ** depth * self.k)) + 1
+    
+    def _update_max_size(self) -> None:
+        self.max_size = sum(self._capacity(height) for height in range(len(self.compactors)))
+    
+    @property
+    def size(self) -> int:
+        return sum(len(compactor) for compactor in self.compactors)
+    
+    def update(self, value: float) -> None:
+        """
+        Add a single score to the sketch
+        """
+        self.compactors[0].append(float(value))
+        self.n += 1
+        
+        if self.size >= self.max_size:
+            self._compress()
+    
+    def _compress(self) -> None:
+        for height in range(len(self.compactors)):
+            if len(self.compactors[height]) < self._capacity(height):
+                continue
+            
+            if height + 1 >= len(self.compactors):
+                self.compactors.append([])
+                self._update_max_size()
+            
+            items = sorted(self.compactors[height])
+            # With an odd count the smallest item stays behind, so total weight is preserved
+            leftover = items[:len(items) % 2]
+            pairs = items[len(items) % 2:]
+            offset = random.randint(0, 1)
+            
+            self.compactors[height + 1].extend(pairs[offset::2])
+            self.compactors[height] = leftover
+            
+            if self.size < self.max_size:
+                break
+    
+    def _weighted_items(self) -> List[Tuple[float, int]]:
+        items = [
+            (value, 2 ** height)
+            for height, compactor in enumerate(self.compactors)
+            for value in compactor
+        ]
+        items.sort()
+        return items
+    
+    def rank(self, value: float) -> int:
+        """
+        Estimated number of scores less than or equal to value
+        """
+        return sum(
+            2 ** height
+            for height, compactor in enumerate(self.compactors)
+            for item in compactor
+            if item <= value
+        )
+    
+    def percentile_of(self, value: float) -> Optional[float]:
+        """
+        Estimated percentile (0-100, higher is better) of a score
+        """
+        if self.n == 0:
+            return None
+        return 100 * self.rank(value) / self.n
+    
+    def score_at(self, percentile: float) -> Optional[float]:
+        """
+        Estimated score at a percentile (0-100)
+        """
+        if self.n == 0:
+            return None
+        
+        target = percentile / 100 * self.n
+        cumulative = 0
+        items = self._weighted_items()
+        for value, weight in items:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        
+        return items[-1][0]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "c": self.c, "n": self.n, "compactors": self.compactors}
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "KLLSketch":
+        if not data:
+            return cls()
+        return cls(k=data["k"], c=data["c"], compactors=data["compactors"], n=data["n"])
+
+def _scopes(challenge_id: Any, season_id: Optional[Any]) -> List[Tuple[str, Any]]:
+    scopes = [("challenge", challenge_id)]
+    if season_id is not None:
+        scopes.append(("season", season_id))
+    return scopes
+
+async def _lock_sketch_row(db: AsyncSession, scope: str, scope_id: Any) -> ScoreSketch:
+    # Make sure the row exists, then lock it so concurrent reviews don't lose updates
+    await db.execute(
+        insert(ScoreSketch.__table__)
+        .values(scope=scope, scope_id=scope_id, count=0, data=KLLSketch().to_dict())
+        .on_conflict_do_nothing(index_elements=["scope", "scope_id"])
+    )
+    
+    result = await db.execute(
+        select(ScoreSketch)
+        .where(ScoreSketch.scope == scope, ScoreSketch.scope_id == scope_id)
+        .with_for_update()
+    )
+    return result.scalars().one()
+
+async def record_score(
+    db: AsyncSession,
+    challenge_id: Any,
+    season_id: Optional[Any],
+    score: float
+) -> None:
+    """
+    Add a newly finalized score to its challenge and season sketches.
+    Runs in the caller's transaction; the caller commits.
+    """
+    for scope, scope_id in _scopes(challenge_id, season_id):
+        row = await _lock_sketch_row(db, scope, scope_id)
+        
+        sketch = KLLSketch.from_dict(row.data)
+        sketch.update(score)
+        
+        row.data = sketch.to_dict()
+        row.count = sketch.n
+        db.add(row)
+
+async def rebuild_sketch(
+    db: AsyncSession,
+    scope: str,
+    scope_id: Any,
+    scores: Union[Iterable[float], AsyncIterable[float]]
+) -> KLLSketch:
+    """
+    Replace a scope's sketch with one built from the given scores, e.g. when
+    a challenge leaderboard is regenerated and re-reviewed scores have changed.
+    Accepts an async stream of scores so large seasons never sit in memory.
+    Runs in the caller's transaction; the caller commits.
+    """
+    sketch = KLLSketch()
+    if hasattr(scores, "__aiter__"):
+        async for score in scores:
+            sketch.update(score)
+    else:
+        for score in scores:
+            sketch.update(score)
+    
+    row = await _lock_sketch_row(db, scope, scope_id)
+    row.data = sketch.to_dict()
+    row.count = sketch.n
+    db.add(row)
+    
+    return sketch
+
+async def get_sketch(db: AsyncSession, scope: str, scope_id: Any) -> Optional[KLLSketch]:
+    """
+    Load the sketch for a challenge or season, if any scores have been recorded
+    """
+    result = await db.execute(
+        select(ScoreSketch.data).where(
+            ScoreSketch.scope == scope,
+            ScoreSketch.scope_id == scope_id
+        )
+    )
+    data = result.scalar()
+    
+    if data is None:
+        return None
+    return KLLSketch.from_dict(data)
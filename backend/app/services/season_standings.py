@@ -0,0 +1,58 @@
+from typing import Any
+from sqlalchemy import delete, desc, distinct, func, insert, literal, select, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.leaderboard_entry import LeaderboardEntry
+from app.models.season_standing import SeasonStanding
+
+# Key for the advisory locks that serialize refreshes of a season, paired
+# with a hash of the season id so different seasons don't wait on each other
+SEASON_STANDINGS_LOCK_KEY = 727203
+
+async def refresh_season_standings(db: AsyncSession, season_id: Any) -> None:
+    """
+    Recompute every user's standing in a season from its leaderboard entries
+    with one DELETE and one INSERT ... SELECT.
+    Runs in the caller's transaction; the caller commits.
+    """
+    season_stats = (
+        select(
+            LeaderboardEntry.user_id,
+            func.sum(LeaderboardEntry.score).label("total_score"),
+            func.count(distinct(LeaderboardEntry.challenge_id)).label("challenge_count"),
+            func.min(LeaderboardEntry.rank).label("best_rank")
+        )
+        .where(LeaderboardEntry.season_id == season_id)
+        .group_by(LeaderboardEntry.user_id)
+        .subquery()
+    )
+    
+    ranked = select(
+        func.gen_random_uuid(),
+        literal(season_id, UUID(as_uuid=True)),
+        season_stats.c.user_id,
+        season_stats.c.total_score,
+        season_stats.c.challenge_count,
+        season_stats.c.best_rank,
+        func.row_number().over(
+            order_by=[
+                desc(season_stats.c.total_score),
+                desc(season_stats.c.challenge_count),
+                season_stats.c.best_rank,
+                season_stats.c.user_id
+            ]
+        )
+    )
+    
+    # Concurrent refreshes of the same season would otherwise insert the same users twice
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(:key, hashtext(:season_id))"),
+        {"key": SEASON_STANDINGS_LOCK_KEY, "season_id": str(season_id)}
+    )
+    await db.execute(delete(SeasonStanding).where(SeasonStanding.season_id == season_id))
+    await db.execute(
+        insert(SeasonStanding).from_select(
+            ["id", "season_id", "user_id", "total_score", "challenge_count", "best_rank", "rank"],
+            ranked
+        )
+    )
@@ -0,0 +1,137 @@
+import uuid
+from collections import Counter
+from typing import Any, Dict, Iterable
+from sqlalchemy import and_, bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import get_cache
+from app.models.announcement import Announcement, AnnouncementReceipt
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.user_cache import AuthenticatedUser
+
+# Cached per-user announcement counts expire even without invalidation, as a backstop
+ANNOUNCEMENT_COUNT_TTL_SECONDS = 300
+
+ANNOUNCEMENT_VERSION_KEY = "unread-announcements:version"
+
+async def increment(db: AsyncSession, user_ids: Iterable[Any]) -> None:
+    """
+    Add one unread notification per occurrence of a user id.
+    Runs in the caller's transaction so the counter commits with the rows.
+    """
+    counts: Dict[Any, int] = Counter(user_ids)
+    if not counts:
+        return
+    
+    user_table = User.__table__
+    await db.execute(
+        update(user_table)
+        .where(user_table.c.id == bindparam("target_id"))
+        .values(unread_notification_count=user_table.c.unread_notification_count + bindparam("amount")),
+        # Fixed row order so concurrent bulk writes can't deadlock on user rows
+        [
+            {"target_id": user_id, "amount": counts[user_id]}
+            for user_id in sorted(counts, key=str)
+        ]
+    )
+
+async def decrement(db: AsyncSession, user_id: Any, amount: int = 1) -> None:
+    """
+    Remove unread notifications from a user's counter; recounts if the
+    counter has drifted below zero. Runs in the caller's transaction.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(unread_notification_count=User.unread_notification_count - amount)
+        .returning(User.unread_notification_count)
+    )
+    
+    if (result.scalar() or 0) < 0:
+        await recount(db, user_id)
+
+async def reset(db: AsyncSession, user_id: Any) -> None:
+    """
+    Zero a user's counter after all their notifications are marked read
+    """
+    await db.execute(
+        update(User).where(User.id == user_id).values(unread_notification_count=0)
+    )
+
+async def recount(db: AsyncSession, user_id: Any) -> int:
+    """
+    Self-healing path: recompute a user's counter from the notification table
+    """
+    unread = (
+        select(func.count())
+        .select_from(Notification)
+        .where(Notification.user_id == user_id, Notification.read.is_(False))
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(unread_notification_count=unread)
+        .returning(User.unread_notification_count)
+    )
+    return result.scalar() or 0
+
+async def get_unread_notification_count(db: AsyncSession, user_id: Any) -> int:
+    """
+    Read a user's personal unread counter with a primary key lookup
+    """
+    result = await db.execute(
+        select(User.unread_notification_count).where(User.id == user_id)
+    )
+    return result.scalar() or 0
+
+async def _announcement_key(user_id: Any) -> str:
+    cache = get_cache()
+    version = await cache.get(ANNOUNCEMENT_VERSION_KEY)
+    if version is None:
+        await cache.add(ANNOUNCEMENT_VERSION_KEY, uuid.uuid4().hex)
+        version = await cache.get(ANNOUNCEMENT_VERSION_KEY)
+    return f"unread-announcements:{user_id}:{version}"
+
+async def get_unread_announcement_count(db: AsyncSession, user: AuthenticatedUser) -> int:
+    """
+    Count a user's unread announcements, cached until an announcement is
+    sent or the user reads or dismisses one
+    """
+    cache = get_cache()
+    key = await _announcement_key(user.id)
+    
+    cached = await cache.get(key)
+    if cached is not None:
+        return int(cached)
+    
+    result = await db.execute(
+        select(func.count())
+        .select_from(Announcement)
+        .outerjoin(
+            AnnouncementReceipt,
+            and_(
+                AnnouncementReceipt.announcement_id == Announcement.id,
+                AnnouncementReceipt.user_id == user.id
+            )
+        )
+        .where(
+            Announcement.created_at >= user.created_at,
+            AnnouncementReceipt.id.is_(None)
+        )
+    )
+    count = result.scalar() or 0
+    
+    await cache.set(key, str(count), ttl=ANNOUNCEMENT_COUNT_TTL_SECONDS)
+    return count
+
+async def invalidate_announcements(user_id: Any = None) -> None:
+    """
+    Drop cached announcement counts for one user, or for everyone when a
+    new announcement is sent
+    """
+    cache = get_cache()
+    if user_id is None:
+        await cache.set(ANNOUNCEMENT_VERSION_KEY, uuid.uuid4().hex)
+    else:
+        await cache.delete(await _announcement_key(user_id))
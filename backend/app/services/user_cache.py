@@ -0,0 +1,141 @@
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.core.cache import MemoryCache, get_cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis channel on which invalidated keys are announced to every worker
+INVALIDATION_CHANNEL = "auth-user:invalidate"
+
+class AuthenticatedUser:
+    """
+    The user fields authorization and per-user queries need, cached so
+    authenticated requests don't load the full user row
+    """
+    
+    def __init__(self, id: Any, is_active: bool, is_admin: bool, name: str, created_at: datetime):
+        self.id = id
+        self.is_active = is_active
+        self.is_admin = is_admin
+        self.name = name
+        self.created_at = created_at
+    
+    @classmethod
+    def from_user(cls, user: Any) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            is_active=bool(user.is_active),
+            is_admin=bool(user.is_admin),
+            name=user.name,
+            created_at=user.created_at
+        )
+    
+    def to_json(self) -> str:
+        return json.dumps({
+            "id": str(self.id),
+            "is_active": self.is_active,
+            "is_admin": self.is_admin,
+            "name": self.name,
+            "created_at": self.created_at.isoformat(),
+        })
+    
+    @classmethod
+    def from_json(cls, payload: str) -> "AuthenticatedUser":
+        data: Dict[str, Any] = json.loads(payload)
+        return cls(
+            id=uuid.UUID(data["id"]),
+            is_active=data["is_active"],
+            is_admin=data["is_admin"],
+            name=data["name"],
+            created_at=datetime.fromisoformat(data["created_at"])
+        )
+
+# Per-worker tier, always on. With Redis, invalidations are published so
+# every worker drops its copy at once; otherwise, or while a worker's
+# listener is reconnecting, the short TTL bounds how long another worker's
+# stale entry can outlive an invalidation
+_local = MemoryCache(max_entries=settings.MEMORY_CACHE_MAX_ENTRIES)
+
+def _shared() -> Optional[Any]:
+    # Redis tier shared by every worker, only when Redis is the cache backend
+    return get_cache() if settings.CACHE_BACKEND == "redis" else None
+
+def _key(user_id: Any) -> str:
+    return f"auth-user:{user_id}"
+
+async def get(user_id: Any) -> Optional[AuthenticatedUser]:
+    """
+    Look a user up in the local tier, then the shared tier
+    """
+    key = _key(user_id)
+    
+    payload = await _local.get(key)
+    if payload is None:
+        shared = _shared()
+        if shared is None:
+            return None
+        
+        payload = await shared.get(key)
+        if payload is None:
+            return None
+        await _local.set(key, payload, ttl=settings.AUTH_USER_CACHE_TTL_SECONDS)
+    
+    return AuthenticatedUser.from_json(payload)
+
+async def store(user: Any) -> AuthenticatedUser:
+    """
+    Cache a freshly loaded user in both tiers
+    """
+    principal = AuthenticatedUser.from_user(user)
+    payload = principal.to_json()
+    key = _key(user.id)
+    
+    await _local.set(key, payload, ttl=settings.AUTH_USER_CACHE_TTL_SECONDS)
+    shared = _shared()
+    if shared is not None:
+        await shared.set(key, payload, ttl=settings.AUTH_USER_SHARED_CACHE_TTL_SECONDS)
+    
+    return principal
+
+async def invalidate(user_id: Any) -> None:
+    """
+    Drop a user's cached entry after they are updated or deactivated.
+    
+    With Redis the invalidation is published, so every worker's local tier
+    drops the entry too; without it, other workers keep their copy for at
+    most AUTH_USER_CACHE_TTL_SECONDS.
+    """
+    key = _key(user_id)
+    
+    await _local.delete(key)
+    shared = _shared()
+    if shared is not None:
+        await shared.delete(key)
+        await shared.client.publish(INVALIDATION_CHANNEL, key)
+
+async def run_invalidation_listener() -> None:
+    """
+    Background loop applying invalidations published by any worker to this
+    worker's local tier. The local tier is cleared on every (re)subscribe,
+    since invalidations published while disconnected are lost.
+    """
+    while True:
+        try:
+            pubsub = get_cache("redis").client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                await _local.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        await _local.delete(message["data"])
+            finally:
+                await pubsub.close()
+        except Exception as e:
+            logger.error(f"Auth user invalidation listener failed: {e}")
+        
+        await asyncio.sleep(1)
@@ -0,0 +1,277 @@
+"""
+Show the query plans of the hot filters with and without the indexes and
+unique constraints added in migration 8c2e5d4a1f93.
+
+Everything runs in one transaction that is always rolled back: optionally
+seed synthetic data, EXPLAIN ANALYZE each query with the indexes, drop
+them, and EXPLAIN ANALYZE again. Dropping an index locks its table until
+the rollback, so run this against a development or staging database.
+
+    cd backend
+    alembic upgrade head
+    python -m scripts.benchmark_indexes --seed-users 20000
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from app.core.config import settings
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "alembic" / "versions" / "8c2e5d4a1f93_add_query_indexes_and_unique_constraints.py"
+)
+
+# (description, SQL) mirroring the queries in app/api/endpoints
+QUERIES = [
+    (
+        "Active challenges by deadline",
+        "SELECT * FROM challenge WHERE is_active IS true ORDER BY submission_deadline DESC LIMIT 100"
+    ),
+    (
+        "Challenges in a season",
+        "SELECT * FROM challenge WHERE is_active IS true AND season_id = :season_id "
+        "ORDER BY submission_deadline DESC LIMIT 100"
+    ),
+    (
+        "Challenges by sponsor",
+        "SELECT * FROM challenge WHERE is_active IS true AND sponsor_id = :sponsor_id "
+        "ORDER BY submission_deadline DESC LIMIT 100"
+    ),
+    (
+        "My submissions",
+        "SELECT * FROM submission WHERE user_id = :user_id ORDER BY created_at DESC LIMIT 100"
+    ),
+    (
+        "Existing submission check",
+        "SELECT * FROM submission WHERE user_id = :user_id AND challenge_id = :challenge_id"
+    ),
+    (
+        "Scored submissions for leaderboard generation",
+        "SELECT * FROM submission WHERE challenge_id = :challenge_id AND final_score IS NOT NULL "
+        "ORDER BY final_score DESC"
+    ),
+    (
+        "Submissions by status",
+        "SELECT * FROM submission WHERE status = 'PENDING' LIMIT 100"
+    ),
+    (
+        "Challenge leaderboard page",
+        "SELECT * FROM leaderboardentry WHERE challenge_id = :ranked_challenge_id ORDER BY rank LIMIT 100"
+    ),
+    (
+        "Season leaderboard page",
+        "SELECT * FROM leaderboardentry WHERE season_id = :season_id ORDER BY rank LIMIT 100"
+    ),
+    (
+        "User rank in a challenge",
+        "SELECT * FROM leaderboardentry WHERE challenge_id = :ranked_challenge_id AND user_id = :ranked_user_id"
+    ),
+    (
+        "Badge holders",
+        "SELECT * FROM userbadge WHERE badge_id = :badge_id LIMIT 100"
+    ),
+    (
+        "A user's badges",
+        "SELECT * FROM userbadge WHERE user_id = :user_id"
+    ),
+]
+
+# Each returns one row whose columns become query parameters
+SAMPLES = [
+    "SELECT user_id, challenge_id FROM submission ORDER BY random() LIMIT 1",
+    "SELECT challenge_id AS ranked_challenge_id, user_id AS ranked_user_id FROM leaderboardentry ORDER BY random() LIMIT 1",
+    "SELECT season_id FROM leaderboardentry WHERE season_id IS NOT NULL ORDER BY random() LIMIT 1",
+    "SELECT sponsor_id FROM challenge WHERE sponsor_id IS NOT NULL ORDER BY random() LIMIT 1",
+    "SELECT badge_id FROM userbadge ORDER BY random() LIMIT 1",
+]
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO "user" (id, email, name, password_hash, is_active, is_admin)
+    SELECT gen_random_uuid(), 'benchmark-' || n || '@example.com', 'Benchmark User ' || n, 'not-a-hash', true, false
+    FROM generate_series(1, :users) AS n
+    """,
+    """
+    INSERT INTO season (id, name, start_date, end_date)
+    SELECT gen_random_uuid(), 'Benchmark Season ' || n,
+           now() - make_interval(days => 90 * n), now() - make_interval(days => 90 * (n - 1))
+    FROM generate_series(1, 4) AS n
+    """,
+    """
+    INSERT INTO sponsor (id, name, contact_email)
+    SELECT gen_random_uuid(), 'Benchmark Sponsor ' || n, 'benchmark-sponsor-' || n || '@example.com'
+    FROM generate_series(1, 20) AS n
+    """,
+    """
+    WITH seasons AS (SELECT array_agg(id) AS ids FROM season WHERE name LIKE 'Benchmark Season %'),
+         sponsors AS (SELECT array_agg(id) AS ids FROM sponsor WHERE name LIKE 'Benchmark Sponsor %')
+    INSERT INTO challenge (
+        id, title, description, rules, evaluation_criteria, submission_deadline,
+        is_sponsored, prize_amount, is_active, sponsor_id, season_id
+    )
+    SELECT gen_random_uuid(), 'Benchmark Challenge ' || n, 'Benchmark', 'Benchmark', '{}'::json,
+           now() + make_interval(days => n % 120 - 60),
+           n % 3 = 0, 0, n % 4 <> 0,
+           CASE WHEN n % 3 = 0 THEN sponsors.ids[1 + n % 20] END,
+           seasons.ids[1 + n % 4]
+    FROM generate_series(1, :challenges) AS n, seasons, sponsors
+    """,
+    """
+    WITH users AS (
+        SELECT id, row_number() OVER (ORDER BY id) AS n FROM "user" WHERE email LIKE 'benchmark-%@example.com'
+    ),
+    challenges AS (
+        SELECT array_agg(id) AS ids, count(*) AS total FROM challenge WHERE title LIKE 'Benchmark Challenge %'
+    ),
+    picks AS (
+        SELECT users.id AS user_id, challenges.ids[1 + (users.n * 7 + k) % challenges.total] AS challenge_id, users.n + k AS seq
+        FROM users, challenges, generate_series(1, :submissions_per_user) AS k
+    )
+    INSERT INTO submission (id, user_id, challenge_id, repo_url, status, final_score, is_sponsor_favorite)
+    SELECT gen_random_uuid(), user_id, challenge_id, 'https://github.com/example/benchmark',
+           CAST((ARRAY['PENDING', 'PROCESSING', 'EVALUATED', 'REVIEWED', 'COMPLETED', 'REJECTED'])[1 + seq % 6] AS submissionstatus),
+           CASE WHEN seq % 6 IN (2, 3, 4) THEN round((random() * 100)::numeric, 2) END,
+           false
+    FROM picks
+    """,
+    """
+    INSERT INTO leaderboardentry (id, user_id, challenge_id, season_id, submission_id, score, rank, percentile)
+    SELECT gen_random_uuid(), s.user_id, s.challenge_id, c.season_id, s.id, s.final_score,
+           row_number() OVER (PARTITION BY s.challenge_id ORDER BY s.final_score DESC, s.id), 50
+    FROM submission s
+    JOIN challenge c ON c.id = s.challenge_id
+    WHERE c.title LIKE 'Benchmark Challenge %' AND s.final_score IS NOT NULL
+    """,
+    """
+    INSERT INTO badge (id, name, description, image_url, criteria)
+    SELECT gen_random_uuid(), 'Benchmark Badge ' || n, 'Benchmark', 'https://example.com/badge.png', '{}'::json
+    FROM generate_series(1, 10) AS n
+    """,
+    """
+    WITH badges AS (SELECT array_agg(id) AS ids FROM badge WHERE name LIKE 'Benchmark Badge %')
+    INSERT INTO userbadge (id, user_id, badge_id, submission_id)
+    SELECT gen_random_uuid(), ranked.user_id, badges.ids[ranked.position], ranked.id
+    FROM (
+        SELECT s.id, s.user_id, row_number() OVER (PARTITION BY s.user_id ORDER BY s.id) AS position
+        FROM submission s
+        JOIN "user" u ON u.id = s.user_id
+        WHERE u.email LIKE 'benchmark-%@example.com'
+    ) ranked, badges
+    WHERE ranked.position <= 10
+    """,
+]
+
+TABLES = ["\"user\"", "season", "sponsor", "challenge", "submission", "leaderboardentry", "badge", "userbadge"]
+
+def _load_migration() -> Any:
+    spec = importlib.util.spec_from_file_location("query_indexes_migration", MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+async def seed(connection: AsyncConnection, users: int, submissions_per_user: int) -> None:
+    params = {
+        "users": users,
+        # Enough challenges for every user's submissions to land in distinct ones
+        "challenges": max(20, users // 100, submissions_per_user),
+        "submissions_per_user": submissions_per_user,
+    }
+    for statement in SEED_STATEMENTS:
+        await connection.execute(text(statement), params)
+
+async def sample_parameters(connection: AsyncConnection) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    for statement in SAMPLES:
+        row = (await connection.execute(text(statement))).first()
+        if row is not None:
+            params.update(row._mapping)
+    return params
+
+def _describe_plan(node: Dict[str, Any], depth: int = 0) -> List[str]:
+    line = "  " * depth + node["Node Type"]
+    if node.get("Index Name"):
+        line += f" using {node['Index Name']}"
+    if node.get("Relation Name"):
+        line += f" on {node['Relation Name']}"
+    line += f" (rows={node.get('Actual Rows')}, loops={node.get('Actual Loops')})"
+    
+    lines = [line]
+    for child in node.get("Plans", []):
+        lines.extend(_describe_plan(child, depth + 1))
+    return lines
+
+async def explain(connection: AsyncConnection, sql: str, params: Dict[str, Any], repeat: int) -> Optional[Dict[str, Any]]:
+    """
+    EXPLAIN ANALYZE a query `repeat` times and keep the fastest run
+    """
+    best = None
+    for _ in range(repeat):
+        value = (await connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params)).scalar()
+        plan = (json.loads(value) if isinstance(value, str) else value)[0]
+        if best is None or plan["Execution Time"] < best["Execution Time"]:
+            best = plan
+    return best
+
+def _report(label: str, plan: Dict[str, Any]) -> None:
+    buffers = plan["Plan"].get("Shared Hit Blocks", 0) + plan["Plan"].get("Shared Read Blocks", 0)
+    print(f"  {label}: {plan['Execution Time']:.3f} ms, {buffers} buffers")
+    for line in _describe_plan(plan["Plan"]):
+        print(f"    {line}")
+
+async def run(args: argparse.Namespace) -> None:
+    migration = _load_migration()
+    engine = create_async_engine(str(settings.DATABASE_URL).replace("postgresql://", "postgresql+asyncpg://"))
+    
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            await connection.execute(text("SET LOCAL lock_timeout = '5s'"))
+            
+            if args.seed_users > 0:
+                print(f"Seeding {args.seed_users} users (rolled back afterwards)...")
+                await seed(connection, args.seed_users, args.submissions_per_user)
+            for table in TABLES:
+                await connection.execute(text(f"ANALYZE {table}"))
+            
+            params = await sample_parameters(connection)
+            runnable = []
+            for description, sql in QUERIES:
+                needed = re.findall(r"(?<!:):(\w+)", sql)
+                if all(name in params for name in needed):
+                    runnable.append((description, sql, {name: params[name] for name in needed}))
+                else:
+                    print(f"Skipping '{description}': no sample data")
+            
+            after = [await explain(connection, sql, query_params, args.repeat) for _, sql, query_params in runnable]
+            
+            for name, table, _ in migration.UNIQUE_CONSTRAINTS:
+                await connection.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}"))
+            for name, _, _, _ in migration.INDEXES:
+                await connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            
+            before = [await explain(connection, sql, query_params, args.repeat) for _, sql, query_params in runnable]
+        finally:
+            await transaction.rollback()
+    
+    await engine.dispose()
+    
+    for (description, _, _), plan_before, plan_after in zip(runnable, before, after):
+        print(f"\n{description}")
+        _report("before", plan_before)
+        _report("after", plan_after)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed-users", type=int, default=0, help="synthetic users to add first (0 uses existing data)")
+    parser.add_argument("--submissions-per-user", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per query; the fastest is reported")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
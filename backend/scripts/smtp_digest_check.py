@@ -0,0 +1,86 @@
+"""
+Send email through a local SMTP stand-in to check the pooled mailer and the
+notification digest without a real mail provider.
+
+Starts an aiosmtpd server on localhost that accepts and counts every
+message, then either sends synthetic messages through an SMTPPool or, with
+--digests, runs send_notification_digests against the configured database
+with the process SMTP pool pointed at the local server. Digest runs mark
+users as sent, so use a development database.
+
+    cd backend
+    python -m scripts.smtp_digest_check --messages 500 --pool-size 3
+    python -m scripts.smtp_digest_check --digests
+"""
+import argparse
+import asyncio
+import time
+from typing import Set
+from aiosmtpd.controller import Controller
+from app.services import mailer
+from app.services.mailer import SMTPPool, build_message
+
+class CountingHandler:
+    """
+    Accept every message, counting messages and the SMTP sessions they came on
+    """
+    
+    def __init__(self):
+        self.messages = 0
+        self.sessions: Set[int] = set()
+    
+    async def handle_DATA(self, server, session, envelope) -> str:
+        self.messages += 1
+        self.sessions.add(id(session))
+        return "250 Message accepted for delivery"
+
+async def run(args: argparse.Namespace) -> None:
+    handler = CountingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=args.port)
+    controller.start()
+    
+    pool = SMTPPool(
+        hostname="127.0.0.1",
+        port=args.port,
+        start_tls=False,
+        size=args.pool_size,
+        max_messages_per_connection=args.max_messages_per_connection,
+        rate_limit=args.rate_limit
+    )
+    
+    started = time.perf_counter()
+    try:
+        if args.digests:
+            from app.services.email_digest import send_notification_digests
+            
+            mailer._pool = pool
+            sent = await send_notification_digests()
+            print(f"Digests sent: {sent}")
+        else:
+            messages = [
+                build_message(f"user{i}@example.com", "Digest check", f"Message {i}")
+                for i in range(args.messages)
+            ]
+            errors = await pool.send_many(messages)
+            print(f"Send errors: {sum(error is not None for error in errors)}")
+    finally:
+        await pool.close()
+        controller.stop()
+    
+    elapsed = time.perf_counter() - started
+    print(f"Messages received: {handler.messages}")
+    print(f"SMTP connections used: {len(handler.sessions)}")
+    print(f"Elapsed: {elapsed:.2f}s")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--messages", type=int, default=100, help="synthetic messages to send")
+    parser.add_argument("--digests", action="store_true", help="run the notification digest instead")
+    parser.add_argument("--pool-size", type=int, default=3)
+    parser.add_argument("--max-messages-per-connection", type=int, default=100)
+    parser.add_argument("--rate-limit", type=float, default=0, help="messages per second (0 is unlimited)")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()